@@ -7,13 +7,13 @@ import re  # Import the regular expression module
 
 # DB and LLM utils import setup
 try:
-    from utils.db_utils import get_unprocessed_jobs, update_job_analysis
+    from utils.db_utils import count_unprocessed_jobs, iter_unprocessed_jobs, get_job_description, update_job_analysis
     from utils.llm_utils import call_llm
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import get_unprocessed_jobs, update_job_analysis
+    from utils.db_utils import count_unprocessed_jobs, iter_unprocessed_jobs, get_job_description, update_job_analysis
     from utils.llm_utils import call_llm
 
 class FilterAgent:
@@ -76,23 +76,25 @@ class FilterAgent:
 
     def run(self):
         print("\n--- 🕵️ Starting Filter Agent (Two-Stage LLM) ---")
-        jobs_to_process = get_unprocessed_jobs()
+        total_to_process = count_unprocessed_jobs()
         
-        if not jobs_to_process:
+        if not total_to_process:
             print("✅ No new jobs to process. All up to date.")
             return
 
-        print(f"🔎 Found {len(jobs_to_process)} new jobs to analyze...")
+        print(f"🔎 Found {total_to_process} new jobs to analyze...")
         
+        processed_count = 0
         triage_passed_count = 0
         relevant_count = 0
         
-        for i, job in enumerate(jobs_to_process):
-            print(f"\nProcessing job {i+1}/{len(jobs_to_process)} (ID: {job['id']})...")
+        # Jobs are streamed page by page, so memory does not grow with the backlog.
+        for job in iter_unprocessed_jobs():
+            processed_count += 1
+            print(f"\nProcessing job {processed_count}/{total_to_process} (ID: {job['id']})...")
             job_id = job['id']
             title = job['title']
-            full_desc = job['full_description_text'] or ""
-            desc_summary = (job['api_provided_description'] or full_desc)[:500]
+            desc_summary = job['description_summary']
 
             # Stage 1: Triage
             print("  - Running Triage...", end="", flush=True)
@@ -106,8 +108,9 @@ class FilterAgent:
             print(" ✅ Tech role detected.")
             triage_passed_count += 1
 
-            # Stage 2: Deep Analysis
+            # Stage 2: Deep Analysis (the full text is only loaded for jobs that passed triage)
             print("  - Running Deep Analysis...", end="", flush=True)
+            full_desc = get_job_description(job_id)
             analysis_result = self._run_deep_analysis(full_desc)
             
             is_relevant = analysis_result.get('is_relevant', False)
@@ -125,7 +128,7 @@ class FilterAgent:
                 print(f" ❌ Not a fit. (Reason: {reasoning})")
         
         print("\n--- Filter Agent Summary ---")
-        print(f"Total jobs processed: {len(jobs_to_process)}")
+        print(f"Total jobs processed: {processed_count}")
         print(f"Passed Triage (Tech Roles): {triage_passed_count}")
         print(f"Marked as Relevant (Final): {relevant_count}")
         print("--- Filter Agent Complete ---")
@@ -0,0 +1,137 @@
+# agents/scraper/async_http.py
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+
+import aiohttp
+from multidict import CIMultiDict
+
+from agents.scraper.http_client import SCRAPER_PER_HOST_LIMIT
+from agents.scraper.rate_limiter import SCRAPER_MAX_RETRIES, RateLimiter, host_key, rate_limiter
+from agents.scraper.response_archive import ArchiveMiss, ResponseArchive, archive_key, request_cache_key, response_archive
+
+# Upper bound of simultaneous connections one async scraper keeps open, over all hosts.
+SCRAPER_HTTP_CONCURRENCY = int(os.getenv("SCRAPER_HTTP_CONCURRENCY", 50))
+
+class HttpStatusError(Exception):
+    """Raised for 4xx/5xx responses, mirroring requests' raise_for_status."""
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+class NotModified(Exception):
+    """Raised when a conditional request is answered with 304 Not Modified."""
+    def __init__(self, url: str):
+        super().__init__(f"Not modified: {url}")
+        self.url = url
+
+def conditional_headers(validators: tuple[str | None, str | None] | None) -> dict:
+    """Builds If-None-Match / If-Modified-Since headers from a stored (etag, last_modified) pair."""
+    etag, last_modified = validators or (None, None)
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+@dataclass
+class HttpResponse:
+    """A fully read HTTP response, detached from the aiohttp session."""
+    url: str
+    status: int
+    headers: CIMultiDict = field(default_factory=CIMultiDict)
+    body: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise HttpStatusError(self.url, self.status)
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.body)
+
+# Exceptions a scraper should report as an HTTP problem for one board, not a crash.
+HTTP_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, HttpStatusError, ArchiveMiss)
+
+class AsyncHttpClient:
+    """
+    Pooled asyncio HTTP client shared by every board of one scraper run.
+
+    A single aiohttp session reuses keep-alive connections. A global connection cap, a
+    per-host semaphore and the per-host token buckets of agents.scraper.rate_limiter keep
+    the fan-out polite; 429 responses are retried once their Retry-After has passed.
+    Final responses go to the response archive when a run is recorded, and are served
+    from it, without any network access, when a run is replayed.
+    Use as `async with AsyncHttpClient(...) as client:`.
+    """
+    def __init__(self, timeout: float = 10, user_agent: str | None = None,
+                 limit: int = SCRAPER_HTTP_CONCURRENCY, per_host_limit: int = SCRAPER_PER_HOST_LIMIT,
+                 limiter: RateLimiter = rate_limiter, max_retries: int = SCRAPER_MAX_RETRIES,
+                 archive: ResponseArchive = response_archive):
+        self.timeout = timeout
+        self.user_agent = user_agent or os.getenv("SCRAPER_USER_AGENT", "BittyScout/1.0")
+        self.limit = max(1, limit)
+        self.per_host_limit = max(1, per_host_limit)
+        self.limiter = limiter
+        self.max_retries = max(0, max_retries)
+        self.archive = archive
+        self._host_semaphores = {}
+        self._session = None
+
+    async def __aenter__(self):
+        if self.archive.replaying:
+            return self
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.limit),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent},
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        key = host_key(url)
+        if key not in self._host_semaphores:
+            self._host_semaphores[key] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[key]
+
+    async def get(self, url: str, params: dict | None = None, headers: dict | None = None) -> HttpResponse:
+        """Performs a GET and returns the whole response; does not raise on HTTP error statuses."""
+        if params:
+            # Like requests, silently drop unset query parameters (aiohttp rejects None).
+            params = {key: value for key, value in params.items() if value is not None}
+        if self.archive.replaying:
+            archived = self.archive.lookup(archive_key(url, params))
+            return HttpResponse(url, archived.status, CIMultiDict(archived.headers), archived.body())
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.wait_async(url)
+            async with self._host_semaphore(url):
+                async with self._session.get(url, params=params, headers=headers) as response:
+                    body = await response.read()
+                    result = HttpResponse(str(response.url), response.status, CIMultiDict(response.headers), body)
+            if result.status != 429 or attempt == self.max_retries:
+                break
+            delay = self.limiter.retry_after(url, result.headers.get("Retry-After"))
+            print(f"⏳ 429 from {host_key(url)}; retrying in {delay:.0f}s.")
+        if self.archive.recording:
+            await asyncio.to_thread(self.archive.record, archive_key(url, params), result.status, result.headers, result.body)
+        return result
+
+    async def get_json(self, url: str, params: dict | None = None, headers: dict | None = None):
+        response = await self.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,359 @@
+# agents/scraper/async_scraper.py
+
+import asyncio
+import os, sys
+from dataclasses import dataclass, asdict
+
+try:
+    from utils.db_utils import save_scraped_jobs, touch_board_last_seen, get_http_validators, save_http_validators
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.async_http import AsyncHttpClient, HTTP_ERRORS, NotModified, request_cache_key, conditional_headers
+    from agents.scraper.cleaning_pool import get_cleaning_pool
+    from agents.scraper.response_archive import ArchiveMiss, response_archive
+    from agents.scraper.checkpoints import board_checkpoint_key
+    from agents.scraper.board_hooks import BoardHooks
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.db_utils import save_scraped_jobs, touch_board_last_seen, get_http_validators, save_http_validators
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.async_http import AsyncHttpClient, HTTP_ERRORS, NotModified, request_cache_key, conditional_headers
+    from agents.scraper.cleaning_pool import get_cleaning_pool
+    from agents.scraper.response_archive import ArchiveMiss, response_archive
+    from agents.scraper.checkpoints import board_checkpoint_key
+    from agents.scraper.board_hooks import BoardHooks
+
+SCRAPER_ENRICH_CONCURRENCY = int(os.getenv("SCRAPER_ENRICH_CONCURRENCY", 8))
+# Boards of one source in flight at once. A board's time budget starts when it gets a slot,
+# so boards queued behind the others (and the per-host limits) do not use up their budget waiting.
+SCRAPER_BOARD_CONCURRENCY = int(os.getenv("SCRAPER_BOARD_CONCURRENCY", 4))
+# Paginated search sources walk at most this many listing pages per query, this many at once.
+SCRAPER_MAX_PAGES = int(os.getenv("SCRAPER_MAX_PAGES", 10))
+SCRAPER_PAGE_CONCURRENCY = int(os.getenv("SCRAPER_PAGE_CONCURRENCY", 3))
+
+@dataclass
+class JobRecord:
+    """The normalized job every source adapter produces; mirrors the columns of the jobs table."""
+    job_url: str
+    title: str
+    platform_source: str
+    platform_job_id: str | None = None
+    company_name: str | None = None
+    location: str | None = None
+    department: str | None = None
+    date_posted_on_platform: str | None = None
+    api_provided_description: str | None = None
+    full_description_text: str | None = None
+    source_board: str | None = None
+
+    def to_job_data(self) -> dict:
+        return asdict(self)
+
+class AsyncApiScraper(BoardHooks):
+    """
+    Shared engine for scrapers backed by a JSON/XML HTTP API.
+
+    All configured boards (companies or search queries) are fetched concurrently on one
+    event loop through a pooled AsyncHttpClient. Subclasses only describe the source:
+    `build_request` and `extract_offers` locate the offers of a board, `adapt` maps one
+    offer to a JobRecord cheaply, and the optional `enrich` does the expensive work
+    (detail requests, page downloads) for postings that are new or changed.
+    Sources whose listings embed description HTML set `description_cleaner`; the engine
+    cleans a board's new and changed offers in one batch, through the process pool of
+    agents.scraper.cleaning_pool when it is enabled and the board is large.
+    Synchronous callers keep the `fetch_jobs() -> (seen, added)` contract.
+
+    Board listings are requested conditionally (ETag / Last-Modified). When a board answers
+    304, its stored jobs only get their last_seen_on_platform touched; nothing is parsed.
+    When an archived run is replayed, responses come from agents.scraper.response_archive;
+    stored validators are neither sent nor updated and no credentials are needed.
+    """
+    platform_source = ""
+    # Boards are already concurrent inside the event loop; ScraperAgent runs the source as one unit.
+    per_board_units = False
+    # Whether platform_job_id is unique across the whole platform (safe for known-job matching).
+    match_on_platform_id = True
+    # Whether board listings are requested with stored ETag / Last-Modified validators.
+    # Paginated sources turn it off: only a single-request listing answers for the whole board.
+    conditional_requests = True
+    # How many boards are fetched at once; the others wait for a slot.
+    board_concurrency = SCRAPER_BOARD_CONCURRENCY
+    # How many records of one board may be enriched at once.
+    enrich_concurrency = SCRAPER_ENRICH_CONCURRENCY
+    # Listing pages walked per board through build_page_request; 1 means a single request.
+    max_pages = 1
+    # Offers on a full page; a shorter page is the last one.
+    page_size = None
+    # How many pages after the first are requested at once.
+    page_concurrency = SCRAPER_PAGE_CONCURRENCY
+    # Module-level function mapping one raw offer to (api_provided_description, full_description_text).
+    # Wrap it in staticmethod(); it is pickled by name when sent to a worker process.
+    description_cleaner = None
+
+    def __init__(self, identifiers: list, known_jobs=None):
+        self.identifiers = identifiers or []
+        self.known_jobs = known_jobs
+        self.user_agent = os.getenv("SCRAPER_USER_AGENT", "BittyScout/1.0")
+        self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 10))
+        self.http_validators = {}
+        self._pending_validators = {}
+        self._board_slots = None
+
+    # --- Source adapter hooks ---
+
+    def is_configured(self) -> bool:
+        """Returns False (after printing why) when the source cannot run, e.g. missing API keys."""
+        return True
+
+    def board_label(self, board) -> str:
+        """Human-readable name of a board for log lines."""
+        return str(board)
+
+    def board_key(self, board) -> str:
+        """
+        Stable identifier stored in jobs.source_board, used to touch a whole board at once. It is
+        the board's checkpoint key, so the poll schedule can read the board's job history.
+        """
+        return board_checkpoint_key(board)
+
+    def build_request(self, board) -> tuple[str, dict | None, dict | None]:
+        """Returns (url, params, headers) of the request listing a board's offers."""
+        raise NotImplementedError
+
+    def build_page_request(self, board, page: int) -> tuple[str, dict | None, dict | None]:
+        """Returns (url, params, headers) of listing page `page` (1-based). Paginated sources override this."""
+        if page == 1:
+            return self.build_request(board)
+        raise NotImplementedError
+
+    def extract_offers(self, payload, board) -> list:
+        """Returns the list of raw offers contained in a decoded response payload."""
+        raise NotImplementedError
+
+    def adapt(self, offer, board) -> JobRecord | None:
+        """Maps one raw offer to a JobRecord, or None to skip it. Must stay cheap."""
+        raise NotImplementedError
+
+    async def enrich(self, client: AsyncHttpClient, record: JobRecord, offer, board) -> bool | None:
+        """
+        Fills in expensive fields of a new or changed record in place. Optional.
+        Runs after `description_cleaner`, so the cleaned descriptions are already set.
+        Return False to leave the record out of this run (e.g. its detail request failed),
+        so it is retried next time instead of being stored incomplete.
+        """
+        return None
+
+    # --- Engine ---
+
+    def fetch_jobs(self) -> tuple[int, int]:
+        return asyncio.run(self.fetch_jobs_async())
+
+    async def fetch_jobs_async(self) -> tuple[int, int]:
+        if not response_archive.replaying and not self.is_configured():
+            return 0, 0
+        print(f"🔎 Starting {type(self).__name__} for {len(self.identifiers)} boards...")
+        known_jobs = self.known_jobs if self.known_jobs is not None else KnownJobs.load(self.platform_source)
+        if self.conditional_requests and not response_archive.replaying:
+            self.http_validators = get_http_validators()
+
+        self._board_slots = asyncio.Semaphore(max(1, self.board_concurrency))
+        async with AsyncHttpClient(timeout=self.request_timeout_api, user_agent=self.user_agent) as client:
+            results = await asyncio.gather(*(self.fetch_board_within_budget(client, board, known_jobs) for board in self.identifiers))
+
+        seen_count = sum(seen for seen, _ in results)
+        added_count = sum(added for _, added in results)
+        print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
+        return seen_count, added_count
+
+    async def fetch_offers(self, client: AsyncHttpClient, board) -> list:
+        """Downloads and extracts the offers of one board. Override for custom formats."""
+        return await self.fetch_page(client, board, 1)
+
+    async def fetch_page(self, client: AsyncHttpClient, board, page: int) -> list:
+        url, params, headers = self.build_page_request(board, page)
+        payload = await self.fetch_listing(client, board, url, params=params, headers=headers)
+        return self.extract_offers(payload, board)
+
+    async def fetch_pages(self, client: AsyncHttpClient, board, known_jobs: KnownJobs) -> list:
+        """
+        Walks the listing pages of a board (newest first where the API sorts by date). Page 1 is
+        requested alone, so a query without news costs one request; later pages follow
+        `page_concurrency` at a time. Paging stops after a short or empty page, or one whose
+        offers are all known already.
+        """
+        offers, seen_ids = [], set()
+
+        def add_page(page_offers: list) -> bool:
+            """Adds a page's new offers; True when paging should stop after it."""
+            all_known = True
+            for offer in page_offers:
+                identity, known = self._offer_identity(offer, board, known_jobs)
+                if identity in seen_ids:
+                    continue
+                if identity is not None:
+                    seen_ids.add(identity)
+                offers.append(offer)
+                all_known = all_known and known
+            full = self.page_size is None or len(page_offers) >= self.page_size
+            return not page_offers or not full or all_known
+
+        stop = add_page(await self.fetch_page(client, board, 1))
+        page = 1
+        while not stop and page < self.max_pages:
+            window = list(range(page + 1, min(page + max(1, self.page_concurrency), self.max_pages) + 1))
+            results = await asyncio.gather(*(self.fetch_page(client, board, number) for number in window), return_exceptions=True)
+            for number, result in zip(window, results):
+                page = number
+                if isinstance(result, ArchiveMiss):
+                    # The recorded run stopped paging here.
+                    stop = True
+                elif isinstance(result, BaseException):
+                    # The pages read so far are still good; the rest waits for the next run.
+                    print(f"⚠️ Page {number} of {self.board_label(board)} failed ({type(result).__name__} - {result}); stopping there.")
+                    self._pending_validators.pop(self.board_key(board), None)
+                    stop = True
+                else:
+                    stop = add_page(result)
+                if stop:
+                    break
+        if page > 1:
+            print(f"📑 {self.board_label(board)}: read {page} pages.")
+        return offers
+
+    def _offer_identity(self, offer, board, known_jobs: KnownJobs) -> tuple[str | None, bool]:
+        """(platform id or URL, whether it is stored already) of a raw offer, via the cheap `adapt`."""
+        try:
+            record = self.adapt(offer, board)
+        except Exception:
+            return None, False
+        if record is None:
+            return None, True
+        platform_job_id = record.platform_job_id if self.match_on_platform_id else None
+        identity = str(platform_job_id) if platform_job_id else record.job_url
+        return identity, known_jobs.is_known(platform_job_id, record.job_url)
+
+    async def fetch_listing(self, client: AsyncHttpClient, board, url: str, params: dict | None = None, headers: dict | None = None):
+        """
+        GETs and decodes one listing response of a board, conditionally when enabled.
+        Raises NotModified on a 304; fresh validators are saved only once the board is stored.
+        """
+        if not self.conditional_requests:
+            return await client.get_json(url, params=params, headers=headers)
+        cache_key = request_cache_key(url, params)
+        request_headers = {**(headers or {}), **conditional_headers(self.http_validators.get(cache_key))}
+        response = await client.get(url, params=params, headers=request_headers)
+        if response.status == 304:
+            raise NotModified(url)
+        response.raise_for_status()
+        if response_archive.replaying:
+            return response.json()
+        self._pending_validators.setdefault(self.board_key(board), []).append(
+            (cache_key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        )
+        return response.json()
+
+    async def fetch_board(self, client: AsyncHttpClient, board, known_jobs: KnownJobs) -> tuple[int, int]:
+        """Fetches, normalizes and stores one board. Scraping errors are reported and never propagate."""
+        label = self.board_label(board)
+        board_key = self.board_key(board)
+        try:
+            if self.max_pages > 1:
+                offers = await self.fetch_pages(client, board, known_jobs)
+            else:
+                offers = await self.fetch_offers(client, board)
+            print(f"📥 {len(offers)} offers found for {label}.")
+            result = await self.process_offers(client, offers, board, known_jobs)
+            await asyncio.to_thread(save_http_validators, self._pending_validators.pop(board_key, []))
+        except NotModified:
+            touched = await asyncio.to_thread(touch_board_last_seen, self.platform_source, board_key)
+            print(f"♻️ {label} unchanged since last run (304). Touched {touched} jobs.")
+            result = touched, 0
+        except HTTP_ERRORS as e:
+            print(f"⚠️ HTTP error for {label}: {type(e).__name__} - {e}")
+            await asyncio.to_thread(self._board_failed, board, e)
+            return 0, 0
+        except Exception as e:
+            print(f"❌ Unexpected error for {label}: {type(e).__name__} - {e}")
+            await asyncio.to_thread(self._board_failed, board, e)
+            return 0, 0
+        finally:
+            self._pending_validators.pop(board_key, None)
+        await asyncio.to_thread(self._board_done, board, *result)
+        return result
+
+    async def fetch_board_within_budget(self, client: AsyncHttpClient, board, known_jobs: KnownJobs) -> tuple[int, int]:
+        """
+        fetch_board bounded by the budget: a board that runs out of time is cancelled and deferred.
+        The board first waits for one of the run's board slots; its budget starts once it has one.
+        """
+        if self._board_slots is None:
+            return await self._fetch_board_timed(client, board, known_jobs)
+        async with self._board_slots:
+            return await self._fetch_board_timed(client, board, known_jobs)
+
+    async def _fetch_board_timed(self, client: AsyncHttpClient, board, known_jobs: KnownJobs) -> tuple[int, int]:
+        if self.budget is None:
+            return await self.fetch_board(client, board, known_jobs)
+        if self._past_deadline():
+            await asyncio.to_thread(self._defer_unstarted, board)
+            return 0, 0
+        try:
+            return await asyncio.wait_for(self.fetch_board(client, board, known_jobs), self.budget.board_timeout())
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(self._defer_out_of_time, board)
+            return 0, 0
+
+    async def process_offers(self, client: AsyncHttpClient, offers, board, known_jobs: KnownJobs) -> tuple[int, int]:
+        """Adapts offers, short-circuits unchanged ones, enriches the rest and saves the board."""
+        records, unchanged_urls = [], []
+        board_key = self.board_key(board)
+        for offer in offers:
+            record = self.adapt(offer, board)
+            if record is None:
+                continue
+            record.source_board = board_key
+            known_url = known_jobs.unchanged_url(
+                record.platform_job_id if self.match_on_platform_id else None,
+                record.job_url,
+                record.date_posted_on_platform,
+            )
+            if known_url:
+                unchanged_urls.append(known_url)
+            else:
+                records.append((record, offer))
+
+        if self.description_cleaner is not None and records:
+            descriptions = await get_cleaning_pool().clean_async(self.description_cleaner, [offer for _, offer in records])
+            for (record, _), (api_description, full_description) in zip(records, descriptions):
+                record.api_provided_description = api_description
+                record.full_description_text = full_description
+
+        semaphore = asyncio.Semaphore(max(1, self.enrich_concurrency))
+
+        async def enrich_bounded(record, offer):
+            async with semaphore:
+                return await self.enrich(client, record, offer, board)
+
+        kept = await asyncio.gather(*(enrich_bounded(record, offer) for record, offer in records))
+        kept_records = [record for (record, _), keep in zip(records, kept) if keep is not False]
+        if len(kept_records) < len(records):
+            # A 304 next run would skip the dropped postings, so keep that request unconditional.
+            self._pending_validators.pop(board_key, None)
+        return await asyncio.to_thread(self._save_board, kept_records, unchanged_urls, board_key)
+
+    def rebuilt_from_archive(self, record: JobRecord) -> bool:
+        """Whether a replayed record carries all the content a live run stored. Sources with unarchived fetches override it."""
+        return True
+
+    def _save_board(self, records: list[JobRecord], unchanged_urls: list[str], board_key: str) -> tuple[int, int]:
+        """Saves a board's records; runs in a worker thread because the writer lock may block."""
+        if not response_archive.replaying:
+            return save_scraped_jobs([record.to_job_data() for record in records], unchanged_urls, board_key)
+        # A replay rewrites stored content, so normalizer changes reach known postings too; records
+        # the archive could not rebuild completely are upserted normally and keep the stored content.
+        rebuilt = [record.to_job_data() for record in records if self.rebuilt_from_archive(record)]
+        partial = [record.to_job_data() for record in records if not self.rebuilt_from_archive(record)]
+        seen, added = save_scraped_jobs(rebuilt, unchanged_urls, board_key, refresh_content=True)
+        partial_seen, partial_added = save_scraped_jobs(partial, [], board_key)
+        return seen + partial_seen, added + partial_added
@@ -0,0 +1,37 @@
+# agents/scraper/board_hooks.py
+
+class BoardHooks:
+    """
+    Mixin wiring a scraper's per-board outcomes to ScraperAgent's run tracking. The agent sets
+    the hooks and the budget on each instance; every one of them may be left unset.
+    Asynchronous scrapers call the helpers through asyncio.to_thread, since hooks write to the database.
+    """
+    # Called as on_board_done(board, seen, added) once a board is stored completely (ScraperAgent checkpoints).
+    on_board_done = None
+    # Called as on_board_failed(board, error) when a board could not be scraped (ScraperAgent circuit breaker).
+    on_board_failed = None
+    # SourceBudget bounding each board and the source as a whole (ScraperAgent run deadline).
+    budget = None
+
+    def _board_done(self, board, seen: int, added: int):
+        """
+        Reports a board stored completely. Call it after the board's try block (in its `else:`),
+        never inside it: an error of the bookkeeping itself must not be counted as a failure of the board.
+        """
+        if self.on_board_done is not None:
+            self.on_board_done(board, seen, added)
+
+    def _board_failed(self, board, error: Exception):
+        if self.on_board_failed is not None:
+            self.on_board_failed(board, error)
+
+    def _past_deadline(self) -> bool:
+        """Whether the budget leaves no time to start another board."""
+        return self.budget is not None and self.budget.expired()
+
+    def _defer_unstarted(self, board):
+        self.budget.defer(board, "not started before the deadline")
+
+    def _defer_out_of_time(self, board):
+        """Defers a board its budget cut off."""
+        self.budget.defer(board, "cancelled at the deadline" if self.budget.expired() else "ran past its time budget")
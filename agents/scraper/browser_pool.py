@@ -0,0 +1,188 @@
+# agents/scraper/browser_pool.py
+
+import asyncio
+import atexit
+import os
+import threading
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+from agents.scraper.http_client import SCRAPER_PER_HOST_LIMIT
+from agents.scraper.rate_limiter import host_key, rate_limiter
+
+# How many pages (each in its own browser context) may be open at once in this process.
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 4))
+# A page and its context are thrown away after this many navigations, which keeps
+# Chromium's per-page memory from creeping up over long runs.
+BROWSER_PAGE_MAX_NAVIGATIONS = int(os.getenv("BROWSER_PAGE_MAX_NAVIGATIONS", 50))
+BROWSER_USER_AGENT = os.getenv("BROWSER_USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
+
+# Nothing we scrape needs pixels, sound or typography.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+# Third-party analytics, tag managers and session recorders, matched on host_key().
+BLOCKED_TRACKER_DOMAINS = {
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googleadservices.com",
+    "facebook.net", "hotjar.com", "segment.com", "segment.io", "mixpanel.com", "amplitude.com",
+    "fullstory.com", "intercom.io", "hs-scripts.com", "hs-analytics.net", "clarity.ms",
+    "datadoghq-browser-agent.com", "sentry-cdn.com", "linkedin.com", "licdn.com",
+}
+
+async def block_unneeded_resources(route):
+    """Route handler aborting images, media, fonts and trackers; everything else continues."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or host_key(request.url) in BLOCKED_TRACKER_DOMAINS:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class PooledPage:
+    """A page in its own browser context, counting main-frame navigations for recycling."""
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+        page.on("framenavigated", self._on_navigated)
+
+    def _on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.navigations += 1
+
+    @property
+    def worn_out(self) -> bool:
+        return self.navigations >= BROWSER_PAGE_MAX_NAVIGATIONS or self.page.is_closed()
+
+    async def close(self):
+        try:
+            await self.context.close()
+        except Exception as e:
+            print(f"⚠️ Could not close browser context: {type(e).__name__} - {e}")
+
+class BrowserPool:
+    """
+    One headless Chromium per process, shared by every browser-based scraper.
+
+    Playwright objects are bound to the event loop that created them, so the pool owns a
+    background thread running its own loop. Scrapers hand it a coroutine with `run()`
+    (callable from any thread) or `call()` (from another event loop) and, inside it,
+    borrow pages with `async with pool.page()`.
+    Up to `size` pages are open at once; each lives in its own context with resource
+    blocking installed and is replaced after BROWSER_PAGE_MAX_NAVIGATIONS navigations.
+    """
+    def __init__(self, size: int = BROWSER_POOL_SIZE, per_host_limit: int = SCRAPER_PER_HOST_LIMIT):
+        self.size = max(1, size)
+        self.per_host_limit = max(1, per_host_limit)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="browser-pool", daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = None
+        self._idle = None
+        self._slots = None
+        self._host_semaphores = {}
+
+    def run(self, coro):
+        """Runs a coroutine on the pool's event loop and blocks the calling thread for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def call(self, coro):
+        """Awaits a coroutine on the pool's event loop from another running event loop."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def _ensure_browser(self):
+        # Loop-bound primitives are created lazily, on the pool's own loop.
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+            self._idle = asyncio.LifoQueue()
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                print("🧭 Launching shared headless Chromium...")
+                self._browser = await self._playwright.chromium.launch(headless=True)
+
+    async def _new_page(self) -> PooledPage:
+        context = await self._browser.new_context(user_agent=BROWSER_USER_AGENT)
+        await context.route("**/*", block_unneeded_resources)
+        return PooledPage(context, await context.new_page())
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrows a page; waits while all `size` pages are in use."""
+        await self._ensure_browser()
+        async with self._slots:
+            pooled = None
+            while not self._idle.empty() and pooled is None:
+                candidate = self._idle.get_nowait()
+                if candidate.page.is_closed() or not self._browser.is_connected():
+                    await candidate.close()
+                else:
+                    pooled = candidate
+            if pooled is None:
+                pooled = await self._new_page()
+            try:
+                yield pooled.page
+            except BaseException:
+                # A page that failed mid-flight may be in any state; never hand it out again.
+                await pooled.close()
+                raise
+            if pooled.worn_out:
+                await pooled.close()
+            else:
+                self._idle.put_nowait(pooled)
+
+    async def goto(self, page, url: str, **kwargs):
+        """page.goto behind the shared per-host rate limit and a per-host cap on concurrent navigations."""
+        key = host_key(url)
+        if key not in self._host_semaphores:
+            self._host_semaphores[key] = asyncio.Semaphore(self.per_host_limit)
+        await rate_limiter.wait_async(url)
+        async with self._host_semaphores[key]:
+            return await page.goto(url, **kwargs)
+
+    async def _shutdown(self):
+        if self._idle is not None:
+            while not self._idle.empty():
+                await self._idle.get_nowait().close()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = self._playwright = None
+
+    def close(self):
+        """Closes the browser and stops the pool's event loop."""
+        if self._loop.is_closed():
+            return
+        try:
+            self.run(self._shutdown())
+        except Exception as e:
+            print(f"⚠️ Error shutting down browser pool: {type(e).__name__} - {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """Returns this process's BrowserPool, creating it on first use and again after a fork."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = BrowserPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+def close_browser_pool():
+    """Shuts down this process's browser, if one was launched (e.g. at exit or between tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+atexit.register(close_browser_pool)
@@ -0,0 +1,90 @@
+# agents/scraper/checkpoints.py
+
+import json
+import os, sys
+from datetime import datetime, timedelta, timezone
+
+try:
+    from utils.db_utils import (start_scrape_run, find_resumable_run, finish_scrape_run, abandon_stale_runs,
+                                record_scrape_checkpoint, get_completed_boards)
+    from agents.scraper.response_archive import new_run_id
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.db_utils import (start_scrape_run, find_resumable_run, finish_scrape_run, abandon_stale_runs,
+                                record_scrape_checkpoint, get_completed_boards)
+    from agents.scraper.response_archive import new_run_id
+
+# Boards completed (in any run) less than this many hours ago are skipped. 0 disables it.
+SCRAPER_CHECKPOINT_FRESHNESS_HOURS = float(os.getenv("SCRAPER_CHECKPOINT_FRESHNESS_HOURS", 0))
+# Interrupted runs older than this are abandoned instead of resumed.
+SCRAPER_RESUME_MAX_AGE_HOURS = float(os.getenv("SCRAPER_RESUME_MAX_AGE_HOURS", 24))
+
+def board_checkpoint_key(identifier) -> str:
+    """Stable key of one configured board: the identifier itself, or its canonical JSON for dict configs."""
+    if isinstance(identifier, str):
+        return identifier
+    return json.dumps(identifier, sort_keys=True)
+
+def _hours_ago(hours: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+
+class ScrapeCheckpoints:
+    """
+    Per-board progress of one scrape run, persisted in scrape_checkpoints.
+
+    Scrapers report each board they stored completely (their `on_board_done` hook). A run
+    that dies halfway stays 'running', and the next resumed run picks up its run id and
+    skips the boards it already completed. Independently, boards completed in any run
+    within the freshness window are skipped.
+    """
+    def __init__(self, run_id: str, resumed: bool = False, freshness_hours: float = SCRAPER_CHECKPOINT_FRESHNESS_HOURS):
+        self.run_id = run_id
+        self.resumed = resumed
+        self.freshness_hours = freshness_hours
+
+    @classmethod
+    def start(cls, target_source: str | None = None, resume: bool = False,
+              freshness_hours: float = SCRAPER_CHECKPOINT_FRESHNESS_HOURS,
+              resume_max_age_hours: float = SCRAPER_RESUME_MAX_AGE_HOURS) -> "ScrapeCheckpoints":
+        """Resumes the latest interrupted run of the same target when asked to, else starts a new run."""
+        cutoff = _hours_ago(resume_max_age_hours)
+        abandoned = abandon_stale_runs(target_source, cutoff)
+        if abandoned:
+            print(f"🗑️ Abandoned {abandoned} interrupted scrape runs older than {resume_max_age_hours:g}h.")
+        run_id = find_resumable_run(target_source, cutoff) if resume else None
+        if run_id:
+            print(f"⏯️ Resuming interrupted scrape run {run_id}.")
+            return cls(run_id, resumed=True, freshness_hours=freshness_hours)
+        if not resume:
+            # A fresh run supersedes whatever was left unfinished for this target.
+            resumable = find_resumable_run(target_source, cutoff)
+            if resumable:
+                finish_scrape_run(resumable, status="abandoned")
+        run_id = new_run_id()
+        start_scrape_run(run_id, target_source)
+        return cls(run_id, freshness_hours=freshness_hours)
+
+    def pending(self, source_name: str, identifiers: list) -> list:
+        """The identifiers of a source that still need scraping in this run."""
+        completed_after = _hours_ago(self.freshness_hours) if self.freshness_hours > 0 else None
+        if not self.resumed and completed_after is None:
+            return list(identifiers)
+        completed = get_completed_boards(source_name, self.run_id if self.resumed else None, completed_after)
+        remaining = [identifier for identifier in identifiers if board_checkpoint_key(identifier) not in completed]
+        skipped = len(identifiers) - len(remaining)
+        if skipped:
+            print(f"⏭️ {source_name}: skipping {skipped} of {len(identifiers)} boards already completed.")
+        return remaining
+
+    def unfinished(self, source_name: str, identifiers: list) -> list:
+        """The identifiers of a source without a checkpoint in this run."""
+        completed = get_completed_boards(source_name, self.run_id)
+        return [identifier for identifier in identifiers if board_checkpoint_key(identifier) not in completed]
+
+    def board_done(self, source_name: str, identifier, seen: int, added: int):
+        record_scrape_checkpoint(self.run_id, source_name, board_checkpoint_key(identifier), seen, added)
+
+    def finish(self):
+        finish_scrape_run(self.run_id)
@@ -0,0 +1,125 @@
+# agents/scraper/circuit_breaker.py
+
+import os, sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+try:
+    from utils.db_utils import get_board_circuits, save_board_circuit
+    from agents.scraper.checkpoints import board_checkpoint_key
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.db_utils import get_board_circuits, save_board_circuit
+    from agents.scraper.checkpoints import board_checkpoint_key
+
+# Consecutive failed runs after which a board's circuit opens.
+SCRAPER_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("SCRAPER_CIRCUIT_FAILURE_THRESHOLD", 3))
+# How long the first opening lasts; each failed probe doubles it, up to the maximum.
+SCRAPER_CIRCUIT_COOLDOWN_HOURS = float(os.getenv("SCRAPER_CIRCUIT_COOLDOWN_HOURS", 12))
+SCRAPER_CIRCUIT_MAX_COOLDOWN_HOURS = float(os.getenv("SCRAPER_CIRCUIT_MAX_COOLDOWN_HOURS", 30 * 24))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+def is_board_failure(error: BaseException) -> bool:
+    """Whether an error says something about the board. Rate limiting (429) is about us, not the board."""
+    status = getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status != 429
+
+def cooldown_hours(trips: int, base_hours: float = SCRAPER_CIRCUIT_COOLDOWN_HOURS,
+                   max_hours: float = SCRAPER_CIRCUIT_MAX_COOLDOWN_HOURS) -> float:
+    """Cooldown after the `trips`-th consecutive opening: base, 2x base, 4x base... capped at max."""
+    return min(max_hours, base_hours * 2 ** max(0, trips - 1))
+
+class CircuitBreaker:
+    """
+    Per-board circuit breaker persisted in board_circuits, so dead or renamed boards stop
+    costing a full timeout on every run.
+
+    A board's circuit is closed while it works. After `failure_threshold` consecutive failed
+    runs it opens and the board is skipped for a cooldown. Once the cooldown is over the
+    circuit goes half-open: the next run probes the board once. A successful probe closes
+    it; a failed one reopens it with a doubled cooldown.
+    """
+    def __init__(self, failure_threshold: int = SCRAPER_CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown_hours: float = SCRAPER_CIRCUIT_COOLDOWN_HOURS,
+                 max_cooldown_hours: float = SCRAPER_CIRCUIT_MAX_COOLDOWN_HOURS, now: datetime | None = None):
+        self.failure_threshold = failure_threshold
+        self.cooldown_hours = cooldown_hours
+        self.max_cooldown_hours = max_cooldown_hours
+        self.now = now or datetime.now(timezone.utc)
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def allowed(self, source_name: str, identifiers: list) -> list:
+        """The identifiers of a source whose circuit lets them run; expired open circuits go half-open."""
+        self._circuits.update(get_board_circuits(source_name))
+        allowed, skipped = [], 0
+        for identifier in identifiers:
+            key = (source_name, board_checkpoint_key(identifier))
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit["state"] != OPEN:
+                allowed.append(identifier)
+            elif datetime.fromisoformat(circuit["open_until"]) <= self.now:
+                circuit["state"] = HALF_OPEN
+                save_board_circuit(*key, circuit)
+                print(f"🔌 {source_name}/{key[1]}: cooldown over, probing the board once.")
+                allowed.append(identifier)
+            else:
+                skipped += 1
+        if skipped:
+            print(f"🔌 {source_name}: skipping {skipped} boards with an open circuit.")
+        return allowed
+
+    def board_succeeded(self, source_name: str, identifier):
+        key = (source_name, board_checkpoint_key(identifier))
+        with self._lock:
+            circuit = self._circuits.pop(key, None)
+        if circuit is None or (circuit["state"] == CLOSED and not circuit["consecutive_failures"]):
+            return
+        if circuit["state"] != CLOSED:
+            print(f"🔌 {source_name}/{key[1]} recovered; circuit closed.")
+        save_board_circuit(*key, {"state": CLOSED, "consecutive_failures": 0, "trips": 0})
+
+    def board_failed(self, source_name: str, identifier, error: BaseException):
+        """Counts a failed run of a board, opening (or reopening) its circuit when it keeps failing."""
+        if not is_board_failure(error):
+            return
+        key = (source_name, board_checkpoint_key(identifier))
+        failed_at = datetime.now(timezone.utc)
+        with self._lock:
+            circuit = self._circuits.setdefault(key, {"state": CLOSED, "consecutive_failures": 0, "trips": 0})
+            circuit["consecutive_failures"] += 1
+            circuit["last_error"] = f"{type(error).__name__}: {error}"[:300]
+            circuit["last_failure_at"] = failed_at.isoformat()
+            if circuit["state"] == HALF_OPEN or circuit["consecutive_failures"] >= self.failure_threshold:
+                circuit["state"] = OPEN
+                circuit["trips"] += 1
+                cooldown = cooldown_hours(circuit["trips"], self.cooldown_hours, self.max_cooldown_hours)
+                circuit["open_until"] = (failed_at + timedelta(hours=cooldown)).isoformat()
+                print(f"🔌 {source_name}/{key[1]} failed {circuit['consecutive_failures']} runs in a row; "
+                      f"circuit open for {cooldown:g}h.")
+            circuit = dict(circuit)
+        save_board_circuit(*key, circuit)
+
+def open_circuit_lines(source_name: str | None = None) -> list[str]:
+    """One line per board whose circuit is not closed, soonest retry first."""
+    circuits = [circuit for circuit in get_board_circuits(source_name).values() if circuit["state"] != CLOSED]
+    lines = []
+    for circuit in sorted(circuits, key=lambda circuit: circuit["open_until"] or ""):
+        retry = "next run" if circuit["state"] == HALF_OPEN else f"after {datetime.fromisoformat(circuit['open_until']).strftime('%Y-%m-%d %H:%M')} UTC"
+        lines.append(f"{circuit['source_name']}/{circuit['board_key']}: {circuit['state']}, "
+                     f"{circuit['consecutive_failures']} failed runs, retry {retry} - {circuit['last_error']}")
+    return lines
+
+def print_circuit_report(source_name: str | None = None):
+    lines = open_circuit_lines(source_name)
+    if not lines:
+        print("🔌 All board circuits are closed.")
+        return
+    print(f"🔌 {len(lines)} boards are being skipped or probed:")
+    for line in lines:
+        print(f"  - {line}")
@@ -0,0 +1,219 @@
+# agents/scraper/cleaning_pool.py
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker processes for description cleaning. 0 keeps cleaning inline on the scraping thread.
+SCRAPER_CLEANING_PROCESSES = int(os.getenv("SCRAPER_CLEANING_PROCESSES", 0))
+# Payloads per task sent to a worker; larger chunks amortize pickling and IPC.
+SCRAPER_CLEANING_CHUNK_SIZE = int(os.getenv("SCRAPER_CLEANING_CHUNK_SIZE", 50))
+# Batches smaller than this are cleaned inline; shipping them would cost more than it saves.
+SCRAPER_CLEANING_MIN_BATCH = int(os.getenv("SCRAPER_CLEANING_MIN_BATCH", 100))
+
+def clean_chunk(cleaner, payloads: list) -> tuple[list, float]:
+    """Runs in a worker: applies `cleaner` to each payload and reports the time it took."""
+    start = time.perf_counter()
+    results = [cleaner(payload) for payload in payloads]
+    return results, time.perf_counter() - start
+
+class CleaningStats:
+    """Throughput counters of one cleaning path (pool or inline)."""
+    def __init__(self):
+        self.documents = 0
+        self.chunks = 0
+        self.worker_seconds = 0.0
+        self.wall_seconds = 0.0
+        self._active = 0
+        self._active_since = 0.0
+
+    def begin(self):
+        # Wall time is the union of active intervals, so overlapping boards are not double counted.
+        if self._active == 0:
+            self._active_since = time.perf_counter()
+        self._active += 1
+
+    def end(self):
+        self._active -= 1
+        if self._active == 0:
+            self.wall_seconds += time.perf_counter() - self._active_since
+
+    def copy(self) -> "CleaningStats":
+        """The counters as they are now; in-flight work is not included."""
+        copied = CleaningStats()
+        copied.documents, copied.chunks = self.documents, self.chunks
+        copied.worker_seconds, copied.wall_seconds = self.worker_seconds, self.wall_seconds
+        return copied
+
+    def since(self, earlier: "CleaningStats") -> "CleaningStats":
+        """The work counted after `earlier` (a copy() of these stats) was taken."""
+        delta = CleaningStats()
+        delta.documents, delta.chunks = self.documents - earlier.documents, self.chunks - earlier.chunks
+        delta.worker_seconds = self.worker_seconds - earlier.worker_seconds
+        delta.wall_seconds = self.wall_seconds - earlier.wall_seconds
+        return delta
+
+class CleaningPool:
+    """
+    Optional process-pool stage for CPU-bound description cleaning.
+
+    `cleaner` must be a module-level function (it is pickled by name) taking one raw payload
+    and returning its compact cleaned form. Large batches are split into chunks and cleaned
+    in worker processes, so HTML parsing runs outside the GIL of the scraping threads; small
+    batches, or every batch when SCRAPER_CLEANING_PROCESSES is 0, are cleaned inline.
+    """
+    def __init__(self, processes: int = SCRAPER_CLEANING_PROCESSES, chunk_size: int = SCRAPER_CLEANING_CHUNK_SIZE,
+                 min_batch: int = SCRAPER_CLEANING_MIN_BATCH):
+        self.processes = max(0, processes)
+        self.chunk_size = max(1, chunk_size)
+        self.min_batch = max(1, min_batch)
+        self.stats = {"pool": CleaningStats(), "inline": CleaningStats()}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Scraping runs many threads; spawned workers avoid forking them mid-request.
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+                print(f"🧹 Started description cleaning pool with {self.processes} processes.")
+            return self._executor
+
+    def _chunks(self, payloads: list) -> list[list]:
+        return [payloads[i:i + self.chunk_size] for i in range(0, len(payloads), self.chunk_size)]
+
+    def _use_pool(self, payloads: list) -> bool:
+        return self.enabled and len(payloads) >= self.min_batch
+
+    def _record(self, path: str, results: list, worker_seconds: float, chunks: int):
+        stats = self.stats[path]
+        stats.documents += len(results)
+        stats.chunks += chunks
+        stats.worker_seconds += worker_seconds
+
+    def _clean_inline(self, cleaner, payloads: list) -> list:
+        with self._lock:
+            self.stats["inline"].begin()
+        try:
+            results, seconds = clean_chunk(cleaner, payloads)
+        finally:
+            with self._lock:
+                self.stats["inline"].end()
+        with self._lock:
+            self._record("inline", results, seconds, 1)
+        return results
+
+    def _pool_failed(self, error: Exception):
+        print(f"⚠️ Cleaning pool failed ({type(error).__name__} - {error}); cleaning inline from now on.")
+        with self._lock:
+            self.processes = 0
+
+    def clean(self, cleaner, payloads: list) -> list:
+        """Cleans `payloads` in order, through the process pool when the batch is large enough."""
+        payloads = list(payloads)
+        if not self._use_pool(payloads):
+            return self._clean_inline(cleaner, payloads)
+        executor = self._get_executor()
+        chunks = self._chunks(payloads)
+        with self._lock:
+            self.stats["pool"].begin()
+        try:
+            futures = [executor.submit(clean_chunk, cleaner, chunk) for chunk in chunks]
+            outcomes = [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            self._pool_failed(e)
+            return self._clean_inline(cleaner, payloads)
+        finally:
+            with self._lock:
+                self.stats["pool"].end()
+        return self._collect(outcomes)
+
+    async def clean_async(self, cleaner, payloads: list) -> list:
+        """Async variant of `clean`: the event loop keeps serving other boards while workers run."""
+        payloads = list(payloads)
+        if not self._use_pool(payloads):
+            return self._clean_inline(cleaner, payloads)
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.stats["pool"].begin()
+        try:
+            outcomes = await asyncio.gather(*(
+                loop.run_in_executor(executor, clean_chunk, cleaner, chunk) for chunk in self._chunks(payloads)
+            ))
+        except BrokenProcessPool as e:
+            self._pool_failed(e)
+            return self._clean_inline(cleaner, payloads)
+        finally:
+            with self._lock:
+                self.stats["pool"].end()
+        return self._collect(outcomes)
+
+    def _collect(self, outcomes: list[tuple[list, float]]) -> list:
+        results = [result for chunk_results, _ in outcomes for result in chunk_results]
+        with self._lock:
+            self._record("pool", results, sum(seconds for _, seconds in outcomes), len(outcomes))
+        return results
+
+    def snapshot(self) -> dict[str, CleaningStats]:
+        """Copies of the counters, so report(since=...) covers only the work done after it."""
+        with self._lock:
+            return {path: stats.copy() for path, stats in self.stats.items()}
+
+    def report(self, since: dict[str, CleaningStats] | None = None) -> list[str]:
+        """
+        Returns one throughput line per cleaning path that did any work. The pool lives as long
+        as its process, so a caller reporting on one run passes the snapshot() taken at its start.
+        """
+        lines = []
+        with self._lock:
+            for path, stats in self.stats.items():
+                if since is not None:
+                    stats = stats.since(since[path])
+                if not stats.documents:
+                    continue
+                rate = stats.documents / stats.wall_seconds if stats.wall_seconds else float("inf")
+                label = f"process pool ({self.processes or 'stopped'} workers)" if path == "pool" else "inline"
+                lines.append(
+                    f"{label}: {stats.documents} descriptions in {stats.chunks} chunks, "
+                    f"{stats.wall_seconds:.2f}s wall, {stats.worker_seconds:.2f}s cleaning, {rate:.0f} descriptions/s"
+                )
+        return lines
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_cleaning_pool() -> CleaningPool:
+    """Returns this process's CleaningPool, creating it on first use and again after a fork."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = CleaningPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+def close_cleaning_pool():
+    """Stops this process's cleaning workers, if any were started (e.g. at exit or between tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+atexit.register(close_cleaning_pool)
@@ -0,0 +1,85 @@
+# agents/scraper/deadline.py
+
+import os
+import threading
+import time
+
+# Upper bound of the whole scrape stage, so filtering and notification start on time. 0 disables it.
+SCRAPER_DEADLINE_MINUTES = float(os.getenv("SCRAPER_DEADLINE_MINUTES", 10))
+# Share of the deadline one source may use, so a slow source cannot starve the others.
+SCRAPER_SOURCE_BUDGET_SHARE = float(os.getenv("SCRAPER_SOURCE_BUDGET_SHARE", 0.6))
+# Upper bound of one board (listing, enrichment and storage). 0 disables it.
+SCRAPER_BOARD_BUDGET_SECONDS = float(os.getenv("SCRAPER_BOARD_BUDGET_SECONDS", 180))
+# How long the run waits for in-flight units to wind down after the deadline before moving on.
+SCRAPER_DEADLINE_GRACE_SECONDS = float(os.getenv("SCRAPER_DEADLINE_GRACE_SECONDS", 30))
+
+class BudgetExceeded(Exception):
+    """Raised inside a synchronous scraper when a board runs past its time budget."""
+
+def _earliest(*limits: float | None) -> float | None:
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+class RunDeadline:
+    """The scrape stage's deadline, measured on the monotonic clock from its creation."""
+    def __init__(self, minutes: float = SCRAPER_DEADLINE_MINUTES, source_share: float = SCRAPER_SOURCE_BUDGET_SHARE,
+                 board_budget_seconds: float = SCRAPER_BOARD_BUDGET_SECONDS, clock=time.monotonic):
+        self.seconds = minutes * 60 if minutes > 0 else None
+        self.source_share = source_share
+        self.board_budget_seconds = board_budget_seconds if board_budget_seconds > 0 else None
+        self.clock = clock
+        self.started = clock()
+
+    def remaining(self) -> float | None:
+        return None if self.seconds is None else self.started + self.seconds - self.clock()
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def source_budget(self, source_name: str, on_deferred=None) -> "SourceBudget":
+        return SourceBudget(self, source_name, on_deferred)
+
+class SourceBudget:
+    """
+    The time one source may still spend: the earlier of the run deadline and its share of it.
+    Scrapers bound each board with `board_timeout()` and report boards they had to give up
+    on (or never started) through `defer`, so the next run does them first.
+    """
+    def __init__(self, deadline: RunDeadline, source_name: str, on_deferred=None):
+        self.deadline = deadline
+        self.source_name = source_name
+        self.on_deferred = on_deferred
+        self.ends_at = None if deadline.seconds is None else deadline.started + deadline.seconds * deadline.source_share
+        self.deferred = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float | None:
+        source_remaining = None if self.ends_at is None else self.ends_at - self.deadline.clock()
+        return _earliest(self.deadline.remaining(), source_remaining)
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def board_timeout(self) -> float | None:
+        """Seconds the next board may take, or None when nothing bounds it."""
+        timeout = _earliest(self.deadline.board_budget_seconds, self.remaining())
+        return None if timeout is None else max(0.0, timeout)
+
+    def board_ends_at(self) -> float | None:
+        """board_timeout() as a point on the deadline's clock, for synchronous scrapers to poll."""
+        timeout = self.board_timeout()
+        return None if timeout is None else self.deadline.clock() + timeout
+
+    def check(self, board_ends_at: float | None):
+        """Raises BudgetExceeded once the clock passes `board_ends_at` (from board_ends_at())."""
+        if board_ends_at is not None and self.deadline.clock() > board_ends_at:
+            raise BudgetExceeded(f"{self.source_name} board ran out of time")
+
+    def defer(self, board, reason: str):
+        print(f"⏱️ {self.source_name}/{board}: {reason}; deferred to the front of the next run.")
+        with self._lock:
+            self.deferred.append(board)
+        if self.on_deferred is not None:
+            self.on_deferred(board)
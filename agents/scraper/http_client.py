@@ -0,0 +1,65 @@
+# agents/scraper/http_client.py
+
+import os
+import threading
+from contextlib import contextmanager
+
+import requests
+
+from agents.scraper.rate_limiter import SCRAPER_MAX_RETRIES, host_key, rate_limiter
+from agents.scraper.response_archive import archive_key, replayed_requests_response, response_archive
+
+# How many requests (or browser navigations) may hit the same site at once, across all
+# scraper threads of this process. Keeps parallel runs polite to each ATS.
+SCRAPER_PER_HOST_LIMIT = int(os.getenv("SCRAPER_PER_HOST_LIMIT", 2))
+
+class HostLimiter:
+    """Caps concurrent in-flight work per host with one bounded semaphore per host key."""
+    def __init__(self, per_host_limit: int = SCRAPER_PER_HOST_LIMIT):
+        self.per_host_limit = max(1, per_host_limit)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._semaphores[key]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Blocks until the host of `url` has a free slot, and holds it for the block."""
+        semaphore = self._semaphore(host_key(url))
+        with semaphore:
+            yield
+
+_host_limiter = HostLimiter()
+
+def host_slot(url: str):
+    """Context manager reserving one of the process-wide slots for the host of `url`."""
+    return _host_limiter.slot(url)
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """
+    requests.get that respects the per-host rate and concurrency limits. A 429 is
+    retried (up to SCRAPER_MAX_RETRIES times) once its Retry-After has passed.
+    Responses are archived or replayed like those of AsyncHttpClient; a streamed body
+    is archived (decoded) as the caller reads it.
+    """
+    key = archive_key(url, kwargs.get("params"))
+    if response_archive.replaying:
+        return replayed_requests_response(url, response_archive.lookup(key), stream=kwargs.get("stream", False))
+    for attempt in range(SCRAPER_MAX_RETRIES + 1):
+        rate_limiter.wait(url)
+        with host_slot(url):
+            response = requests.get(url, **kwargs)
+        if response.status_code != 429 or attempt == SCRAPER_MAX_RETRIES:
+            break
+        delay = rate_limiter.retry_after(url, response.headers.get("Retry-After"))
+        print(f"⏳ 429 from {host_key(url)}; retrying in {delay:.0f}s.")
+    if response_archive.recording:
+        if kwargs.get("stream"):
+            response.raw = response_archive.tee(response.raw, key, response.status_code, response.headers)
+        else:
+            response_archive.record(key, response.status_code, response.headers, response.content)
+    return response
@@ -0,0 +1,59 @@
+# agents/scraper/known_jobs.py
+
+import os, sys
+
+try:
+    from utils.db_utils import get_known_jobs
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.db_utils import get_known_jobs
+
+class KnownJobs:
+    """
+    Snapshot of the jobs one platform already has in the database, loaded once at scrape start.
+
+    Scrapers consult it before any expensive step (HTML cleaning, page downloads, detail
+    navigation) so postings that did not change since the last run are only marked as seen.
+    """
+    def __init__(self, platform_source: str, rows: list[dict]):
+        self.platform_source = platform_source
+        self._by_platform_id = {}
+        self._by_url = {}
+        for row in rows:
+            entry = (row["job_url"], row["date_posted_on_platform"])
+            self._by_url[row["job_url"]] = entry
+            if row["platform_job_id"]:
+                self._by_platform_id[str(row["platform_job_id"])] = entry
+
+    @classmethod
+    def load(cls, platform_source: str) -> "KnownJobs":
+        return cls(platform_source, get_known_jobs(platform_source))
+
+    def __len__(self):
+        return len(self._by_url)
+
+    def is_known(self, platform_job_id=None, job_url: str | None = None) -> bool:
+        """Whether the posting is stored already (by platform id or URL), changed or not."""
+        if platform_job_id and str(platform_job_id) in self._by_platform_id:
+            return True
+        return bool(job_url) and job_url in self._by_url
+
+    def unchanged_url(self, platform_job_id=None, job_url: str | None = None, marker: str | None = None) -> str | None:
+        """
+        Returns the stored job URL when the posting is known (by platform id or URL) and its
+        last-modified marker is unchanged, otherwise None. A posting without a marker is
+        considered unchanged as soon as it is known.
+        """
+        entry = None
+        if platform_job_id:
+            entry = self._by_platform_id.get(str(platform_job_id))
+        if entry is None and job_url:
+            entry = self._by_url.get(job_url)
+        if entry is None:
+            return None
+        stored_url, stored_marker = entry
+        if marker is not None and marker != stored_marker:
+            return None
+        return stored_url
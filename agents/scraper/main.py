@@ -13,18 +13,18 @@ if PROJECT_ROOT not in sys.path:
 
 from agents.scraper.scraper_agent import ScraperAgent
 from agents.filter.filter_agent import FilterAgent
-from utils.db_utils import create_jobs_table_if_not_exist
+from utils.db_utils import migrate_db
 from utils.llm_utils import call_llm, list_available_models, set_model # Keep for debugging
 
 def run_scraping(source=None):
     """Initializes the DB and runs the scraper agent for all or a specific source."""
-    create_jobs_table_if_not_exist()
+    migrate_db()
     agent = ScraperAgent()
     agent.run_scrapers(target_source=source)
 
 def run_filtering():
     """Initializes the DB and runs the filter agent."""
-    create_jobs_table_if_not_exist()
+    migrate_db()
     agent = FilterAgent()
     agent.run()
 
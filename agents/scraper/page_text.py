@@ -0,0 +1,59 @@
+# agents/scraper/page_text.py
+
+import asyncio
+from newspaper import Article, Config as NewspaperConfig
+import os, sys
+
+try:
+    from agents.scraper.http_client import host_slot
+    from agents.scraper.rate_limiter import rate_limiter
+    from agents.scraper.response_archive import response_archive
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from agents.scraper.http_client import host_slot
+    from agents.scraper.rate_limiter import rate_limiter
+    from agents.scraper.response_archive import response_archive
+
+class PageTextFallback:
+    """
+    Mixin for AsyncApiScraper sources whose payload usually carries the description: a posting
+    whose payload text came out empty gets its hosted page downloaded and extracted with
+    newspaper3k instead. Kept out of async_scraper so the other API scrapers never import it.
+    """
+    request_timeout_page = int(os.getenv("SCRAPER_REQUEST_TIMEOUT", 15))
+
+    def _fetch_full_text_newspaper3k(self, url: str) -> str:
+        if not url:
+            return ""
+        try:
+            config = NewspaperConfig()
+            config.browser_user_agent = self.user_agent
+            config.request_timeout = self.request_timeout_page
+            config.fetch_images = False
+            config.memoize_articles = False
+
+            article = Article(url, config=config)
+            with host_slot(url):
+                article.download()
+            if not article.html:
+                return ""
+            article.parse()
+            return article.text.strip() if article.text else ""
+        except Exception as e:
+            print(f"⚠️ newspaper3k failed for {url}: {type(e).__name__} - {e}")
+            return ""
+
+    async def enrich(self, client, record, offer, board):
+        # newspaper3k downloads pages itself, so a replayed run has nothing to serve them from.
+        if not record.full_description_text and not response_archive.replaying:
+            # Only an empty payload is worth a page download; other hosts keep flowing meanwhile.
+            await rate_limiter.wait_async(record.job_url)
+            # newspaper3k is blocking, so the page download runs in a worker thread.
+            record.full_description_text = await asyncio.to_thread(self._fetch_full_text_newspaper3k, record.job_url)
+        record.full_description_text = record.full_description_text or record.api_provided_description
+
+    def rebuilt_from_archive(self, record) -> bool:
+        # A replay skips the page download, so an empty payload would erase the page text a live run stored.
+        return bool(record.full_description_text)
@@ -0,0 +1,159 @@
+# agents/scraper/poll_schedule.py
+
+import math
+import os, sys
+from datetime import datetime, timedelta, timezone
+
+try:
+    from utils.db_utils import get_board_schedules, save_board_poll, get_board_churn, set_board_deferred
+    from agents.scraper.checkpoints import board_checkpoint_key
+except ImportError:
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+    from utils.db_utils import get_board_schedules, save_board_poll, get_board_churn, set_board_deferred
+    from agents.scraper.checkpoints import board_checkpoint_key
+
+# Skip boards that are not due yet. When off, every board is polled but polls are still recorded.
+SCRAPER_ADAPTIVE_POLLING = os.getenv("SCRAPER_ADAPTIVE_POLLING", "true").lower() in ("1", "true", "yes")
+# Interval after the first quiet poll; every further quiet poll doubles it, up to the maximum.
+SCRAPER_POLL_BASE_HOURS = float(os.getenv("SCRAPER_POLL_BASE_HOURS", 6))
+SCRAPER_POLL_MAX_HOURS = float(os.getenv("SCRAPER_POLL_MAX_HOURS", 7 * 24))
+# How much job history seeds the interval of a board polled for the first time.
+SCRAPER_CHURN_WINDOW_DAYS = float(os.getenv("SCRAPER_CHURN_WINDOW_DAYS", 90))
+# Scheduled runs start a little late or early; a board due within this margin is polled now.
+POLL_SLACK = timedelta(minutes=15)
+
+def backoff_interval_hours(level: int, base_hours: float = SCRAPER_POLL_BASE_HOURS, max_hours: float = SCRAPER_POLL_MAX_HOURS) -> float:
+    """Polling interval of a backoff level: every run at 0, then base, 2x base, 4x base... capped at max."""
+    if level <= 0:
+        return 0.0
+    return min(max_hours, base_hours * 2 ** (level - 1))
+
+def max_backoff_level(base_hours: float = SCRAPER_POLL_BASE_HOURS, max_hours: float = SCRAPER_POLL_MAX_HOURS) -> int:
+    """The lowest level whose interval reaches the cap."""
+    return 1 + max(0, math.ceil(math.log2(max_hours / base_hours)))
+
+def next_backoff_level(level: int, changed: bool, top_level: int) -> int:
+    """A quiet poll backs off one level; a poll that found new jobs halves the level, so busy boards converge to every run."""
+    return level // 2 if changed else min(level + 1, top_level)
+
+def level_for_churn(events: int, window_hours: float, base_hours: float = SCRAPER_POLL_BASE_HOURS,
+                    max_hours: float = SCRAPER_POLL_MAX_HOURS) -> int:
+    """
+    Starting level for a board that changed `events` times in the history window: the
+    highest level that still polls about twice per expected change.
+    """
+    expected_gap = window_hours / events if events else 2 * window_hours
+    target = expected_gap / 2
+    level = 0
+    while level < max_backoff_level(base_hours, max_hours) and backoff_interval_hours(level + 1, base_hours, max_hours) <= target:
+        level += 1
+    return level
+
+def _parse(timestamp: str | None) -> datetime | None:
+    return datetime.fromisoformat(timestamp) if timestamp else None
+
+def next_due_time(row: dict) -> datetime | None:
+    """When a scheduled board is due next: its pinned interval after the last poll, else the adaptive due time."""
+    if row.get("pinned_interval_hours") is not None:
+        last_polled = _parse(row.get("last_polled_at"))
+        return last_polled + timedelta(hours=row["pinned_interval_hours"]) if last_polled else None
+    return _parse(row.get("next_due_at"))
+
+class PollSchedule:
+    """
+    Decides which configured boards are due in a run, from how often each one changes.
+
+    Every completed poll is recorded (ScraperAgent's `on_board_done` hook): a poll without
+    new jobs backs the board off exponentially, one with new jobs brings it closer to
+    every-run polling. A board polled for the first time starts from the insert and
+    disappearance rate of its stored jobs. `pinned_interval_hours` (set with
+    `python logic.py schedule`) overrides the adaptive interval of a board. Boards the scrape
+    deadline cut off stay due and go first in the next run.
+    """
+    def __init__(self, enabled: bool = SCRAPER_ADAPTIVE_POLLING, base_hours: float = SCRAPER_POLL_BASE_HOURS,
+                 max_hours: float = SCRAPER_POLL_MAX_HOURS, churn_window_days: float = SCRAPER_CHURN_WINDOW_DAYS,
+                 now: datetime | None = None):
+        self.enabled = enabled
+        self.base_hours = base_hours
+        self.max_hours = max_hours
+        self.churn_window_days = churn_window_days
+        self.now = now or datetime.now(timezone.utc)
+        self._schedules = {}
+        self._platforms = {}
+
+    @property
+    def top_level(self) -> int:
+        return max_backoff_level(self.base_hours, self.max_hours)
+
+    def _seed_level(self, source_name: str, board_key: str) -> int:
+        """Initial backoff level of a board without a schedule, from its job history."""
+        window_start = self.now - timedelta(days=self.churn_window_days)
+        churn = get_board_churn(self._platforms.get(source_name, source_name), board_key, window_start.isoformat())
+        if not churn["total"]:
+            # Nothing stored yet: poll it and learn.
+            return 0
+        return level_for_churn(churn["inserted"] + churn["closed"], self.churn_window_days * 24, self.base_hours, self.max_hours)
+
+    def due(self, source_name: str, identifiers: list, platform_source: str | None = None) -> list:
+        """The identifiers of a source due for polling in this run."""
+        self._platforms[source_name] = platform_source or source_name
+        self._schedules.update(get_board_schedules(source_name))
+        if not self.enabled:
+            return list(identifiers)
+        due, next_due_times = [], []
+        for identifier in identifiers:
+            row = self._schedules.get((source_name, board_checkpoint_key(identifier)))
+            next_due = next_due_time(row) if row else None
+            if next_due is None or next_due <= self.now + POLL_SLACK or row.get("deferred_at"):
+                due.append(identifier)
+            else:
+                next_due_times.append(next_due)
+        if next_due_times:
+            print(f"📅 {source_name}: {len(due)} of {len(identifiers)} boards due; "
+                  f"the next skipped one is due at {min(next_due_times).strftime('%Y-%m-%d %H:%M')} UTC.")
+        return due
+
+    def is_deferred(self, source_name: str, identifier) -> bool:
+        row = self._schedules.get((source_name, board_checkpoint_key(identifier)))
+        return bool(row and row.get("deferred_at"))
+
+    def prioritize(self, source_name: str, identifiers: list) -> list:
+        """Orders boards for the run: deferred ones first (oldest deferral first), then the busiest."""
+        def priority(indexed):
+            index, identifier = indexed
+            row = self._schedules.get((source_name, board_checkpoint_key(identifier))) or {}
+            return (not row.get("deferred_at"), row.get("deferred_at") or "", row.get("backoff_level", 0), index)
+        return [identifier for _, identifier in sorted(enumerate(identifiers), key=priority)]
+
+    def board_deferred(self, source_name: str, identifier):
+        set_board_deferred(source_name, board_checkpoint_key(identifier))
+
+    def board_polled(self, source_name: str, identifier, seen: int, added: int):
+        """Records a completed poll and schedules the board's next one."""
+        board_key = board_checkpoint_key(identifier)
+        row = self._schedules.get((source_name, board_key))
+        if row is None or row.get("last_polled_at") is None:
+            level = self._seed_level(source_name, board_key)
+        else:
+            level = next_backoff_level(row["backoff_level"], added > 0, self.top_level)
+        polled_at = datetime.now(timezone.utc)
+        next_due_at = polled_at + timedelta(hours=backoff_interval_hours(level, self.base_hours, self.max_hours))
+        save_board_poll(source_name, board_key, level, next_due_at.isoformat(), polled_at.isoformat(), added > 0)
+
+def print_poll_schedule(source_name: str | None = None):
+    """Prints every scheduled board with its interval, next due time and observed change rate."""
+    rows = sorted(get_board_schedules(source_name).values(), key=lambda row: (row["source_name"], row["board_key"]))
+    if not rows:
+        print("📅 No boards have been polled yet.")
+        return
+    print(f"{'Source':<14} {'Board':<32} {'Interval':>9} {'Next due (UTC)':<17} {'Changed':>9}")
+    for row in rows:
+        if row["pinned_interval_hours"] is not None:
+            interval = f"{row['pinned_interval_hours']:g}h 📌"
+        else:
+            interval = f"{backoff_interval_hours(row['backoff_level']):g}h"
+        next_due = next_due_time(row)
+        next_due = next_due.strftime("%Y-%m-%d %H:%M") if next_due else "next run"
+        print(f"{row['source_name']:<14} {row['board_key'][:32]:<32} {interval:>9} {next_due:<17} {row['changes']:>4}/{row['polls']:<4}")
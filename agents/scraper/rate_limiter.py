@@ -0,0 +1,143 @@
+# agents/scraper/rate_limiter.py
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Sustained requests per second and burst size per platform, keyed like host_key().
+# Unlisted hosts use the defaults below. Override any entry with SCRAPER_RATE_LIMITS,
+# e.g. "lever.co=0.5:2,recruitee.com=1:3".
+PLATFORM_RATE_LIMITS = {
+    "greenhouse.io": (5.0, 10),
+    "lever.co": (1.0, 3),
+    "recruitee.com": (1.0, 3),
+    "personio.de": (2.0, 5),
+    "join.com": (2.0, 5),
+    "workable.com": (2.0, 4),
+    "adzuna.com": (1.0, 2),
+    "rapidapi.com": (1.0, 2),
+}
+SCRAPER_DEFAULT_RATE = float(os.getenv("SCRAPER_DEFAULT_RATE", 2.0))
+SCRAPER_DEFAULT_BURST = int(os.getenv("SCRAPER_DEFAULT_BURST", 5))
+# Retry-After handling for 429 responses: fallback when the header is missing, and a cap
+# so a hostile or buggy value cannot stall a run.
+SCRAPER_DEFAULT_RETRY_AFTER = float(os.getenv("SCRAPER_DEFAULT_RETRY_AFTER", 10))
+SCRAPER_MAX_RETRY_AFTER = float(os.getenv("SCRAPER_MAX_RETRY_AFTER", 120))
+SCRAPER_MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", 2))
+
+def host_key(url: str) -> str:
+    """
+    Returns the key limits are tracked under: the site's base domain, so that per-company
+    subdomains of one ATS (e.g. acme.recruitee.com, foo.recruitee.com) share one budget.
+    """
+    hostname = (urlparse(url).hostname or "").lower()
+    labels = hostname.split(".")
+    return ".".join(labels[-2:]) if len(labels) > 2 else hostname
+
+def parse_rate_limits(spec: str | None) -> dict[str, tuple[float, int]]:
+    """Parses 'host=rate:burst,...' into {host: (rate, burst)}; malformed entries are skipped."""
+    limits = {}
+    for entry in (spec or "").split(","):
+        host, _, value = entry.strip().partition("=")
+        rate, _, burst = value.partition(":")
+        try:
+            limits[host.strip().lower()] = (float(rate), int(burst or 1))
+        except ValueError:
+            if entry.strip():
+                print(f"⚠️ Ignoring malformed rate limit '{entry.strip()}'.")
+    return limits
+
+def parse_retry_after(value: str | None, default: float = SCRAPER_DEFAULT_RETRY_AFTER) -> float:
+    """Converts a Retry-After header (delta-seconds or HTTP-date) into seconds to wait."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens, refilled at `rate` per second.
+    `reserve()` takes a token immediately and returns how long the caller must wait
+    before using it, so the same bucket serves threads and asyncio tasks alike.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            # `updated` lies in the future while the host is blocked by a Retry-After.
+            return (self.updated - now) + max(0.0, -self.tokens) / self.rate
+
+    def block_for(self, seconds: float):
+        """Lets no request through for `seconds`, then resumes with a single token."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self.updated:
+                self.updated = until
+                self.tokens = 1.0
+
+class RateLimiter:
+    """Per-host token buckets: each host stays within its budget while unrelated hosts proceed in parallel."""
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None,
+                 default_rate: float = SCRAPER_DEFAULT_RATE, default_burst: int = SCRAPER_DEFAULT_BURST):
+        self.limits = dict(PLATFORM_RATE_LIMITS if limits is None else limits)
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        key = host_key(url)
+        with self._lock:
+            if key not in self._buckets:
+                rate, burst = self.limits.get(key, (self.default_rate, self.default_burst))
+                self._buckets[key] = TokenBucket(rate, burst)
+            return self._buckets[key]
+
+    def reserve(self, url: str) -> float:
+        """Takes a token for the host of `url`; returns the seconds to wait before sending."""
+        return self._bucket(url).reserve()
+
+    def wait(self, url: str):
+        """Blocks the calling thread until a request to `url` is allowed."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        """Suspends the calling task (not the event loop) until a request to `url` is allowed."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def retry_after(self, url: str, header_value: str | None) -> float:
+        """Blocks the host of `url` as a 429's Retry-After asks (capped). Returns the delay applied."""
+        delay = min(parse_retry_after(header_value), SCRAPER_MAX_RETRY_AFTER)
+        self._bucket(url).block_for(delay)
+        return delay
+
+rate_limiter = RateLimiter({**PLATFORM_RATE_LIMITS, **parse_rate_limits(os.getenv("SCRAPER_RATE_LIMITS"))})
@@ -0,0 +1,236 @@
+# agents/scraper/response_archive.py
+
+import gzip
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Where raw responses are kept: objects/ holds gzip blobs named by the SHA-256 of their
+# content (identical bodies are stored once), runs/<run-id>/ the request log of each run.
+SCRAPER_ARCHIVE_DIR = os.getenv("SCRAPER_ARCHIVE_DIR", os.path.join(PROJECT_ROOT, "archive"))
+# Archive every scrape run without passing --archive.
+SCRAPER_ARCHIVE = os.getenv("SCRAPER_ARCHIVE", "").lower() in ("1", "true", "yes")
+# Query parameters that carry credentials; they are left out of archive keys.
+SECRET_PARAMS = {"app_id", "app_key", "api_key", "apikey", "key", "token", "access_token"}
+
+def request_cache_key(url: str, params: dict | None = None) -> str:
+    """The key a request is stored under (validators, archive): the URL with its sorted query."""
+    query = urlencode(sorted((key, value) for key, value in (params or {}).items() if value is not None))
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+def archive_key(url: str, params: dict | None = None) -> str:
+    """request_cache_key without credential parameters, so keys are safe to write and stable across key rotation."""
+    return request_cache_key(url, {key: value for key, value in (params or {}).items() if key.lower() not in SECRET_PARAMS})
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "-" + secrets.token_hex(2)
+
+# Response headers kept in the run log, by manifest field.
+HEADER_FIELDS = {"Content-Type": "content_type", "ETag": "etag", "Last-Modified": "last_modified"}
+
+class ArchiveMiss(requests.exceptions.RequestException):
+    """Raised in replay mode for a request the archived run never made; reported like a failed request."""
+
+class ArchivedResponse:
+    """One archived response: status, the headers the scrapers look at, and the body blob."""
+    def __init__(self, archive: "ResponseArchive", entry: dict):
+        self.status = entry["status"]
+        self.headers = {name: entry[field] for name, field in HEADER_FIELDS.items() if entry.get(field)}
+        self.sha256 = entry["sha256"]
+        self._archive = archive
+
+    def body(self) -> bytes:
+        with gzip.open(self._archive.object_path(self.sha256), "rb") as f:
+            return f.read()
+
+    def stream(self):
+        """A binary file-like object over the body, for consumers that parse incrementally."""
+        return gzip.open(self._archive.object_path(self.sha256), "rb")
+
+class ResponseArchive:
+    """
+    Compressed, content-addressed store of raw scraper responses (JSON, XML, HTML).
+
+    While a run is recorded, the HTTP clients (and the WTTJ browser capture) hand every final
+    response to `record`. In replay mode `lookup` serves them back by request key and no
+    request leaves the machine, so normalization and upserts can be re-run offline.
+    """
+    def __init__(self, root: str = SCRAPER_ARCHIVE_DIR):
+        self.root = root
+        self.mode = None
+        self.run_id = None
+        self._index = {}
+        self._lock = threading.Lock()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.gz")
+
+    def run_dir(self, run_id: str) -> str:
+        return os.path.join(self.root, "runs", run_id)
+
+    # --- Sessions ---
+
+    @contextmanager
+    def session(self, mode: str, run_id: str | None = None, sources: dict | None = None):
+        """Records into a new run (mode "record") or serves run `run_id` back (mode "replay") for the block."""
+        if mode == "record":
+            run_id = run_id or new_run_id()
+            os.makedirs(self.run_dir(run_id), exist_ok=True)
+            with open(os.path.join(self.run_dir(run_id), "run.json"), "w", encoding="utf-8") as f:
+                json.dump({"run_id": run_id, "started_at": datetime.now(timezone.utc).isoformat(), "sources": sources or {}}, f, indent=2)
+            self._index = {}
+        elif mode == "replay":
+            self._index = self._load_index(run_id)
+        else:
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.mode, self.run_id = mode, run_id
+        try:
+            yield run_id
+        finally:
+            self.mode, self.run_id, self._index = None, None, {}
+
+    def run_sources(self, run_id: str) -> dict:
+        """The source configuration a run was recorded with."""
+        path = os.path.join(self.run_dir(run_id), "run.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No archived run {run_id} in {self.root}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("sources", {})
+
+    def _load_index(self, run_id: str) -> dict:
+        index = {}
+        path = os.path.join(self.run_dir(run_id), "responses.jsonl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No archived responses for run {run_id} in {self.root}")
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                # A key requested twice (e.g. a retried board) replays its last response.
+                index[entry["key"]] = entry
+        return index
+
+    # --- Recording ---
+
+    def _store_blob(self, temp_path: str, sha256: str):
+        final_path = self.object_path(sha256)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+            return
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_path, final_path)
+
+    def _log(self, key: str, status: int, headers, sha256: str, size: int):
+        entry = {"key": key, "status": status, "sha256": sha256, "size": size}
+        for name, field in HEADER_FIELDS.items():
+            if headers and headers.get(name):
+                entry[field] = headers.get(name)
+        with self._lock:
+            if not self.recording:
+                return
+            with open(os.path.join(self.run_dir(self.run_id), "responses.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def _temp_blob(self):
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.join(self.root, "objects"), suffix=".tmp")
+        os.close(fd)
+        return temp_path, gzip.open(temp_path, "wb")
+
+    def record(self, key: str, status: int, headers, body: bytes):
+        """Stores one fully read response of the current run."""
+        if not self.recording:
+            return
+        sha256 = hashlib.sha256(body).hexdigest()
+        if not os.path.exists(self.object_path(sha256)):
+            temp_path, blob = self._temp_blob()
+            with blob:
+                blob.write(body)
+            self._store_blob(temp_path, sha256)
+        self._log(key, status, headers, sha256, len(body))
+
+    def tee(self, raw, key: str, status: int, headers) -> "ArchivingReader":
+        """Wraps a streamed body so it is archived as the consumer reads it to the end."""
+        temp_path, blob = self._temp_blob()
+        return ArchivingReader(self, raw, key, status, headers, temp_path, blob)
+
+    # --- Replay ---
+
+    def lookup(self, key: str) -> ArchivedResponse:
+        entry = self._index.get(key)
+        if entry is None:
+            raise ArchiveMiss(f"Run {self.run_id} has no archived response for {key}")
+        return ArchivedResponse(self, entry)
+
+class ArchivingReader:
+    """File-like tee over a streamed (decoded) response body that archives it once fully read."""
+    def __init__(self, archive: ResponseArchive, raw, key: str, status: int, headers, temp_path: str, blob):
+        self._archive, self._raw = archive, raw
+        self._key, self._status, self._headers = key, status, headers
+        self._temp_path, self._blob = temp_path, blob
+        self._sha256 = hashlib.sha256()
+        self._size = 0
+        self.decode_content = True
+
+    def read(self, amt: int | None = None) -> bytes:
+        data = self._raw.read(amt, decode_content=True)
+        if self._blob is None:
+            return data
+        if data:
+            self._sha256.update(data)
+            self._size += len(data)
+            self._blob.write(data)
+        if not data or amt is None:
+            self._finish()
+        return data
+
+    def _finish(self):
+        blob, self._blob = self._blob, None
+        blob.close()
+        self._archive._store_blob(self._temp_path, self._sha256.hexdigest())
+        self._archive._log(self._key, self._status, self._headers, self._sha256.hexdigest(), self._size)
+
+    def close(self):
+        if self._blob is not None:
+            # Not read to the end: the partial body is not worth keeping.
+            self._blob.close()
+            self._blob = None
+            os.remove(self._temp_path)
+        self._raw.close()
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+def replayed_requests_response(url: str, archived: ArchivedResponse, stream: bool = False) -> requests.Response:
+    """Builds the requests.Response http_get would have returned for an archived response."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = archived.status
+    response.headers = CaseInsensitiveDict(archived.headers)
+    if stream:
+        response.raw = archived.stream()
+    else:
+        response._content = archived.body()
+    return response
+
+# The archive of this process; ScraperAgent opens a session around archived or replayed runs.
+response_archive = ResponseArchive()
@@ -1,39 +1,95 @@
 # agents/scraper/scraper_agent.py
 
+import importlib
 import os
+from dataclasses import dataclass, field
+from functools import partial
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from datetime import datetime
+from itertools import chain, zip_longest
 
-# --- Import all available scrapers ---
-from agents.scraper.sources.recruitee_scraper import RecruiteeScraper
-from agents.scraper.sources.lever_scraper import LeverScraper
-from agents.scraper.sources.greenhouse_scraper import GreenhouseScraper
-from agents.scraper.sources.adzuna_scraper import AdzunaScraper
-from agents.scraper.sources.wttj_scraper import WelcomeToTheJungleScraper
-from agents.scraper.sources.jsearch_scraper import JsearchScraper
-from agents.scraper.sources.personio_scraper import PersonioScraper
-from agents.scraper.sources.workable_scraper import WorkableScraper
-from agents.scraper.sources.join_scraper import JoinScraper # <-- ADD THIS IMPORT
-# Add new scrapers here as you build them
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.cleaning_pool import get_cleaning_pool
+from agents.scraper.response_archive import SCRAPER_ARCHIVE, response_archive
+from agents.scraper.checkpoints import ScrapeCheckpoints
+from agents.scraper.poll_schedule import PollSchedule
+from agents.scraper.circuit_breaker import CircuitBreaker, open_circuit_lines
+from agents.scraper.deadline import SCRAPER_DEADLINE_GRACE_SECONDS, RunDeadline
 
 # --- Bitty's Scraper Registry ---
+# Import paths ("module:Class") resolved only when a source actually runs, so importing this
+# module (e.g. from the API process) never loads Playwright, newspaper3k or BeautifulSoup.
+# Add new scrapers here as you build them.
 SCRAPER_REGISTRY = {
-    "Recruitee": RecruiteeScraper,
-    "Lever": LeverScraper,
-    "Greenhouse": GreenhouseScraper,
-    "Adzuna": AdzunaScraper,
-    "WelcomeToTheJungle": WelcomeToTheJungleScraper, # <-- ADD THIS LINE
-    "JSearch": JsearchScraper, # Add when ready
-    "Workable": WorkableScraper, # Add this
-    "Personio": PersonioScraper, # Add when ready
-    "JOIN.com": JoinScraper, # <-- ADD THIS LINE
+    "Recruitee": "agents.scraper.sources.recruitee_scraper:RecruiteeScraper",
+    "Lever": "agents.scraper.sources.lever_scraper:LeverScraper",
+    "Greenhouse": "agents.scraper.sources.greenhouse_scraper:GreenhouseScraper",
+    "Adzuna": "agents.scraper.sources.adzuna_scraper:AdzunaScraper",
+    "WelcomeToTheJungle": "agents.scraper.sources.wttj_scraper:WelcomeToTheJungleScraper",
+    "JSearch": "agents.scraper.sources.jsearch_scraper:JsearchScraper",
+    "Workable": "agents.scraper.sources.workable_scraper:WorkableScraper",
+    "Personio": "agents.scraper.sources.personio_scraper:PersonioScraper",
+    "JOIN.com": "agents.scraper.sources.join_scraper:JoinScraper",
 }
 
+_scraper_classes = {}
+
+def get_scraper_class(source_name: str) -> type:
+    """Imports (once) and returns the scraper class registered for a source."""
+    if source_name not in _scraper_classes:
+        module_path, class_name = SCRAPER_REGISTRY[source_name].split(":")
+        _scraper_classes[source_name] = getattr(importlib.import_module(module_path), class_name)
+    return _scraper_classes[source_name]
+
+def _interleave(units_by_source: list[list]) -> list:
+    """Round-robins the units of several sources into one list."""
+    return [unit for unit in chain.from_iterable(zip_longest(*units_by_source)) if unit is not None]
+
+@dataclass
+class RunTracking:
+    """Per-board bookkeeping of a live run: checkpoints, polling schedule, circuit breaker and deadline."""
+    checkpoints: ScrapeCheckpoints
+    schedule: PollSchedule
+    breaker: CircuitBreaker
+    deadline: RunDeadline
+    deferred: list = field(default_factory=list)
+
+    def select(self, source_name: str, ScraperClass: type, identifiers: list) -> list:
+        """The boards of a source this run scrapes, in priority order: not yet completed, circuit not open, and due."""
+        identifiers = self.checkpoints.pending(source_name, identifiers)
+        identifiers = self.breaker.allowed(source_name, identifiers)
+        identifiers = self.schedule.due(source_name, identifiers, getattr(ScraperClass, "platform_source", None))
+        return self.schedule.prioritize(source_name, identifiers)
+
+    def budget(self, source_name: str):
+        return self.deadline.source_budget(source_name, on_deferred=partial(self.board_deferred, source_name))
+
+    def attach(self, scraper_instance, source_name: str):
+        scraper_instance.on_board_done = partial(self.board_done, source_name)
+        scraper_instance.on_board_failed = partial(self.breaker.board_failed, source_name)
+        scraper_instance.budget = self.budget(source_name)
+
+    def board_deferred(self, source_name: str, identifier):
+        self.deferred.append((source_name, identifier))
+        self.schedule.board_deferred(source_name, identifier)
+
+    def board_done(self, source_name: str, identifier, seen: int, added: int):
+        self.checkpoints.board_done(source_name, identifier, seen, added)
+        self.schedule.board_polled(source_name, identifier, seen, added)
+        self.breaker.board_succeeded(source_name, identifier)
+
+# How many scrape units (a board/query, or a whole source that runs its boards concurrently itself) run at once.
+# Set to 1 for the old strictly sequential behaviour. Per-host politeness is enforced
+# separately by agents.scraper.http_client (SCRAPER_PER_HOST_LIMIT).
+SCRAPER_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", 4))
+
 class ScraperAgent:
-    def __init__(self, config_path="config/job_sources.yml"):
+    def __init__(self, config_path="config/job_sources.yml", max_workers: int | None = None):
         self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         self.config_path = os.path.join(self.project_root, config_path)
         self.sources = self._load_sources()
+        self.max_workers = max(1, max_workers or SCRAPER_MAX_WORKERS)
 
     def _load_sources(self):
         # ... (this function remains the same)
@@ -48,37 +104,177 @@ class ScraperAgent:
             print(f"❌ Error parsing YAML file: {e}")
             return {}
 
-    def run_scrapers(self, target_source=None):
-        if not self.sources:
+    def run_scrapers(self, target_source=None, archive: bool | None = None, replay_run_id: str | None = None,
+                     resume: bool = False, all_boards: bool = False, deadline_minutes: float | None = None):
+        """
+        Runs all (or one) configured sources as a checkpointed run: every completely stored board
+        is recorded, and with `resume` the latest interrupted run of the same target continues
+        where it stopped. Only boards due on the adaptive polling schedule are scraped, unless
+        `all_boards` is set. The run stops at `deadline_minutes` (default: SCRAPER_DEADLINE_MINUTES,
+        0 for none); boards it did not finish are deferred to the front of the next run. With `archive` (default: SCRAPER_ARCHIVE) every raw response is kept in
+        the response archive under the run id; `replay_run_id` re-runs the normalization and
+        upserts of such a run from the archive, with the sources it recorded.
+        """
+        sources = self.sources
+        if replay_run_id:
+            try:
+                sources = response_archive.run_sources(replay_run_id)
+            except FileNotFoundError as e:
+                print(f"❌ {e}")
+                return
+        if not sources:
             print("🚫 No sources configured to scrape. Exiting.")
             return
 
-        print(f"\n--- 🚀 Starting Scraper Agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
-        total_seen, total_added = 0, 0
-
         # Determine which sources to run based on the target_source argument
-        sources_to_run = self.sources
+        sources_to_run = sources
         if target_source:
-            if target_source in self.sources:
-                sources_to_run = {target_source: self.sources[target_source]}
+            if target_source in sources:
+                sources_to_run = {target_source: sources[target_source]}
             else:
-                print(f"⚠️ Source '{target_source}' not found in configuration. Available: {list(self.sources.keys())}")
+                print(f"⚠️ Source '{target_source}' not found in configuration. Available: {list(sources.keys())}")
                 return
 
+        if replay_run_id:
+            with response_archive.session("replay", replay_run_id):
+                print(f"⏪ Replaying archived run {replay_run_id}; no requests leave the machine.")
+                self._run_sources(sources_to_run, replay=True)
+            return
+
+        checkpoints = ScrapeCheckpoints.start(target_source, resume=resume)
+        tracking = RunTracking(
+            checkpoints=checkpoints,
+            schedule=PollSchedule(enabled=False) if all_boards else PollSchedule(),
+            breaker=CircuitBreaker(),
+            deadline=RunDeadline() if deadline_minutes is None else RunDeadline(minutes=deadline_minutes),
+        )
+        print(f"🧾 Scrape run {checkpoints.run_id}")
+        if SCRAPER_ARCHIVE if archive is None else archive:
+            with response_archive.session("record", run_id=checkpoints.run_id, sources=sources_to_run) as run_id:
+                print(f"🗄️ Archiving raw responses as run {run_id}")
+                self._run_sources(sources_to_run, tracking=tracking)
+                print(f"🗄️ Replay this run with: python logic.py scrape --replay {run_id}")
+        else:
+            self._run_sources(sources_to_run, tracking=tracking)
+        # Only reached when the run was not interrupted; otherwise it stays resumable.
+        checkpoints.finish()
+
+    def _run_sources(self, sources_to_run: dict, replay: bool = False, tracking: RunTracking | None = None):
+        print(f"\n--- 🚀 Starting Scraper Agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---")
+        total_seen, total_added = 0, 0
+
+        # Split every source into independent units: one per board/query, unless the scraper
+        # runs all of its entries concurrently itself (the async API scrapers).
+        units_by_source = []
         for source_name, identifiers in sources_to_run.items():
             if source_name not in SCRAPER_REGISTRY:
                 print(f"\n--- ⏩ Skipping '{source_name}': Scraper not found in registry. ---")
                 continue
-
-            print(f"\n--- ▶️  Running Scraper: {source_name} ---")
-            ScraperClass = SCRAPER_REGISTRY[source_name]
-            
             try:
-                scraper_instance = ScraperClass(identifiers)
-                seen, added = scraper_instance.fetch_jobs()
-                total_seen += seen
-                total_added += added
-            except Exception as e:
-                print(f"❌ An unexpected CRITICAL error occurred while running the {source_name} scraper: {e}")
-        
+                ScraperClass = get_scraper_class(source_name)
+            except ImportError as e:
+                print(f"\n--- ⏩ Skipping '{source_name}': its scraper could not be imported ({e}). ---")
+                continue
+            identifiers = identifiers or []
+            if tracking is not None:
+                identifiers = tracking.select(source_name, ScraperClass, identifiers)
+                if not identifiers:
+                    continue
+            if getattr(ScraperClass, "per_board_units", True):
+                units_by_source.append([(source_name, [identifier]) for identifier in identifiers])
+            else:
+                units_by_source.append([(source_name, identifiers)])
+        # Interleave sources so workers are not all queued behind one host's limit. Units holding
+        # boards an earlier run's deadline cut off go first.
+        if tracking is not None:
+            deferred = [[unit for unit in units if any(tracking.schedule.is_deferred(unit[0], board) for board in unit[1])]
+                        for units in units_by_source]
+            rest = [[unit for unit in units if unit not in first] for units, first in zip(units_by_source, deferred)]
+            units = _interleave(deferred) + _interleave(rest)
+        else:
+            units = _interleave(units_by_source)
+
+        # Preload what each platform already has so unchanged postings short-circuit.
+        # The snapshots are read-only, so all units of a source share one.
+        # A replay starts from an empty snapshot so every posting is normalized and upserted again.
+        known_jobs_by_source = {}
+        for source_name in dict.fromkeys(name for name, _ in units):
+            if replay:
+                known_jobs_by_source[source_name] = KnownJobs(source_name, [])
+                continue
+            known_jobs_by_source[source_name] = KnownJobs.load(source_name)
+            print(f"🗂️ {len(known_jobs_by_source[source_name])} known {source_name} jobs loaded.")
+
+        print(f"\n--- ▶️  Running {len(units)} scrape units with up to {self.max_workers} workers ---")
+        cleaning_at_start = get_cleaning_pool().snapshot()
+        totals_by_source = {source_name: [0, 0] for source_name in known_jobs_by_source}
+
+        # Every scraper writes through the process-wide writer connection (utils.db_utils),
+        # which stays open for the whole run and serializes concurrent batches.
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper")
+        futures = {
+            executor.submit(self._run_unit, source_name, identifiers, known_jobs_by_source[source_name], tracking): (source_name, identifiers)
+            for source_name, identifiers in units
+        }
+        # Units wind down on their own at the deadline; one stuck past the grace period is left behind.
+        remaining = tracking.deadline.remaining() if tracking is not None else None
+        wait_timeout = None if remaining is None else max(0.0, remaining) + SCRAPER_DEADLINE_GRACE_SECONDS
+        stuck = []
+        try:
+            for future in as_completed(futures, timeout=wait_timeout):
+                source_name, _ = futures[future]
+                try:
+                    seen, added = future.result()
+                    totals_by_source[source_name][0] += seen
+                    totals_by_source[source_name][1] += added
+                except Exception as e:
+                    print(f"❌ An unexpected CRITICAL error occurred while running the {source_name} scraper: {e}")
+        except FuturesTimeoutError:
+            stuck = [future for future in futures if not future.done()]
+            print(f"⏱️ Scrape deadline passed; not waiting any longer for {len(stuck)} units.")
+            for future in stuck:
+                source_name, identifiers = futures[future]
+                reason = "not started before the deadline" if future.cancel() else "still running at the deadline"
+                budget = tracking.budget(source_name)
+                # A unit running a whole source may have stored some of its boards already.
+                for identifier in tracking.checkpoints.unfinished(source_name, identifiers):
+                    budget.defer(identifier, reason)
+        finally:
+            executor.shutdown(wait=not stuck, cancel_futures=True)
+
+        print("\n--- 📊 Per-Source Totals ---")
+        for source_name, (seen, added) in totals_by_source.items():
+            print(f"  {source_name}: Seen {seen}, Added {added}")
+            total_seen += seen
+            total_added += added
+
+        cleaning_report = get_cleaning_pool().report(since=cleaning_at_start)
+        if cleaning_report:
+            print("\n--- 🧹 Description Cleaning Throughput ---")
+            for line in cleaning_report:
+                print(f"  {line}")
+
+        if tracking is not None and tracking.deferred:
+            print(f"\n--- ⏱️ {len(tracking.deferred)} boards deferred by the scrape deadline; the next run starts with them. ---")
+
+        circuit_report = open_circuit_lines() if tracking is not None else []
+        if circuit_report:
+            print("\n--- 🔌 Boards With Open Circuits ---")
+            for line in circuit_report:
+                print(f"  {line}")
+
         print(f"\n--- ✅ Scraper Agent Finished. Total Seen: {total_seen}, Total Added: {total_added} ---")
+
+    def _run_unit(self, source_name: str, identifiers: list, known_jobs: KnownJobs,
+                  tracking: RunTracking | None = None) -> tuple[int, int]:
+        """Runs one scraper instance over a subset of a source's configured entries."""
+        if tracking is not None and tracking.deadline.expired():
+            budget = tracking.budget(source_name)
+            for identifier in identifiers:
+                budget.defer(identifier, "not started before the deadline")
+            return 0, 0
+        ScraperClass = get_scraper_class(source_name)
+        scraper_instance = ScraperClass(identifiers, known_jobs=known_jobs)
+        if tracking is not None:
+            tracking.attach(scraper_instance, source_name)
+        return scraper_instance.fetch_jobs()
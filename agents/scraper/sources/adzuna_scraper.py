@@ -1,21 +1,26 @@
 # agents/scraper/sources/adzuna_scraper.py
 
-import requests
 import os, sys
 
 # DB import setup
 try:
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord, SCRAPER_MAX_PAGES
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord, SCRAPER_MAX_PAGES
 
-class AdzunaScraper:
-    def __init__(self, search_configs: list[dict]):
-        self.search_configs = search_configs
-        self.platform_source = "Adzuna"
+class AdzunaScraper(AsyncApiScraper):
+    platform_source = "Adzuna"
+    # Search queries carry the API keys in the URL, which must not be stored in the validator cache.
+    conditional_requests = False
+    max_pages = SCRAPER_MAX_PAGES
+    page_size = 50  # Adzuna's maximum results_per_page
+
+    def __init__(self, search_configs: list[dict], known_jobs=None):
+        super().__init__(search_configs, known_jobs=known_jobs)
+        self.search_configs = self.identifiers
         # --- THIS IS THE CORRECTED LINE ---
         self.base_url = "https://api.adzuna.com/v1/api/jobs"
         # --- END CORRECTION ---
@@ -23,58 +28,45 @@ class AdzunaScraper:
         self.app_key = os.getenv("ADZUNA_APP_KEY")
         self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 20))
 
-    def fetch_jobs(self) -> tuple[int, int]:
+    def is_configured(self) -> bool:
         if not self.app_id or not self.app_key:
             print("❌ Adzuna App ID or Key not found in .env file. Skipping.")
-            return 0, 0
-
-        print(f"🔎 Starting AdzunaScraper for {len(self.search_configs)} search configurations...")
-        seen_count, added_count = 0, 0
+            return False
+        return True
 
-        for config in self.search_configs:
-            country_code = config.get("country_code", "gb")
-            api_url = f"{self.base_url}/{country_code}/search/1" # Page 1
-            
-            params = {
-                'app_id': self.app_id,
-                'app_key': self.app_key,
-                'what': config.get('what'),
-                'where': config.get('where'),
-                'results_per_page': 50,
-                'content-type': 'application/json'
-            }
-            
-            query_str = f"'{config.get('what')}' in '{config.get('where')}'"
-            try:
-                response = requests.get(api_url, params=params, timeout=self.request_timeout_api)
-                response.raise_for_status()
-                
-                offers = response.json().get("results", [])
-                print(f"📥 {len(offers)} offers found for query: {query_str}")
+    def board_label(self, config) -> str:
+        return f"query: '{config.get('what')}' in '{config.get('where')}'"
 
-                for offer in offers:
-                    job_data = {
-                        "job_url": offer.get("redirect_url"),
-                        "platform_job_id": offer.get("id"),
-                        "platform_source": self.platform_source,
-                        "company_name": offer.get("company", {}).get("display_name"),
-                        "title": offer.get("title"),
-                        "location": offer.get("location", {}).get("display_name"),
-                        "department": offer.get("category", {}).get("label"),
-                        "date_posted_on_platform": offer.get("created"),
-                        "api_provided_description": offer.get("description"),
-                        "full_description_text": offer.get("description"),
-                    }
+    def build_request(self, config):
+        return self.build_page_request(config, 1)
 
-                    status, _ = add_or_update_job(job_data)
-                    if status == "inserted":
-                        added_count += 1
-                    seen_count += 1
+    def build_page_request(self, config, page):
+        country_code = config.get("country_code", "gb")
+        api_url = f"{self.base_url}/{country_code}/search/{page}"
+        params = {
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'what': config.get('what'),
+            'where': config.get('where'),
+            'results_per_page': self.page_size,
+            'sort_by': 'date',  # Newest first, so paging can stop at the first page of known jobs
+            'content-type': 'application/json'
+        }
+        return api_url, params, None
 
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️ HTTP error for query {query_str}: {e}")
-            except Exception as e:
-                print(f"❌ Unexpected error for query {query_str}: {type(e).__name__} - {e}")
+    def extract_offers(self, payload, config):
+        return payload.get("results", [])
 
-        print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
-        return seen_count, added_count
+    def adapt(self, offer, config):
+        return JobRecord(
+            job_url=offer.get("redirect_url"),
+            title=offer.get("title"),
+            platform_source=self.platform_source,
+            platform_job_id=offer.get("id"),
+            company_name=(offer.get("company") or {}).get("display_name"),
+            location=(offer.get("location") or {}).get("display_name"),
+            department=(offer.get("category") or {}).get("label"),
+            date_posted_on_platform=offer.get("created"),
+            api_provided_description=offer.get("description"),
+            full_description_text=offer.get("description"),
+        )
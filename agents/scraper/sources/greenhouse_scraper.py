@@ -1,35 +1,46 @@
 # agents/scraper/sources/greenhouse_scraper.py
 
-import requests
-from bs4 import BeautifulSoup
+import html
 import os, sys
 
 # DB import setup (consistent with other scrapers)
 try:
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord
+    from agents.scraper.async_http import HTTP_ERRORS
+    from utils.html_text import html_to_text
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord
+    from agents.scraper.async_http import HTTP_ERRORS
+    from utils.html_text import html_to_text
 
-class GreenhouseScraper:
-    def __init__(self, company_identifiers: list[str]):
+class GreenhouseScraper(AsyncApiScraper):
+    """
+    Two-phase Greenhouse fetch: the light job list (ids, titles, updated_at) first, then the
+    content of only those postings that are new or whose updated_at changed.
+    """
+    platform_source = "Greenhouse"
+    # Bounds the per-job content requests of one board.
+    enrich_concurrency = int(os.getenv("GREENHOUSE_CONTENT_CONCURRENCY", 5))
+
+    def __init__(self, company_identifiers: list[str], known_jobs=None):
         """
         Initializes the GreenhouseScraper.
         Args:
             company_identifiers (list[str]): A list of Greenhouse board tokens (company names).
         """
-        self.company_identifiers = company_identifiers
-        self.platform_source = "Greenhouse"
-        self.user_agent = os.getenv("SCRAPER_USER_AGENT", "BittyScout/1.0")
-        self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 10))
+        super().__init__(company_identifiers, known_jobs=known_jobs)
+        self.company_identifiers = self.identifiers
+        self.api_base_url = "https://api.greenhouse.io/v1/boards"
 
     def _clean_html_description(self, html_content: str) -> str:
-        """Uses BeautifulSoup to convert HTML description to clean text."""
+        """Converts the HTML description to clean text."""
         if not html_content:
             return ""
-        return BeautifulSoup(html_content, 'html.parser').get_text(separator=' ', strip=True)
+        # The job board API returns the content HTML-escaped (&lt;p&gt;...).
+        return html_to_text(html.unescape(html_content))
 
     def _get_department(self, departments_list: list) -> str | None:
         """Safely extracts the first department name from the list of department objects."""
@@ -37,50 +48,37 @@ class GreenhouseScraper:
             return departments_list[0].get('name')
         return None
 
-    def fetch_jobs(self) -> tuple[int, int]:
-        print(f"🔎 Starting GreenhouseScraper for {len(self.company_identifiers)} companies...")
-        seen_count, added_count = 0, 0
-
-        for board_token in self.company_identifiers:
-            api_url = f"https://api.greenhouse.io/v1/boards/{board_token}/jobs?content=true"
-            try:
-                response = requests.get(api_url, timeout=self.request_timeout_api, headers={'User-Agent': self.user_agent})
-                response.raise_for_status()
-                
-                offers = response.json().get("jobs", [])
-                print(f"📥 {len(offers)} offers found for {board_token}.")
-
-                for offer in offers:
-                    title = offer.get("title")
-                    job_url = offer.get("absolute_url")
-                    if not title or not job_url:
-                        continue
-                    
-                    description_text = self._clean_html_description(offer.get("content"))
-
-                    job_data = {
-                        "job_url": job_url,
-                        "platform_job_id": str(offer.get("id")),
-                        "platform_source": self.platform_source,
-                        "company_name": board_token.replace("-", " ").title(),
-                        "title": title,
-                        "location": offer.get("location", {}).get("name"),
-                        "department": self._get_department(offer.get("departments")),
-                        "date_posted_on_platform": offer.get("updated_at"),
-                        # For Greenhouse, the API provides the full description.
-                        "api_provided_description": description_text,
-                        "full_description_text": description_text,
-                    }
+    def build_request(self, board_token):
+        return f"{self.api_base_url}/{board_token}/jobs", None, None
 
-                    status, _ = add_or_update_job(job_data)
-                    if status == "inserted":
-                        added_count += 1
-                    seen_count += 1
+    def extract_offers(self, payload, board_token):
+        return payload.get("jobs", [])
 
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️ HTTP error for {board_token}: {e}")
-            except Exception as e:
-                print(f"❌ Unexpected error for {board_token}: {type(e).__name__} - {e}")
+    def adapt(self, offer, board_token):
+        title = offer.get("title")
+        job_url = offer.get("absolute_url")
+        if not title or not job_url:
+            return None
+        return JobRecord(
+            job_url=job_url,
+            title=title,
+            platform_source=self.platform_source,
+            platform_job_id=str(offer.get("id")),
+            company_name=board_token.replace("-", " ").title(),
+            location=(offer.get("location") or {}).get("name"),
+            department=self._get_department(offer.get("departments")),
+            date_posted_on_platform=offer.get("updated_at"),
+        )
 
-        print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
-        return seen_count, added_count
+    async def enrich(self, client, record, offer, board_token):
+        # Only new or changed postings get here; fetch their content individually.
+        try:
+            detail = await client.get_json(f"{self.api_base_url}/{board_token}/jobs/{offer.get('id')}")
+        except HTTP_ERRORS as e:
+            print(f"⚠️ Could not fetch content of {record.job_url}: {type(e).__name__} - {e}")
+            return False
+        description_text = self._clean_html_description(detail.get("content"))
+        record.department = record.department or self._get_department(detail.get("departments"))
+        record.date_posted_on_platform = detail.get("updated_at") or record.date_posted_on_platform
+        record.api_provided_description = description_text
+        record.full_description_text = description_text
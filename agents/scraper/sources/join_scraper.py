@@ -1,20 +1,25 @@
 # agents/scraper/sources/join_scraper.py
 
-import requests
 import os, sys
 
 try:
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord, SCRAPER_MAX_PAGES
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
-
-class JoinScraper:
-    def __init__(self, search_configs: list[dict]):
-        self.search_configs = search_configs
-        self.platform_source = "JOIN.com"
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord, SCRAPER_MAX_PAGES
+
+class JoinScraper(AsyncApiScraper):
+    platform_source = "JOIN.com"
+    # A 304 on a later page would hide that page's offers without touching them.
+    conditional_requests = False
+    max_pages = SCRAPER_MAX_PAGES
+    page_size = 50
+
+    def __init__(self, search_configs: list[dict], known_jobs=None):
+        super().__init__(search_configs, known_jobs=known_jobs)
+        self.search_configs = self.identifiers
         self.api_url = "https://api.join.com/v1/job-search/public/search"
         self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 15))
         # --- ADDED: More browser-like headers to avoid 403 Forbidden ---
@@ -27,42 +32,25 @@ class JoinScraper:
         }
         # --- END OF HEADER BLOCK ---
 
-    def fetch_jobs(self) -> tuple[int, int]:
-        print(f"🔎 Starting JOIN.com Scraper for {len(self.search_configs)} searches...")
-        seen_count, added_count = 0, 0
-
-        for config in self.search_configs:
-            query = config.get('query', '')
-            country_code = config.get('country_code', '')
-            query_str = f"'{query}' in country '{country_code}'"
+    def board_label(self, config) -> str:
+        return f"query: '{config.get('query', '')}' in country '{config.get('country_code', '')}'"
 
-            params = {'keywords': query, 'country': country_code, 'page': 1, 'pageSize': 50}
-            
-            try:
-                # Use the new headers in the request
-                response = requests.get(self.api_url, params=params, headers=self.headers, timeout=self.request_timeout_api)
-                response.raise_for_status()
-                
-                offers = response.json()
-                print(f"📥 {len(offers)} offers found for query: {query_str}")
+    def build_request(self, config):
+        return self.build_page_request(config, 1)
 
-                for offer in offers:
-                    job_url = f"https://join.com/companies/{offer['company']['slug']}/{offer['id']}"
-                    job_data = {
-                        "job_url": job_url, "platform_job_id": str(offer.get("id")),
-                        "platform_source": self.platform_source, "company_name": offer.get("company", {}).get("name"),
-                        "title": offer.get("title"), "location": offer.get("location", {}).get("city"),
-                        "department": None, "date_posted_on_platform": offer.get("publishedAt"),
-                        "api_provided_description": offer.get("description"), "full_description_text": offer.get("description"),
-                    }
-                    status, _ = add_or_update_job(job_data)
-                    if status == "inserted": added_count += 1
-                    seen_count += 1
+    def build_page_request(self, config, page):
+        params = {'keywords': config.get('query', ''), 'country': config.get('country_code', ''), 'page': page, 'pageSize': self.page_size}
+        return self.api_url, params, self.headers
 
-            except requests.exceptions.RequestException as e:
-                print(f"⚠️ HTTP error for query {query_str}: {e}")
-            except Exception as e:
-                print(f"❌ Unexpected error for query {query_str}: {type(e).__name__} - {e}")
+    def extract_offers(self, payload, config):
+        return payload
 
-        print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
-        return seen_count, added_count
\ No newline at end of file
+    def adapt(self, offer, config):
+        job_url = f"https://join.com/companies/{offer['company']['slug']}/{offer['id']}"
+        return JobRecord(
+            job_url=job_url, platform_job_id=str(offer.get("id")),
+            platform_source=self.platform_source, company_name=offer.get("company", {}).get("name"),
+            title=offer.get("title"), location=(offer.get("location") or {}).get("city"),
+            department=None, date_posted_on_platform=offer.get("publishedAt"),
+            api_provided_description=offer.get("description"), full_description_text=offer.get("description"),
+        )
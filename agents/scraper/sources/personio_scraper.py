@@ -2,96 +2,154 @@
 
 import requests
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
 import os, sys
 
 # DB import setup (consistent with other scrapers)
 try:
-    from utils.db_utils import add_or_update_job
+    from utils.db_utils import save_scraped_jobs
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.http_client import http_get
+    from agents.scraper.cleaning_pool import get_cleaning_pool
+    from agents.scraper.response_archive import response_archive
+    from agents.scraper.deadline import BudgetExceeded
+    from agents.scraper.board_hooks import BoardHooks
+    from utils.html_text import html_to_text
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
+    from utils.db_utils import save_scraped_jobs
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.http_client import http_get
+    from agents.scraper.cleaning_pool import get_cleaning_pool
+    from agents.scraper.response_archive import response_archive
+    from agents.scraper.deadline import BudgetExceeded
+    from agents.scraper.board_hooks import BoardHooks
+    from utils.html_text import html_to_text
 
-class PersonioScraper:
-    def __init__(self, company_identifiers: list[str]):
+# Jobs are written every this many postings while the feed streams in.
+PERSONIO_WRITE_BATCH_SIZE = int(os.getenv("PERSONIO_WRITE_BATCH_SIZE", 200))
+
+def iter_feed_positions(stream):
+    """
+    Streams the <position> elements of a Personio XML feed from a binary file-like object.
+    Each completed position is yielded as a dict of its child texts (plus the raw HTML of its
+    first job description) and then cleared, so memory stays flat whatever the feed size.
+    """
+    root = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+        if event != "end" or element.tag != "position":
+            continue
+        position = {child.tag: child.text.strip() for child in element if child.text and child.text.strip()}
+        position["description_html"] = ""
+        for value_node in element.iterfind("jobDescriptions/jobDescription/value"):
+            if value_node.text:
+                position["description_html"] = value_node.text
+                break
+        yield position
+        # Drop the finished position (and any earlier siblings) from the partial tree.
+        root.clear()
+
+class PersonioScraper(BoardHooks):
+    def __init__(self, company_identifiers: list[str], known_jobs=None):
         self.company_identifiers = company_identifiers
         self.platform_source = "Personio"
+        self.known_jobs = known_jobs
         self.user_agent = os.getenv("SCRAPER_USER_AGENT", "BittyScout/1.0")
         self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 15)) # Give XML a bit more time
         # Note: No article_fetch_delay or request_timeout_page needed, as the XML feed contains all data.
 
-    def _get_text(self, element, tag):
-        """Safely gets text from a child node of an XML element."""
-        node = element.find(tag)
-        return node.text.strip() if node is not None and node.text else None
-
-    def _extract_description(self, position_element):
-        """Extracts and cleans the job description from the XML, which is often nested HTML in a CDATA block."""
-        job_desc_node = position_element.find('jobDescriptions')
-        if job_desc_node is None:
-            return ""
-
-        for desc in job_desc_node.findall('jobDescription'):
-            value_node = desc.find('value')
-            if value_node is not None and value_node.text:
-                # The description is HTML; use BeautifulSoup to get clean text.
-                return BeautifulSoup(value_node.text, 'html.parser').get_text(separator=' ', strip=True)
-        return ""
+    def _save_batch(self, board_jobs: list[dict], unchanged_urls: list[str], company_id: str) -> tuple[int, int]:
+        """
+        Cleans the batch's descriptions, which the feed carries as HTML in CDATA blocks, in one
+        go (through the cleaning process pool when enabled) and saves the batch.
+        """
+        descriptions = get_cleaning_pool().clean(html_to_text, [job.pop("description_html") for job in board_jobs])
+        for job, description_text in zip(board_jobs, descriptions):
+            # For Personio, the API description is the full description.
+            job["api_provided_description"] = description_text
+            job["full_description_text"] = description_text
+        return save_scraped_jobs(board_jobs, unchanged_urls, company_id, refresh_content=response_archive.replaying)
 
     def fetch_jobs(self) -> tuple[int, int]:
         print(f"🔎 Starting PersonioScraper for {len(self.company_identifiers)} companies...")
         seen_count, added_count = 0, 0
+        known_jobs = self.known_jobs if self.known_jobs is not None else KnownJobs.load(self.platform_source)
 
         for company_id in self.company_identifiers:
             # Personio's XML feed URL format. '.de' is a common TLD for them.
             xml_feed_url = f"https://{company_id}.jobs.personio.de/xml"
+            company_seen, company_added = 0, 0
+            if self._past_deadline():
+                self._defer_unstarted(company_id)
+                continue
+            board_ends_at = self.budget.board_ends_at() if self.budget is not None else None
             try:
-                response = requests.get(xml_feed_url, timeout=self.request_timeout_api, headers={'User-Agent': self.user_agent})
-                response.raise_for_status()
-                
-                # Decode content to handle special characters before parsing
-                root = ET.fromstring(response.content.decode('utf-8'))
-                
-                positions = root.findall('position')
-                print(f"📥 {len(positions)} offers found for {company_id}.")
+                # Stream the body straight into the parser instead of holding bytes, str and tree at once.
+                with http_get(xml_feed_url, timeout=self.request_timeout_api, headers={'User-Agent': self.user_agent}, stream=True) as response:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    offers_count = 0
+                    board_jobs, unchanged_urls = [], []
 
-                for position in positions:
-                    job_id = self._get_text(position, 'id')
-                    title = self._get_text(position, 'name')
-                    if not job_id or not title:
-                        continue
+                    for position in iter_feed_positions(response.raw):
+                        offers_count += 1
+                        job_id = position.get('id')
+                        title = position.get('name')
+                        if not job_id or not title:
+                            continue
 
-                    # The job URL is not in the feed, so we construct it.
-                    job_url = f"https://{company_id}.jobs.personio.de/job/{job_id}"
-                    description_text = self._extract_description(position)
+                        # The job URL is not in the feed, so we construct it.
+                        job_url = f"https://{company_id}.jobs.personio.de/job/{job_id}"
+                        date_posted = position.get('creationDate')
+                        # Unchanged postings skip HTML cleaning and are only marked as seen.
+                        # The URL embeds the company, so it is the safe key here.
+                        known_url = known_jobs.unchanged_url(job_url=job_url, marker=date_posted)
+                        if known_url:
+                            unchanged_urls.append(known_url)
+                        else:
+                            board_jobs.append({
+                                "job_url": job_url,
+                                "platform_job_id": job_id,
+                                "platform_source": self.platform_source,
+                                "company_name": company_id.replace("-", " ").title(),
+                                "title": title,
+                                "location": position.get('office'),
+                                "department": position.get('department'),
+                                "date_posted_on_platform": date_posted,
+                                "description_html": position['description_html'],
+                            })
 
-                    job_data = {
-                        "job_url": job_url,
-                        "platform_job_id": job_id,
-                        "platform_source": self.platform_source,
-                        "company_name": company_id.replace("-", " ").title(),
-                        "title": title,
-                        "location": self._get_text(position, 'office'),
-                        "department": self._get_text(position, 'department'),
-                        "date_posted_on_platform": self._get_text(position, 'creationDate'),
-                        # For Personio, the API description is the full description.
-                        "api_provided_description": description_text,
-                        "full_description_text": description_text,
-                    }
+                        if len(board_jobs) + len(unchanged_urls) >= PERSONIO_WRITE_BATCH_SIZE:
+                            if self.budget is not None:
+                                self.budget.check(board_ends_at)
+                            seen, added = self._save_batch(board_jobs, unchanged_urls, company_id)
+                            company_seen, company_added = company_seen + seen, company_added + added
+                            board_jobs, unchanged_urls = [], []
 
-                    status, _ = add_or_update_job(job_data)
-                    if status == "inserted":
-                        added_count += 1
-                    seen_count += 1
+                    seen, added = self._save_batch(board_jobs, unchanged_urls, company_id)
+                    company_seen, company_added = company_seen + seen, company_added + added
+                    print(f"📥 {offers_count} offers found for {company_id}.")
 
+            except BudgetExceeded:
+                self._defer_out_of_time(company_id)
             except requests.exceptions.RequestException as e:
                 print(f"⚠️ HTTP error for {company_id} at {xml_feed_url}: {e}")
+                self._board_failed(company_id, e)
             except ET.ParseError as e:
                 print(f"❌ XML parsing error for {company_id}. The feed may be invalid or unavailable.")
+                self._board_failed(company_id, e)
             except Exception as e:
                 print(f"❌ Unexpected error for {company_id}: {type(e).__name__} - {e}")
+                self._board_failed(company_id, e)
+            else:
+                self._board_done(company_id, company_seen, company_added)
+            finally:
+                # Batches stored before a failure still count as seen.
+                seen_count += company_seen
+                added_count += company_added
 
         print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
         return seen_count, added_count
@@ -1,81 +1,117 @@
 # agents/scraper/sources/workable_scraper.py
 
+import asyncio
 from bs4 import BeautifulSoup
-import os, sys, time
-from playwright.sync_api import sync_playwright
+import os, sys
 
 try:
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord
+    from agents.scraper.async_http import HTTP_ERRORS
+    from agents.scraper.browser_pool import get_browser_pool
+    from agents.scraper.response_archive import response_archive
+    from utils.html_text import html_to_text
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
+    from agents.scraper.async_scraper import AsyncApiScraper, JobRecord
+    from agents.scraper.async_http import HTTP_ERRORS
+    from agents.scraper.browser_pool import get_browser_pool
+    from agents.scraper.response_archive import response_archive
+    from utils.html_text import html_to_text
 
-class WorkableScraper:
-    def __init__(self, company_identifiers: list[str]):
-        self.company_identifiers = company_identifiers
-        self.platform_source = "Workable"
+def workable_descriptions(offer: dict) -> tuple[str, str]:
+    """Returns the cleaned description, requirements and benefits of one offer as both description fields."""
+    sections = [offer.get(key) for key in ("description", "requirements", "benefits")]
+    description_text = html_to_text("\n".join(section for section in sections if section))
+    return description_text, description_text
+
+class WorkableScraper(AsyncApiScraper):
+    """
+    Reads Workable's public widget API (listings with full descriptions) over HTTP.
+    The rendered careers page is only loaded, through the shared browser pool, when the
+    API fails for a company; those listings carry no description.
+    """
+    platform_source = "Workable"
+    description_cleaner = staticmethod(workable_descriptions)
+
+    def __init__(self, company_identifiers: list[str], known_jobs=None):
+        super().__init__(company_identifiers, known_jobs=known_jobs)
+        self.company_identifiers = self.identifiers
+        self.request_timeout_api = int(os.getenv("API_REQUEST_TIMEOUT", 15))
         timeout_sec = int(os.getenv("SCRAPER_REQUEST_TIMEOUT", 20))
         self.playwright_timeout_ms = timeout_sec * 1000
 
-    def fetch_jobs(self) -> tuple[int, int]:
-        print(f"🔎 Starting WorkableScraper (Playwright) for {len(self.company_identifiers)} companies...")
-        seen_count, added_count = 0, 0
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+    def build_request(self, company_slug):
+        return f"https://apply.workable.com/api/v1/widget/accounts/{company_slug}", {"details": "true"}, None
 
-            for company_slug in self.company_identifiers:
-                list_url = f"https://apply.workable.com/{company_slug}/"
-                try:
-                    page.goto(list_url, timeout=self.playwright_timeout_ms)
-                    # ✅ Updated selector based on actual HTML structure
-                    page.wait_for_selector('ul[data-ui="list"] li[data-ui="job"]', state='visible', timeout=10000)
-                    
-                    html_content = page.content()
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    
-                    # ✅ Updated to match actual job listing structure
-                    job_elements = soup.select('li[data-ui="job"]')
-                    print(f"📥 {len(job_elements)} offers found for {company_slug}.")
+    def extract_offers(self, payload, company_slug):
+        return payload.get("jobs", [])
 
-                    for job_el in job_elements:
-                        title_tag = job_el.find('h3')
-                        link_tag = job_el.find('a')
-                        location_tag = job_el.find('span', attrs={'data-ui': 'job-location'})
+    async def fetch_offers(self, client, company_slug) -> list:
+        try:
+            return await super().fetch_offers(client, company_slug)
+        except HTTP_ERRORS as e:
+            print(f"⚠️ Workable API failed for {company_slug} ({type(e).__name__} - {e}); falling back to the careers page.")
+        if response_archive.replaying:
+            archived = response_archive.lookup(self._careers_url(company_slug))
+            return self._parse_careers_page(archived.body().decode("utf-8"))
+        return await get_browser_pool().call(self._list_offers_with_browser(company_slug))
 
-                        if not all([title_tag, link_tag]):
-                            continue
+    def _location(self, offer) -> str | None:
+        if offer.get("location"):
+            return offer["location"]
+        parts = (offer.get("city"), offer.get("state"), offer.get("country"))
+        return ", ".join(part for part in parts if part) or None
 
-                        title = title_tag.get_text(strip=True)
-                        relative_url = link_tag.get('href', '')
-                        job_url = f"https://apply.workable.com{relative_url}"
-                        location = location_tag.get_text(strip=True) if location_tag else None
+    def adapt(self, offer, company_slug):
+        title = offer.get("title")
+        shortcode = offer.get("shortcode")
+        if not title or not shortcode:
+            return None
+        return JobRecord(
+            # Same URL shape the careers page links to, so API and browser runs agree.
+            job_url=f"https://apply.workable.com/{company_slug}/j/{shortcode}/",
+            title=title,
+            platform_source=self.platform_source,
+            platform_job_id=shortcode,
+            company_name=company_slug.replace("-", " ").title(),
+            location=self._location(offer),
+            department=offer.get("department") or None,
+            date_posted_on_platform=offer.get("published_on") or offer.get("created_at"),
+        )
 
-                        job_data = {
-                            "job_url": job_url,
-                            "platform_job_id": relative_url.strip('/').split('/')[-1],
-                            "platform_source": self.platform_source,
-                            "company_name": company_slug.replace("-", " ").title(),
-                            "title": title,
-                            "location": location,
-                            "department": None,
-                            "date_posted_on_platform": None,
-                            "api_provided_description": title,
-                            "full_description_text": title,
-                        }
+    async def enrich(self, client, record, offer, company_slug):
+        # Browser-fallback listings have no description; keep the title so the filter has something.
+        record.api_provided_description = record.api_provided_description or record.title
+        record.full_description_text = record.full_description_text or record.title
 
-                        status, _ = add_or_update_job(job_data)
-                        if status == "inserted":
-                            added_count += 1
-                        seen_count += 1
+    def _careers_url(self, company_slug: str) -> str:
+        return f"https://apply.workable.com/{company_slug}/"
 
-                except Exception as e:
-                    print(f"❌ Playwright error for {company_slug}: {type(e).__name__} - {e}")
-            
-            browser.close()
+    async def _list_offers_with_browser(self, company_slug: str) -> list[dict]:
+        """Renders the careers page on a pooled page and returns its listings as offer dicts."""
+        pool = get_browser_pool()
+        list_url = self._careers_url(company_slug)
+        async with pool.page() as page:
+            await pool.goto(page, list_url, timeout=self.playwright_timeout_ms)
+            await page.wait_for_selector('ul[data-ui="list"] li[data-ui="job"]', state='visible', timeout=10000)
+            html_content = await page.content()
+        if response_archive.recording:
+            await asyncio.to_thread(response_archive.record, list_url, 200, {"Content-Type": "text/html"}, html_content.encode("utf-8"))
+        return self._parse_careers_page(html_content)
 
-        print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
-        return seen_count, added_count
+    def _parse_careers_page(self, html_content: str) -> list[dict]:
+        offers = []
+        for job_el in BeautifulSoup(html_content, 'html.parser').select('li[data-ui="job"]'):
+            title_tag = job_el.find('h3')
+            link_tag = job_el.find('a')
+            location_tag = job_el.find('span', attrs={'data-ui': 'job-location'})
+            if not all([title_tag, link_tag]):
+                continue
+            offers.append({
+                "title": title_tag.get_text(strip=True),
+                "shortcode": link_tag.get('href', '').strip('/').split('/')[-1],
+                "location": location_tag.get_text(strip=True) if location_tag else None,
+            })
+        return offers
@@ -1,100 +1,408 @@
 # agents/scraper/sources/wttj_scraper.py
 
-import os, sys, time
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+import asyncio
+import json
+import os, sys
+import re
+from urllib.parse import parse_qsl, urlencode
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 
 try:
-    from utils.db_utils import add_or_update_job
+    from utils.db_utils import save_scraped_jobs
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.browser_pool import get_browser_pool
+    from agents.scraper.rate_limiter import rate_limiter
+    from agents.scraper.response_archive import ArchiveMiss, response_archive
+    from agents.scraper.checkpoints import board_checkpoint_key
+    from agents.scraper.board_hooks import BoardHooks
+    from utils.html_text import html_to_text
 except ImportError:
     PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
     if PROJECT_ROOT not in sys.path:
         sys.path.insert(0, PROJECT_ROOT)
-    from utils.db_utils import add_or_update_job
+    from utils.db_utils import save_scraped_jobs
+    from agents.scraper.known_jobs import KnownJobs
+    from agents.scraper.browser_pool import get_browser_pool
+    from agents.scraper.rate_limiter import rate_limiter
+    from agents.scraper.response_archive import ArchiveMiss, response_archive
+    from agents.scraper.checkpoints import board_checkpoint_key
+    from agents.scraper.board_hooks import BoardHooks
+    from utils.html_text import html_to_text
 
-class WelcomeToTheJungleScraper:
-    def __init__(self, search_configs: list[dict]):
+# "network" reads the search backend's JSON responses (all result pages); "dom" reads the
+# rendered cards of the first page. Network mode falls back to the DOM if nothing is captured.
+WTTJ_SEARCH_MODE = os.getenv("WTTJ_SEARCH_MODE", "network")
+WTTJ_MAX_RESULT_PAGES = int(os.getenv("WTTJ_MAX_RESULT_PAGES", 20))
+# Detail pages are fetched by this many pooled pages at once, each visit bounded by a timeout,
+# and finished jobs are written in batches of WTTJ_WRITE_BATCH_SIZE.
+WTTJ_DETAIL_CONCURRENCY = int(os.getenv("WTTJ_DETAIL_CONCURRENCY", 3))
+WTTJ_DETAIL_TIMEOUT_SECONDS = float(os.getenv("WTTJ_DETAIL_TIMEOUT_SECONDS", 30))
+WTTJ_WRITE_BATCH_SIZE = int(os.getenv("WTTJ_WRITE_BATCH_SIZE", 10))
+WTTJ_SITE_URL = "https://www.welcometothejungle.com"
+# The search page queries Algolia with multi-index POSTs from the browser.
+SEARCH_BACKEND_URL = re.compile(r"algolia(net)?\.(net|com|io)/1/indexes/[^?]*/quer(y|ies)")
+RESULTS_LIST_SELECTOR = "ul[data-testid='search-results-list'] li"
+DESCRIPTION_SELECTOR = "div[data-testid='job-description']"
+
+def search_archive_key(search_url: str, page: int) -> str:
+    """Archive key of one search backend result page of a query."""
+    return f"{search_url}#search-page={page}"
+
+def is_search_backend_url(url: str) -> bool:
+    return bool(SEARCH_BACKEND_URL.search(url))
+
+def find_jobs_result(payload: dict) -> dict | None:
+    """Returns the job-hits result of a search backend response (single or multi-query), if any."""
+    results = payload.get("results") if isinstance(payload, dict) and "results" in payload else [payload]
+    for result in results or []:
+        if isinstance(result, dict) and isinstance(result.get("hits"), list) and "nbPages" in result:
+            # Facet-only side queries come back with hitsPerPage 0.
+            if result.get("hitsPerPage", 1) and "jobs" in str(result.get("index", "jobs")):
+                return result
+    return None
+
+def with_result_page(post_data: str, page: int) -> str:
+    """Rewrites a captured search request body so that every query asks for result page `page`."""
+    body = json.loads(post_data)
+    for request in body.get("requests", [body]):
+        if isinstance(request.get("params"), str):
+            params = dict(parse_qsl(request["params"], keep_blank_values=True))
+            params["page"] = str(page)
+            request["params"] = urlencode(params)
+        else:
+            request["page"] = page
+    return json.dumps(body)
+
+def hit_to_job(hit: dict, platform_source: str) -> dict | None:
+    """Maps one search hit to the job dict format; None if it lacks a title or URL."""
+    organization = hit.get("organization") or {}
+    slug, org_slug, title = hit.get("slug"), organization.get("slug"), hit.get("name")
+    if not slug or not org_slug or not title:
+        return None
+    offices = hit.get("offices") or []
+    location = None
+    if offices:
+        location = ", ".join(part for part in (offices[0].get("city"), offices[0].get("country")) if part) or None
+    summary = (hit.get("summary") or "").strip() or None
+    return {
+        "job_url": f"{WTTJ_SITE_URL}/en/companies/{org_slug}/jobs/{slug}",
+        "platform_job_id": slug,
+        "platform_source": platform_source,
+        "company_name": organization.get("name"),
+        "title": title,
+        "location": location,
+        "department": None,
+        "date_posted_on_platform": hit.get("published_at"),
+        "api_provided_description": summary,
+        "full_description_text": summary,
+    }
+
+class WelcomeToTheJungleScraper(BoardHooks):
+    def __init__(self, search_configs: list[dict], known_jobs=None, search_mode: str | None = None):
         self.search_configs = search_configs
         self.platform_source = "WelcomeToTheJungle"
-        self.base_url = "https://www.welcometothejungle.com/en/jobs"
+        self.known_jobs = known_jobs
+        self.base_url = f"{WTTJ_SITE_URL}/en/jobs"
         self.timeout = int(os.getenv("SCRAPER_REQUEST_TIMEOUT", 15))
+        self.search_mode = search_mode or WTTJ_SEARCH_MODE
+        self.max_result_pages = WTTJ_MAX_RESULT_PAGES
+        self.detail_concurrency = max(1, WTTJ_DETAIL_CONCURRENCY)
+        self.detail_timeout = WTTJ_DETAIL_TIMEOUT_SECONDS
+        self.write_batch_size = max(1, WTTJ_WRITE_BATCH_SIZE)
 
     def fetch_jobs(self) -> tuple[int, int]:
+        if response_archive.replaying:
+            # Search results and descriptions come from the archive; no browser is needed.
+            return asyncio.run(self.fetch_jobs_async())
+        # Pages come from the process-wide browser pool, whose event loop runs the scrape.
+        return get_browser_pool().run(self.fetch_jobs_async())
+
+    async def fetch_jobs_async(self) -> tuple[int, int]:
         print(f"🔎 Starting WelcomeToTheJungleScraper for {len(self.search_configs)} queries...")
         seen_count, added_count = 0, 0
+        known_jobs = self.known_jobs if self.known_jobs is not None else KnownJobs.load(self.platform_source)
+        pool = None if response_archive.replaying else get_browser_pool()
+
+        for config in self.search_configs:
+            query_str = f"'{config.get('query', '')}' in '{config.get('location', '')}'"
+            if self._past_deadline():
+                await asyncio.to_thread(self._defer_unstarted, config)
+                continue
+            try:
+                timeout = self.budget.board_timeout() if self.budget is not None else None
+                seen, added = await asyncio.wait_for(self._scrape_query(pool, config, known_jobs), timeout)
+                seen_count += seen
+                added_count += added
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
-            page = context.new_page()
-            detail_page = context.new_page()
-
-            for config in self.search_configs:
-                query = config.get("query", "")
-                location = config.get("location", "")
-                query_str = f"'{query}' in '{location}'"
-
-                search_url = f"{self.base_url}?query={query.replace(' ', '%20')}&aroundQuery={location}"
-                print(f"🌍 Visiting: {search_url}")
-
-                try:
-                    page.goto(search_url, timeout=self.timeout * 1000)
-                    page.wait_for_selector("ul[data-testid='search-results-list'] li", timeout=self.timeout * 1000)
-
-                    job_cards = page.query_selector_all("ul[data-testid='search-results-list'] li")
-                    print(f"📥 {len(job_cards)} offers found for query: {query_str}")
-
-                    for card in job_cards:
-                        try:
-                            anchor = card.query_selector("a")
-                            job_url = "https://www.welcometothejungle.com" + anchor.get_attribute("href") if anchor else None
-                            title_elem = card.query_selector("h3")
-                            company_elem = card.query_selector("span[data-testid='company-name']")
-                            location_elem = card.query_selector("span[data-testid='job-location']")
-
-                            title = title_elem.inner_text().strip() if title_elem else None
-                            company = company_elem.inner_text().strip() if company_elem else None
-                            location_text = location_elem.inner_text().strip() if location_elem else None
-
-                            full_description = None
-                            if job_url:
-                                try:
-                                    detail_page.goto(job_url, timeout=self.timeout * 1000)
-                                    detail_page.wait_for_selector("div[data-testid='job-description']", timeout=self.timeout * 1000)
-                                    desc_elem = detail_page.query_selector("div[data-testid='job-description']")
-                                    full_description = desc_elem.inner_text().strip() if desc_elem else None
-                                except PlaywrightTimeout:
-                                    print(f"⚠️ Timeout fetching job detail: {job_url}")
-                                except Exception as e:
-                                    print(f"⚠️ Detail page error ({job_url}): {type(e).__name__} - {e}")
-
-                            if not job_url:
-                                continue
-
-                            job_data = {
-                                "job_url": job_url,
-                                "platform_job_id": job_url.split('/')[-1],
-                                "platform_source": self.platform_source,
-                                "company_name": company,
-                                "title": title,
-                                "location": location_text,
-                                "department": None,
-                                "date_posted_on_platform": None,
-                                "api_provided_description": full_description,
-                                "full_description_text": full_description,
-                            }
-
-                            status, _ = add_or_update_job(job_data)
-                            if status == "inserted":
-                                added_count += 1
-                            seen_count += 1
-                        except Exception as e:
-                            print(f"⚠️ Error parsing job card: {type(e).__name__} - {e}")
-
-                except PlaywrightTimeout:
+            except asyncio.TimeoutError as e:
+                if self.budget is None:
                     print(f"⚠️ Timeout when fetching query: {query_str}")
-                except Exception as e:
-                    print(f"❌ Unexpected error for query {query_str}: {type(e).__name__} - {e}")
+                    await asyncio.to_thread(self._board_failed, config, e)
+                else:
+                    await asyncio.to_thread(self._defer_out_of_time, config)
+            except PlaywrightTimeout as e:
+                print(f"⚠️ Timeout when fetching query: {query_str}")
+                await asyncio.to_thread(self._board_failed, config, e)
+            except ArchiveMiss as e:
+                print(f"⚠️ {e}")
+            except Exception as e:
+                print(f"❌ Unexpected error for query {query_str}: {type(e).__name__} - {e}")
+                await asyncio.to_thread(self._board_failed, config, e)
+            else:
+                await asyncio.to_thread(self._board_done, config, seen, added)
 
-            browser.close()
         print(f"✅ Done. Seen: {seen_count}, Added: {added_count}")
         return seen_count, added_count
+
+    async def _scrape_query(self, pool, config: dict, known_jobs: KnownJobs) -> tuple[int, int]:
+        """Searches one configured query, then fetches and stores its new or changed postings."""
+        query = config.get("query", "")
+        location = config.get("location", "")
+        query_str = f"'{query}' in '{location}'"
+
+        search_url = f"{self.base_url}?query={query.replace(' ', '%20')}&aroundQuery={location}"
+        print(f"🌍 Visiting: {search_url}")
+
+        if pool is None:
+            jobs = await self._search_from_archive(search_url)
+        else:
+            # The search page goes back to the pool before any detail page is borrowed,
+            # so concurrent scrapes never hold one page while waiting for another.
+            async with pool.page() as page:
+                jobs = None
+                if self.search_mode == "network":
+                    jobs = await self._search_via_network(pool, page, search_url)
+                    if jobs is None:
+                        print(f"⚠️ No search backend response captured for {query_str}; reading the rendered cards.")
+                if jobs is None:
+                    jobs = await self._search_via_dom(pool, page, search_url, loaded=self.search_mode == "network")
+        print(f"📥 {len(jobs)} offers found for query: {query_str}")
+
+        board_jobs, unchanged_urls = [], []
+        for job_data in jobs:
+            # Match on the URL only: job slugs are not unique across companies.
+            known_url = known_jobs.unchanged_url(
+                job_url=job_data["job_url"], marker=job_data.get("date_posted_on_platform")
+            )
+            if known_url:
+                unchanged_urls.append(known_url)
+            else:
+                board_jobs.append(job_data)
+
+        # Only new or changed postings cost a detail page visit.
+        return await self._fetch_details_and_save(pool, board_jobs, unchanged_urls, board_checkpoint_key(config))
+
+    async def _search_via_network(self, pool, page, search_url: str) -> list[dict] | None:
+        """
+        Loads the search page while listening for the search backend's JSON responses, then
+        replays the captured request for the remaining result pages. Returns None when no
+        usable response was seen (e.g. the site changed its backend).
+        """
+        captured = []
+
+        def on_response(response):
+            if response.request.method == "POST" and is_search_backend_url(response.url):
+                captured.append(response)
+
+        page.on("response", on_response)
+        try:
+            await pool.goto(page, search_url, timeout=self.timeout * 1000)
+            await page.wait_for_selector(RESULTS_LIST_SELECTOR, timeout=self.timeout * 1000)
+        finally:
+            page.remove_listener("response", on_response)
+
+        for response in captured:
+            try:
+                body = await response.body()
+                result = find_jobs_result(json.loads(body))
+            except Exception:
+                continue
+            if result is None:
+                continue
+            await self._archive(search_archive_key(search_url, int(result.get("page") or 0)), body)
+            request = response.request
+
+            async def fetch_page(number: int) -> dict:
+                await rate_limiter.wait_async(request.url)
+                reply = await page.request.post(
+                    request.url, data=with_result_page(request.post_data, number),
+                    headers={"content-type": request.headers.get("content-type", "application/json")},
+                    timeout=self.timeout * 1000,
+                )
+                body = await reply.body()
+                await self._archive(search_archive_key(search_url, number), body)
+                return json.loads(body)
+
+            return await self.collect_hits(result, fetch_page)
+        return None
+
+    async def _search_from_archive(self, search_url: str) -> list[dict]:
+        """Replays the search backend pages an archived run captured for `search_url`."""
+        first_result = find_jobs_result(json.loads(response_archive.lookup(search_archive_key(search_url, 0)).body()))
+
+        async def fetch_page(number: int) -> dict:
+            try:
+                return json.loads(response_archive.lookup(search_archive_key(search_url, number)).body())
+            except ArchiveMiss:
+                # The recorded run stopped paging here too.
+                return {}
+
+        return await self.collect_hits(first_result or {}, fetch_page)
+
+    async def _archive(self, key: str, body: bytes, content_type: str = "application/json"):
+        if response_archive.recording:
+            await asyncio.to_thread(response_archive.record, key, 200, {"Content-Type": content_type}, body)
+
+    async def collect_hits(self, first_result: dict, fetch_page) -> list[dict]:
+        """Walks every result page after `first_result` (up to max_result_pages) and maps the hits to jobs."""
+        hits = list(first_result.get("hits", []))
+        total_pages = min(int(first_result.get("nbPages") or 1), self.max_result_pages)
+        for number in range(int(first_result.get("page") or 0) + 1, total_pages):
+            result = find_jobs_result(await fetch_page(number))
+            if not result or not result.get("hits"):
+                break
+            hits.extend(result["hits"])
+
+        jobs, seen_urls = [], set()
+        for hit in hits:
+            job_data = hit_to_job(hit, self.platform_source)
+            if job_data and job_data["job_url"] not in seen_urls:
+                seen_urls.add(job_data["job_url"])
+                jobs.append(job_data)
+        return jobs
+
+    async def _search_via_dom(self, pool, page, search_url: str, loaded: bool = False) -> list[dict]:
+        """Reads the rendered result cards of the first search page (already on `page` if `loaded`)."""
+        if not loaded:
+            await pool.goto(page, search_url, timeout=self.timeout * 1000)
+        await page.wait_for_selector(RESULTS_LIST_SELECTOR, timeout=self.timeout * 1000)
+
+        jobs = []
+        for card in await page.query_selector_all(RESULTS_LIST_SELECTOR):
+            try:
+                anchor = await card.query_selector("a")
+                href = await anchor.get_attribute("href") if anchor else None
+                if not href:
+                    continue
+                job_url = WTTJ_SITE_URL + href
+
+                title_elem = await card.query_selector("h3")
+                company_elem = await card.query_selector("span[data-testid='company-name']")
+                location_elem = await card.query_selector("span[data-testid='job-location']")
+
+                jobs.append({
+                    "job_url": job_url,
+                    "platform_job_id": job_url.split('/')[-1],
+                    "platform_source": self.platform_source,
+                    "company_name": (await company_elem.inner_text()).strip() if company_elem else None,
+                    "title": (await title_elem.inner_text()).strip() if title_elem else None,
+                    "location": (await location_elem.inner_text()).strip() if location_elem else None,
+                    "department": None,
+                    "date_posted_on_platform": None,
+                    "api_provided_description": None,
+                    "full_description_text": None,
+                })
+            except Exception as e:
+                print(f"⚠️ Error parsing job card: {type(e).__name__} - {e}")
+        return jobs
+
+    async def _fetch_details_and_save(self, pool, board_jobs: list[dict], unchanged_urls: list[str],
+                                      source_board: str | None = None) -> tuple[int, int]:
+        """
+        Fetches descriptions from a work queue consumed by up to `detail_concurrency` pooled
+        pages and saves finished jobs in batches, so one hung page never stalls the query.
+        Returns (seen, added) for the query. Without a pool (replay), descriptions come from the archive.
+        """
+        if pool is None:
+            return await asyncio.to_thread(self._save_replayed, board_jobs, unchanged_urls, source_board)
+
+        queue = asyncio.Queue()
+        for job_data in board_jobs:
+            queue.put_nowait(job_data)
+        finished, touch_urls = [], list(unchanged_urls)
+        totals = [0, 0]
+
+        async def flush():
+            nonlocal finished, touch_urls
+            batch, urls = finished, touch_urls
+            finished, touch_urls = [], []
+            if batch or urls:
+                # The writer lock may block, so the database work leaves the pool's event loop.
+                seen, added = await asyncio.to_thread(save_scraped_jobs, batch, urls, source_board)
+                totals[0] += seen
+                totals[1] += added
+
+        async def worker():
+            while not queue.empty():
+                async with pool.page() as page:
+                    # A page closed after a timeout is dropped by the pool; borrow a fresh one.
+                    while not queue.empty() and not page.is_closed():
+                        job_data = queue.get_nowait()
+                        full_description = await self._fetch_description_bounded(pool, page, job_data["job_url"])
+                        self._apply_description(job_data, full_description)
+                        finished.append(job_data)
+                        if len(finished) >= self.write_batch_size:
+                            await flush()
+
+        results = await asyncio.gather(
+            *(worker() for _ in range(min(self.detail_concurrency, len(board_jobs)))), return_exceptions=True
+        )
+        for error in results:
+            if isinstance(error, Exception):
+                print(f"⚠️ Detail worker failed: {type(error).__name__} - {error}")
+        await flush()
+        return totals[0], totals[1]
+
+    def _save_replayed(self, board_jobs: list[dict], unchanged_urls: list[str], source_board: str | None) -> tuple[int, int]:
+        """
+        Saves a replayed query. Only postings whose detail page is in the archive get their stored
+        content rewritten; the recorded run never visited unchanged postings, and rewriting those
+        would replace their description with the search summary.
+        """
+        rebuilt, partial = [], []
+        for job_data in board_jobs:
+            full_description = self._archived_description(job_data["job_url"])
+            self._apply_description(job_data, full_description)
+            (rebuilt if full_description else partial).append(job_data)
+        seen, added = save_scraped_jobs(rebuilt, unchanged_urls, source_board, refresh_content=True)
+        partial_seen, partial_added = save_scraped_jobs(partial, [], source_board)
+        return seen + partial_seen, added + partial_added
+
+    def _apply_description(self, job_data: dict, full_description: str | None):
+        if full_description:
+            job_data["full_description_text"] = full_description
+            job_data["api_provided_description"] = job_data.get("api_provided_description") or full_description
+
+    def _archived_description(self, job_url: str) -> str | None:
+        """The description of an archived detail page; the live run's inner_text is approximated line by line."""
+        try:
+            return html_to_text(response_archive.lookup(job_url).body().decode("utf-8"), "\n") or None
+        except ArchiveMiss:
+            return None
+
+    async def _fetch_description_bounded(self, pool, page, job_url: str) -> str | None:
+        """_fetch_description with a hard per-page deadline; a page that overran it is closed."""
+        try:
+            return await asyncio.wait_for(self._fetch_description(pool, page, job_url), timeout=self.detail_timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Detail page exceeded {self.detail_timeout:.0f}s, abandoning it: {job_url}")
+            await page.close()
+            return None
+
+    async def _fetch_description(self, pool, page, job_url: str) -> str | None:
+        """Visits a job's detail page and returns its description text (None on failure)."""
+        try:
+            await pool.goto(page, job_url, timeout=self.timeout * 1000)
+            await page.wait_for_selector(DESCRIPTION_SELECTOR, timeout=self.timeout * 1000)
+            desc_elem = await page.query_selector(DESCRIPTION_SELECTOR)
+            if not desc_elem:
+                return None
+            if response_archive.recording:
+                # The description block is what the run used of the page, so only it is archived.
+                await self._archive(job_url, (await desc_elem.evaluate("e => e.outerHTML")).encode("utf-8"), "text/html")
+            return (await desc_elem.inner_text()).strip()
+        except PlaywrightTimeout:
+            print(f"⚠️ Timeout fetching job detail: {job_url}")
+        except Exception as e:
+            print(f"⚠️ Detail page error ({job_url}): {type(e).__name__} - {e}")
+        return None
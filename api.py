@@ -3,13 +3,8 @@
 from fastapi import FastAPI, Query
 from typing import Optional
 
-# --- KEY CHANGE: Import the Celery tasks, not the logic functions ---
-from tasks import (
-    scrape_task,
-    filter_task,
-    notify_task,
-    run_full_pipeline_task
-)
+# --- Send tasks by name: importing tasks would load logic and every agent into the API ---
+from celery_app import celery_app, SCRAPE_TASK, FILTER_TASK, NOTIFY_TASK, FULL_PIPELINE_TASK
 
 app = FastAPI(
     title="BittyScout API",
@@ -23,15 +18,16 @@ def read_root():
     return {"status": "BittyScout API is online and ready to accept tasks."}
 
 @app.post("/scrape", status_code=202, summary="Queue a Scraping Task")
-async def api_scrape(source: Optional[str] = Query(None, description="Optional: Specify a single source to scrape (e.g., 'Greenhouse').")):
+async def api_scrape(source: Optional[str] = Query(None, description="Optional: Specify a single source to scrape (e.g., 'Greenhouse')."),
+                     resume: bool = Query(False, description="Continue the latest interrupted run, skipping the boards it already completed.")):
     """
     Accepts a scrape request and queues it for background processing.
     Responds immediately.
     """
     print(f"API: Sending scrape task for source '{source or 'all'}' to the queue.")
     
-    # Use .delay() to send the task to the Celery worker queue
-    scrape_task.delay(source=source)
+    # Send the task to the Celery worker queue
+    celery_app.send_task(SCRAPE_TASK, kwargs={"source": source, "resume": resume})
     
     return {"status": "accepted", "detail": "Scraping task has been successfully queued."}
 
@@ -42,7 +38,7 @@ async def api_filter():
     Accepts a filter request and queues it for background processing.
     """
     print("API: Sending filter task to the queue.")
-    filter_task.delay()
+    celery_app.send_task(FILTER_TASK)
     return {"status": "accepted", "detail": "Filtering task has been successfully queued."}
 
 @app.post("/notify", status_code=202, summary="Queue a Notification Task")
@@ -51,14 +47,14 @@ async def api_notify(channel: str = Query("console", description="The channel to
     Accepts a notify request and queues it for background processing.
     """
     print(f"API: Sending notify task for channel '{channel}' to the queue.")
-    notify_task.delay(channel=channel)
+    celery_app.send_task(NOTIFY_TASK, kwargs={"channel": channel})
     return {"status": "accepted", "detail": f"Notification task for channel '{channel}' has been successfully queued."}
 
 @app.post("/run", status_code=202, summary="Queue the Full Pipeline Task")
-async def api_run_full_pipeline():
+async def api_run_full_pipeline(resume: bool = Query(False, description="Continue the latest interrupted scrape run, skipping the boards it already completed.")):
     """
     Accepts a request to run the full pipeline and queues it for background processing.
     """
     print("API: Sending full pipeline task to the queue.")
-    run_full_pipeline_task.delay()
+    celery_app.send_task(FULL_PIPELINE_TASK, kwargs={"resume": resume})
     return {"status": "accepted", "detail": "Full scrape-filter-notify pipeline task has been successfully queued."}
\ No newline at end of file
@@ -0,0 +1,19 @@
+# FILE: ~/BittyScout/celery_app.py
+
+import os
+from celery import Celery
+
+# Get the Redis URL from an environment variable for flexibility,
+# but default to the service name from docker-compose.
+# This allows it to work both in Docker and potentially locally.
+REDIS_URL = os.getenv("REDIS_URL", "redis://bittyscout-redis:6379/0")
+
+# Shared by the worker (tasks.py registers the tasks on it) and the API, which only sends
+# messages by task name and so never imports tasks, logic or any agent.
+celery_app = Celery('tasks', broker=REDIS_URL, backend=REDIS_URL)
+
+# --- Task names ---
+SCRAPE_TASK = "tasks.scrape_task"
+FILTER_TASK = "tasks.filter_task"
+NOTIFY_TASK = "tasks.notify_task"
+FULL_PIPELINE_TASK = "tasks.run_full_pipeline_task"
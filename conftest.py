@@ -0,0 +1,27 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """Points utils.db_utils at a throwaway database file that has no schema yet."""
+    db_utils.close_db_connections()
+    monkeypatch.setattr(db_utils, "DB_PATH", str(tmp_path / "bittyscout_test.db"))
+    yield db_utils.DB_PATH
+    db_utils.close_db_connections()
+
+@pytest.fixture
+def temp_db(empty_db):
+    """A throwaway database with every migration applied."""
+    db_utils.migrate_db()
+    return empty_db
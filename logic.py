@@ -12,41 +12,138 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --- End Setup ---
 
-from agents.scraper.scraper_agent import ScraperAgent
-from agents.filter.filter_agent import FilterAgent
-from agents.notifier.notifier_agent import NotifierAgent
-from utils.db_utils import create_jobs_table_if_not_exist
-from utils.llm_utils import call_llm, list_available_models, set_model
+from utils.db_utils import migrate_db
+# The agents are imported inside the functions that run them: tasks (and through it the worker)
+# imports this module, and each command should only load what it uses.
 
 # --- Core Functions for Each Agent ---
 
-def run_scraping(source=None):
-    """Initializes the DB and runs the scraper agent."""
-    create_jobs_table_if_not_exist()
+def run_scraping(source=None, archive=None, replay=None, resume=False, all_boards=False, deadline=None):
+    """
+    Initializes the DB and runs the scraper agent. `resume` continues the latest interrupted
+    run instead of starting over; `all_boards` ignores the adaptive polling schedule; `deadline`
+    bounds the run in minutes (default: SCRAPER_DEADLINE_MINUTES); `archive` keeps the raw
+    responses of the run; `replay` re-processes an archived run by its run id without any
+    network access.
+    """
+    from agents.scraper.scraper_agent import ScraperAgent
+    migrate_db()
     agent = ScraperAgent()
-    agent.run_scrapers(target_source=source)
+    agent.run_scrapers(target_source=source, archive=archive, replay_run_id=replay, resume=resume, all_boards=all_boards,
+                       deadline_minutes=deadline)
+
+def run_schedule(source=None, board=None, every=None, adaptive=False):
+    """Shows the adaptive polling schedule, or pins a board to a fixed interval (`every`, in hours) or back to adaptive."""
+    from agents.scraper.poll_schedule import print_poll_schedule
+    from utils.db_utils import set_board_poll_override
+    migrate_db()
+    if board is not None:
+        if not source or (every is None and not adaptive):
+            print("❌ Pinning a board needs --source and either --every HOURS or --adaptive.")
+            return False
+        set_board_poll_override(source, board, None if adaptive else every)
+        print(f"📌 {source}/{board}: " + ("adaptive polling restored." if adaptive else f"polled every {every:g}h."))
+    print_poll_schedule(source)
+    return True
+
+def run_circuits(source=None, board=None, reset=False):
+    """Lists boards whose circuit is open or half-open, or closes one by hand with `reset`."""
+    from agents.scraper.circuit_breaker import print_circuit_report
+    from utils.db_utils import reset_board_circuit
+    migrate_db()
+    if reset:
+        if not source or board is None:
+            print("❌ Resetting a circuit needs --source and --board.")
+            return False
+        if reset_board_circuit(source, board):
+            print(f"🔌 {source}/{board}: failures forgotten, circuit closed.")
+        else:
+            print(f"🔌 {source}/{board} had no recorded failures.")
+    print_circuit_report(source)
+    return True
 
 def run_filtering():
     """Initializes the DB and runs the filter agent."""
-    create_jobs_table_if_not_exist()
+    from agents.filter.filter_agent import FilterAgent
+    migrate_db()
     agent = FilterAgent()
     agent.run()
 
 def run_notification(channel="console"):
     """Runs the notifier agent to display or send a digest of relevant jobs."""
-    create_jobs_table_if_not_exist()
+    from agents.notifier.notifier_agent import NotifierAgent
+    migrate_db()
     agent = NotifierAgent()
     agent.run(channel=channel)
 
 # --- The Main Pipeline Function ---
 
-def run_full_pipeline():
-    """Runs the full end-to-end pipeline: scrape, filter, and notify to console."""
+def run_full_pipeline(resume=False):
+    """Runs the full end-to-end pipeline: scrape, filter, and notify to console. `resume` is passed to run_scraping."""
     print("--- 🏁 BittyScout Full Pipeline Starting ---")
-    run_scraping()
+    run_scraping(resume=resume)
     run_filtering()
     run_notification(channel="console") # Default to console output for the full run
     print("\n--- ✅ BittyScout Full Pipeline Complete ---")
     print("To send the digest via email, run: python logic.py notify --channel=email")
 
-# (The rest of your argparse and if __name__ == "__main__" can stay here for manual runs)
\ No newline at end of file
+def run_startup_profile(module="api", top=15):
+    """Reports what importing `module` costs and fails when it drags in the scraping stack."""
+    from utils.startup_profile import print_startup_profile
+    return print_startup_profile(module, top=top)
+
+def main():
+    parser = argparse.ArgumentParser(description="🤖 BittyScout - Your AI Job Scout")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the full pipeline: scrape, filter and notify to the console.")
+    run_parser.add_argument("--resume", action="store_true", help="Continue the latest interrupted scrape run, skipping its completed boards.")
+
+    scrape_parser = subparsers.add_parser("scrape", help="Run only the scraping agents.")
+    scrape_parser.add_argument("--source", type=str, help="Optionally run a single source (e.g., Greenhouse, Adzuna).")
+    scrape_parser.add_argument("--archive", action="store_true", default=None, help="Keep the raw responses of this run in the response archive.")
+    scrape_parser.add_argument("--replay", type=str, metavar="RUN_ID", help="Re-process an archived run offline instead of scraping.")
+    scrape_parser.add_argument("--resume", action="store_true", help="Continue the latest interrupted run, skipping its completed boards.")
+    scrape_parser.add_argument("--all-boards", action="store_true", help="Scrape every configured board, due or not.")
+    scrape_parser.add_argument("--deadline", type=float, metavar="MINUTES", help="Stop scraping after this many minutes (0 = no deadline).")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Show the adaptive polling schedule or override it for a board.")
+    schedule_parser.add_argument("--source", type=str, help="Source of the board (e.g., Greenhouse); also filters the listing.")
+    schedule_parser.add_argument("--board", type=str, help="Board to override, as configured in job_sources.yml.")
+    schedule_parser.add_argument("--every", type=float, metavar="HOURS", help="Poll the board at this fixed interval (0 = every run).")
+    schedule_parser.add_argument("--adaptive", action="store_true", help="Hand the board back to the adaptive schedule.")
+
+    circuits_parser = subparsers.add_parser("circuits", help="List boards skipped because they keep failing, or reset one.")
+    circuits_parser.add_argument("--source", type=str, help="Source of the board; also filters the listing.")
+    circuits_parser.add_argument("--board", type=str, help="Board to reset, as configured in job_sources.yml.")
+    circuits_parser.add_argument("--reset", action="store_true", help="Close the board's circuit so the next run scrapes it.")
+
+    subparsers.add_parser("filter", help="Run only the filtering agent on unprocessed jobs.")
+
+    notify_parser = subparsers.add_parser("notify", help="Send a digest of relevant jobs.")
+    notify_parser.add_argument("--channel", type=str, default="console", help="console, email or discord.")
+
+    profile_parser = subparsers.add_parser("startup-profile", help="Report the import time and memory of a process entrypoint.")
+    profile_parser.add_argument("--module", type=str, default="api", help="Module to import (default: api, the API container).")
+    profile_parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list.")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_full_pipeline(resume=args.resume)
+    elif args.command == "scrape":
+        run_scraping(source=args.source, archive=args.archive, replay=args.replay, resume=args.resume, all_boards=args.all_boards,
+                     deadline=args.deadline)
+    elif args.command == "schedule":
+        sys.exit(0 if run_schedule(source=args.source, board=args.board, every=args.every, adaptive=args.adaptive) else 1)
+    elif args.command == "circuits":
+        sys.exit(0 if run_circuits(source=args.source, board=args.board, reset=args.reset) else 1)
+    elif args.command == "filter":
+        run_filtering()
+    elif args.command == "notify":
+        run_notification(channel=args.channel)
+    elif args.command == "startup-profile":
+        sys.exit(0 if run_startup_profile(module=args.module, top=args.top) else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,7 +1,6 @@
 # FILE: ~/BittyScout/tasks.py
 
-import os
-from celery import Celery
+from celery_app import celery_app, SCRAPE_TASK, FILTER_TASK, NOTIFY_TASK, FULL_PIPELINE_TASK
 
 # Import the functions from your logic file
 from logic import (
@@ -11,34 +10,26 @@ from logic import (
     run_full_pipeline
 )
 
-# Get the Redis URL from an environment variable for flexibility,
-# but default to the service name from docker-compose.
-# This allows it to work both in Docker and potentially locally.
-REDIS_URL = os.getenv("REDIS_URL", "redis://bittyscout-redis:6379/0")
-
-# Initialize the Celery application
-# The first argument is the name of the current module.
-# The 'broker' and 'backend' tell Celery where to send/receive messages.
-celery_app = Celery('tasks', broker=REDIS_URL, backend=REDIS_URL)
-
 # --- Define the Background Tasks ---
 
-@celery_app.task(name="tasks.scrape_task")
-def scrape_task(source=None):
+@celery_app.task(name=SCRAPE_TASK)
+def scrape_task(source=None, resume=False):
     """
     A Celery task that executes the run_scraping function from logic.py.
     The worker process will run this function when a message is received.
+    With `resume`, it continues a run the worker was killed in the middle of, skipping the
+    boards that run already completed.
     """
     print(f"--- WORKER: Received scrape task for source: {source or 'all'} ---")
     try:
-        run_scraping(source=source)
+        run_scraping(source=source, resume=resume)
         print(f"--- WORKER: Scrape task finished successfully. ---")
         return {"status": "success"}
     except Exception as e:
         print(f"--- WORKER ERROR in scrape_task: {e} ---")
         return {"status": "error", "error_message": str(e)}
 
-@celery_app.task(name="tasks.filter_task")
+@celery_app.task(name=FILTER_TASK)
 def filter_task():
     """A Celery task that executes the run_filtering function."""
     print(f"--- WORKER: Received filter task. ---")
@@ -51,7 +42,7 @@ def filter_task():
         return {"status": "error", "error_message": str(e)}
 
 
-@celery_app.task(name="tasks.notify_task")
+@celery_app.task(name=NOTIFY_TASK)
 def notify_task(channel="console"):
     """A Celery task that executes the run_notification function."""
     print(f"--- WORKER: Received notify task for channel: {channel} ---")
@@ -64,12 +55,12 @@ def notify_task(channel="console"):
         return {"status": "error", "error_message": str(e)}
 
 
-@celery_app.task(name="tasks.run_full_pipeline_task")
-def run_full_pipeline_task():
-    """A Celery task that executes the full pipeline."""
+@celery_app.task(name=FULL_PIPELINE_TASK)
+def run_full_pipeline_task(resume=False):
+    """A Celery task that executes the full pipeline; `resume` works as in scrape_task."""
     print(f"--- WORKER: Received full pipeline task. ---")
     try:
-        run_full_pipeline()
+        run_full_pipeline(resume=resume)
         print(f"--- WORKER: Full pipeline task finished successfully. ---")
         return {"status": "success"}
     except Exception as e:
@@ -11,7 +11,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --- End Setup ---
 
-from utils.db_utils import create_jobs_table_if_not_exist, get_db_connection
+from utils.db_utils import migrate_db, get_db_connection
 from agents.scraper.sources.adzuna_scraper import AdzunaScraper
 
 def load_config(config_path="config/job_sources.yml"):
@@ -26,7 +26,7 @@ if __name__ == "__main__":
         print("   Please sign up at https://developer.adzuna.com/ and add your credentials.")
         sys.exit(1)
         
-    create_jobs_table_if_not_exist()
+    migrate_db()
 
     config = load_config()
     test_configs = config.get("Adzuna", [])
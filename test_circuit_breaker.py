@@ -0,0 +1,91 @@
+# test_circuit_breaker.py
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_http import HttpStatusError
+from agents.scraper.circuit_breaker import CircuitBreaker, cooldown_hours, open_circuit_lines
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.sources.recruitee_scraper import RecruiteeScraper
+
+DEAD = HttpStatusError("https://dead.recruitee.com/api/offers/", 404)
+
+def breaker_at(hours_from_now: float = 0) -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=3, cooldown_hours=12, max_cooldown_hours=48,
+                          now=datetime.now(timezone.utc) + timedelta(hours=hours_from_now))
+
+def state(board: str) -> dict:
+    return db_utils.get_board_circuits("Recruitee")[("Recruitee", board)]
+
+def test_cooldown_doubles_up_to_the_cap():
+    assert [cooldown_hours(trips, 12, 48) for trips in (1, 2, 3, 4)] == [12, 24, 48, 48]
+
+def test_repeated_failures_open_the_circuit_and_probes_reopen_it(temp_db):
+    for _ in range(3):
+        breaker = breaker_at()
+        assert breaker.allowed("Recruitee", ["dead", "alive"]) == ["dead", "alive"]
+        breaker.board_failed("Recruitee", "dead", DEAD)
+        breaker.board_succeeded("Recruitee", "alive")
+    assert state("dead")["state"] == "open" and state("dead")["trips"] == 1
+    assert ("Recruitee", "alive") not in db_utils.get_board_circuits("Recruitee")
+    assert breaker_at(11).allowed("Recruitee", ["dead", "alive"]) == ["alive"]
+    assert "HttpStatusError: HTTP 404" in open_circuit_lines()[0]
+
+    # Cooldown over: one probe, which fails, so the circuit reopens for twice as long
+    # (cooldowns run from the real failure time).
+    probe = breaker_at(12.5)
+    assert probe.allowed("Recruitee", ["dead"]) == ["dead"]
+    assert state("dead")["state"] == "half_open"
+    probe.board_failed("Recruitee", "dead", DEAD)
+    assert state("dead")["trips"] == 2
+    assert breaker_at(23).allowed("Recruitee", ["dead"]) == []
+
+    # A successful probe closes it again.
+    probe = breaker_at(24.5)
+    assert probe.allowed("Recruitee", ["dead"]) == ["dead"]
+    probe.board_succeeded("Recruitee", "dead")
+    assert state("dead")["state"] == "closed" and state("dead")["consecutive_failures"] == 0
+    assert open_circuit_lines() == []
+
+def test_rate_limiting_is_not_a_board_failure(temp_db):
+    breaker = breaker_at()
+    for _ in range(5):
+        breaker.board_failed("Recruitee", "busy", HttpStatusError("https://busy.recruitee.com/api/offers/", 429))
+    assert db_utils.get_board_circuits("Recruitee") == {}
+
+def test_async_scrapers_report_failed_boards():
+    class DeadBoardScraper(RecruiteeScraper):
+        async def fetch_offers(self, client, board):
+            raise DEAD
+
+    failures = []
+    scraper = DeadBoardScraper(["dead"], known_jobs=KnownJobs("Recruitee", []))
+    scraper.on_board_failed = lambda board, error: failures.append((board, error))
+    assert asyncio.run(scraper.fetch_board(None, "dead", scraper.known_jobs)) == (0, 0)
+    assert failures == [("dead", DEAD)]
+
+def test_bookkeeping_errors_are_not_board_failures(temp_db):
+    class EmptyBoardScraper(RecruiteeScraper):
+        async def fetch_offers(self, client, board):
+            return []
+
+    def broken_checkpoint(board, seen, added):
+        raise RuntimeError("database is locked")
+
+    failures = []
+    scraper = EmptyBoardScraper(["alive"], known_jobs=KnownJobs("Recruitee", []))
+    scraper.on_board_done = broken_checkpoint
+    scraper.on_board_failed = lambda board, error: failures.append(board)
+    with pytest.raises(RuntimeError):
+        asyncio.run(scraper.fetch_board(None, "alive", scraper.known_jobs))
+    assert failures == []
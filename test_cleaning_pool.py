@@ -0,0 +1,56 @@
+# test_cleaning_pool.py
+import asyncio
+import glob
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.cleaning_pool import CleaningPool
+from agents.scraper.sources.lever_scraper import lever_descriptions
+from utils.html_text import html_to_text
+
+def load_postings() -> list[str]:
+    postings = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "fixtures", "postings", "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            postings.append(f.read())
+    return postings
+
+def test_pool_matches_inline_cleaning_and_keeps_order():
+    payloads = load_postings() * 5
+    pool = CleaningPool(processes=2, chunk_size=4, min_batch=10)
+    try:
+        assert pool.clean(html_to_text, payloads) == [html_to_text(html) for html in payloads]
+        offers = [{"description": html} for html in payloads]
+        cleaned = asyncio.run(pool.clean_async(lever_descriptions, offers))
+        assert cleaned == [lever_descriptions(offer) for offer in offers]
+    finally:
+        pool.close()
+
+    assert pool.stats["pool"].documents == 2 * len(payloads)
+    assert pool.stats["pool"].chunks == 2 * -(-len(payloads) // 4)
+    assert pool.stats["inline"].documents == 0
+    assert pool.report()[0].startswith("process pool (2 workers): 60 descriptions in 16 chunks")
+
+def test_small_batches_and_disabled_pool_stay_inline():
+    payloads = load_postings()
+    for pool in (CleaningPool(processes=2, min_batch=100), CleaningPool(processes=0, min_batch=1)):
+        assert pool.clean(html_to_text, payloads) == [html_to_text(html) for html in payloads]
+        assert pool._executor is None
+        assert pool.stats["inline"].documents == len(payloads)
+        assert [line.split(":")[0] for line in pool.report()] == ["inline"]
+
+def test_reports_cover_only_the_work_after_a_snapshot():
+    payloads = load_postings()
+    pool = CleaningPool(processes=0)
+    pool.clean(html_to_text, payloads)
+    first_run = pool.snapshot()
+    assert pool.report(since=first_run) == []
+    pool.clean(html_to_text, payloads[:2])
+    assert pool.report(since=first_run)[0].startswith("inline: 2 descriptions in 1 chunks")
+    assert pool.report()[0].startswith(f"inline: {len(payloads) + 2} descriptions in 2 chunks")
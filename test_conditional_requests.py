@@ -0,0 +1,54 @@
+# test_conditional_requests.py
+import asyncio
+import os
+import sys
+
+from multidict import CIMultiDict
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_http import HttpResponse
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.sources.greenhouse_scraper import GreenhouseScraper
+
+LIST_URL = "https://api.greenhouse.io/v1/boards/acme/jobs"
+LONG_AGO = "2000-01-01T00:00:00+00:00"
+
+class UnchangedBoardApi:
+    """Answers every listing request with 304 and records the request headers."""
+    def __init__(self):
+        self.headers = []
+
+    async def get(self, url, params=None, headers=None):
+        self.headers.append(headers)
+        return HttpResponse(url, 304, CIMultiDict())
+
+    async def get_json(self, url, params=None, headers=None):
+        raise AssertionError("an unchanged board must not request job content")
+
+def test_not_modified_board_touches_its_jobs_and_stores_nothing(temp_db):
+    jobs = [{"job_url": f"https://boards.greenhouse.io/acme/jobs/{job_id}", "title": f"Job {job_id}", "platform_source": "Greenhouse",
+             "platform_job_id": str(job_id), "source_board": "acme"} for job_id in (1, 2)]
+    db_utils.upsert_jobs(jobs)
+    with db_utils.write_connection() as writer:
+        writer.execute("UPDATE jobs SET last_seen_on_platform = ?", (LONG_AGO,))
+    db_utils.save_http_validators([(LIST_URL, '"list-v1"', None)])
+
+    polls = []
+    scraper = GreenhouseScraper(["acme"], known_jobs=KnownJobs.load("Greenhouse"))
+    scraper.on_board_done = lambda board, seen, added: polls.append((board, seen, added))
+    scraper.http_validators = db_utils.get_http_validators()
+    api = UnchangedBoardApi()
+    assert asyncio.run(scraper.fetch_board(api, "acme", scraper.known_jobs)) == (2, 0)
+
+    assert api.headers == [{"If-None-Match": '"list-v1"'}]
+    assert polls == [("acme", 2, 0)]
+    with db_utils.read_connection() as conn:
+        rows = conn.execute("SELECT job_url, last_seen_on_platform FROM jobs").fetchall()
+    assert len(rows) == 2 and all(row["last_seen_on_platform"] > LONG_AGO for row in rows)
+    assert db_utils.get_http_validators() == {LIST_URL: ('"list-v1"', None)}
@@ -0,0 +1,90 @@
+# test_db_connections.py
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+
+def insert_job(writer, job_id: int):
+    writer.execute("INSERT INTO jobs (job_url, platform_source, title, date_fetched, last_seen_on_platform) "
+                   "VALUES (?, 'Example', 'Engineer', '2024-10-01', '2024-10-01')",
+                   (f"https://jobs.example.com/{job_id}",))
+
+def count_jobs() -> int:
+    with db_utils.read_connection() as reader:
+        return reader.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+def test_connections_use_wal_and_wait_on_locks(temp_db):
+    with db_utils.write_connection() as writer:
+        assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert writer.execute("PRAGMA busy_timeout").fetchone()[0] == db_utils.DB_BUSY_TIMEOUT_MS
+    with db_utils.read_connection() as reader:
+        assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert reader.execute("PRAGMA busy_timeout").fetchone()[0] == db_utils.DB_BUSY_TIMEOUT_MS
+
+def test_readers_see_the_last_commit_while_a_write_is_open(temp_db):
+    with db_utils.write_connection() as writer:
+        insert_job(writer, 1)
+    counts = []
+    with db_utils.write_connection() as writer:
+        insert_job(writer, 2)
+        # Another thread reads without waiting for the writer, and sees only committed rows.
+        reading = threading.Thread(target=lambda: counts.append(count_jobs()))
+        reading.start()
+        reading.join(timeout=5)
+        assert not reading.is_alive()
+    assert counts == [1]
+    assert count_jobs() == 2
+
+def test_readers_are_read_only_and_bounded(temp_db):
+    manager = db_utils.ConnectionManager(temp_db, read_pool_size=2)
+    try:
+        with manager.reader() as first, manager.reader() as second:
+            with pytest.raises(sqlite3.OperationalError):
+                first.execute("DELETE FROM jobs")
+            borrowed = []
+            waiting = threading.Thread(target=lambda: borrowed.append(manager.reader().__enter__()))
+            waiting.start()
+            # Both pooled connections are out, so a third borrower waits for one to come back.
+            waiting.join(timeout=0.2)
+            assert waiting.is_alive() and not borrowed
+        waiting.join(timeout=5)
+        assert borrowed[0] in (first, second)
+        assert manager._reader_count == 2
+    finally:
+        manager.close()
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_connections_are_not_shared_across_a_fork(temp_db):
+    with db_utils.write_connection() as writer:
+        insert_job(writer, 1)
+    parent_manager = db_utils.get_connection_manager()
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            manager = db_utils.get_connection_manager()
+            fresh = manager is not parent_manager and manager.pid == os.getpid()
+            with db_utils.write_connection() as writer:
+                insert_job(writer, 2)
+            os.write(write_end, b"1" if fresh else b"0")
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    _, status = os.waitpid(pid, 0)
+    with os.fdopen(read_end, "rb") as child_output:
+        assert child_output.read() == b"1"
+    assert os.WEXITSTATUS(status) == 0
+    # The parent's own connections still work and see the child's commit.
+    assert db_utils.get_connection_manager() is parent_manager
+    assert count_jobs() == 2
@@ -0,0 +1,135 @@
+# test_db_migrations.py
+import os
+import sys
+import sqlite3
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+
+LEGACY_JOBS_TABLE_SQL = """
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, job_url TEXT NOT NULL UNIQUE, platform_job_id TEXT,
+    platform_source TEXT NOT NULL, company_name TEXT, title TEXT NOT NULL, location TEXT,
+    department TEXT, date_posted_on_platform TEXT, date_fetched TEXT NOT NULL,
+    last_seen_on_platform TEXT NOT NULL, api_provided_description TEXT, full_description_text TEXT,
+    is_relevant BOOLEAN DEFAULT NULL, relevance_score REAL DEFAULT 0.0, tags TEXT, notified_on TEXT DEFAULT NULL
+)
+"""
+
+def query_plan(sql: str, params=()) -> str:
+    with db_utils.read_connection() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "\n".join(row["detail"] for row in rows)
+
+def test_migrations_apply_in_order_and_are_idempotent(empty_db):
+    db_utils.migrate_db()
+    db_utils.migrate_db()
+    with db_utils.read_connection() as conn:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+    assert versions == [version for version, _, _ in db_utils.MIGRATIONS]
+
+def test_legacy_database_is_adopted(empty_db):
+    conn = sqlite3.connect(empty_db)
+    conn.execute(LEGACY_JOBS_TABLE_SQL)
+    conn.execute("INSERT INTO jobs (job_url, platform_source, title, date_fetched, last_seen_on_platform) VALUES ('u', 'X', 't', 'd', 'd')")
+    conn.commit()
+    conn.close()
+
+    db_utils.migrate_db()
+    with db_utils.read_connection() as conn:
+        assert db_utils.get_schema_version(conn) == db_utils.MIGRATIONS[-1][0]
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+
+def test_unprocessed_jobs_query_uses_partial_index(temp_db):
+    plan = query_plan("SELECT id, title FROM jobs WHERE is_relevant IS NULL AND id > ? ORDER BY id LIMIT ?", (0, 200))
+    assert "idx_jobs_unprocessed" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_new_relevant_jobs_query_uses_covering_index_without_sort(temp_db):
+    plan = query_plan("""
+        SELECT title, company_name, location, job_url, relevance_score, tags
+        FROM jobs WHERE is_relevant = 1 AND notified_on IS NULL
+        ORDER BY relevance_score DESC, date_fetched DESC
+    """)
+    assert "COVERING INDEX idx_jobs_pending_notification" in plan
+    assert "TEMP B-TREE" not in plan
+
+def test_platform_job_lookup_uses_index(temp_db):
+    plan = query_plan("SELECT id FROM jobs WHERE platform_source = ? AND platform_job_id = ?", ("Lever", "abc"))
+    assert "idx_jobs_platform_job" in plan
+
+def test_board_touch_uses_index(temp_db):
+    plan = query_plan("SELECT id FROM jobs WHERE platform_source = ? AND source_board = ?", ("Lever", "acme"))
+    assert "idx_jobs_source_board" in plan
+
+def test_http_validators_round_trip(temp_db):
+    db_utils.save_http_validators([("https://a/jobs", '"v1"', None), ("https://b/jobs", None, "Tue, 01 Oct 2024 10:00:00 GMT")])
+    assert db_utils.get_http_validators() == {
+        "https://a/jobs": ('"v1"', None),
+        "https://b/jobs": (None, "Tue, 01 Oct 2024 10:00:00 GMT"),
+    }
+    # A later response without validators clears the entry.
+    db_utils.save_http_validators([("https://a/jobs", None, None)])
+    assert "https://a/jobs" not in db_utils.get_http_validators()
+
+def test_refresh_content_rewrites_unchanged_postings(temp_db):
+    job = {"job_url": "https://a/1", "title": "ML Engineer", "platform_source": "Lever",
+           "date_posted_on_platform": "2024-10-01", "full_description_text": "old"}
+    db_utils.upsert_jobs([job])
+    db_utils.upsert_jobs([{**job, "full_description_text": "new"}])
+    read = "SELECT full_description_text FROM jobs WHERE job_url = 'https://a/1'"
+    with db_utils.read_connection() as conn:
+        assert conn.execute(read).fetchone()[0] == "old"
+    assert db_utils.upsert_jobs([{**job, "full_description_text": "new"}], refresh_content=True) == [("updated", 1)]
+    with db_utils.read_connection() as conn:
+        assert conn.execute(read).fetchone()[0] == "new"
+
+def test_write_helpers_join_the_callers_transaction(temp_db):
+    job = {"job_url": "https://a/1", "title": "ML Engineer", "platform_source": "Lever"}
+    try:
+        with db_utils.write_connection():
+            db_utils.save_scraped_jobs([job], [], source_board="acme")
+            db_utils.save_http_validators([("https://a/jobs", '"v1"', None)])
+            raise RuntimeError("caller failed after the writes")
+    except RuntimeError:
+        pass
+    # Nothing was committed halfway, so the caller's rollback undoes every write.
+    with db_utils.read_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 0
+    assert db_utils.get_http_validators() == {}
+
+def test_failed_upsert_chunk_leaves_the_callers_earlier_writes(temp_db, monkeypatch):
+    with db_utils.write_connection():
+        db_utils.save_http_validators([("https://a/jobs", '"v1"', None)])
+        monkeypatch.setattr(db_utils, "UPSERT_JOB_SQL", "INSERT INTO no_such_table VALUES (?)")
+        assert db_utils.upsert_jobs([{"job_url": "https://a/1", "title": "ML Engineer", "platform_source": "Lever"}]) == [("error", None)]
+    assert db_utils.get_http_validators() == {"https://a/jobs": ('"v1"', None)}
+
+def test_unprocessed_jobs_are_paged_once_while_the_caller_writes(temp_db):
+    def job(number: int, description: str = "original") -> dict:
+        return {"job_url": f"https://a/{number}", "title": f"Job {number}", "platform_source": "Lever",
+                "date_posted_on_platform": description, "full_description_text": description}
+
+    db_utils.upsert_jobs([job(number) for number in range(1, 9)])
+    with db_utils.read_connection() as conn:
+        ids = {row["title"]: row["id"] for row in conn.execute("SELECT id, title FROM jobs")}
+    db_utils.update_job_analysis(ids["Job 8"], False, 0.0, "")
+
+    yielded = []
+    for row in db_utils.iter_unprocessed_jobs(page_size=3):
+        yielded.append((row["title"], row["description_summary"]))
+        # The caller triages everything except Job 2, which it leaves for a later run.
+        if row["title"] != "Job 2":
+            db_utils.update_job_analysis(row["id"], False, 0.0, "")
+        if len(yielded) == 3:
+            # Between pages: another worker triages Job 5, the scraper edits Jobs 2 and 6 and finds Job 9.
+            db_utils.update_job_analysis(ids["Job 5"], True, 0.9, "")
+            db_utils.upsert_jobs([job(2, "edited"), job(6, "edited"), job(9)])
+
+    assert yielded == [("Job 1", "original"), ("Job 2", "original"), ("Job 3", "original"),
+                       ("Job 4", "original"), ("Job 6", "edited"), ("Job 7", "original"), ("Job 9", "original")]
@@ -0,0 +1,76 @@
+# test_greenhouse_content.py
+import asyncio
+import json
+import os
+import sys
+
+from multidict import CIMultiDict
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_http import HttpResponse, HttpStatusError
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.sources.greenhouse_scraper import GreenhouseScraper
+
+BOARD = "acme"
+LIST_URL = f"https://api.greenhouse.io/v1/boards/{BOARD}/jobs"
+
+def listed(job_id: int, updated_at: str = "2024-10-01T10:00:00Z") -> dict:
+    return {"id": job_id, "title": f"Job {job_id}", "absolute_url": f"https://boards.greenhouse.io/{BOARD}/jobs/{job_id}",
+            "location": {"name": "Ghent"}, "departments": [], "updated_at": updated_at}
+
+class FakeGreenhouseApi:
+    """Serves one board's job list (with an ETag) and per-job content; records the detail requests."""
+    def __init__(self, jobs: list[dict], failing_ids: tuple = ()):
+        self.jobs = jobs
+        self.failing_ids = failing_ids
+        self.detail_requests = []
+
+    async def get(self, url, params=None, headers=None):
+        assert url == LIST_URL
+        return HttpResponse(url, 200, CIMultiDict({"ETag": '"list-v1"'}), json.dumps({"jobs": self.jobs}).encode())
+
+    async def get_json(self, url, params=None, headers=None):
+        job_id = int(url.rsplit("/", 1)[-1])
+        self.detail_requests.append(job_id)
+        if job_id in self.failing_ids:
+            raise HttpStatusError(url, 503)
+        return {"id": job_id, "content": "&lt;p&gt;Build &lt;b&gt;models&lt;/b&gt; &amp;amp; tools&lt;/p&gt;",
+                "departments": [{"name": "Data"}], "updated_at": "2024-10-01T10:00:00Z"}
+
+def scrape(api: FakeGreenhouseApi) -> tuple[int, int]:
+    scraper = GreenhouseScraper([BOARD])
+    known_jobs = KnownJobs.load(scraper.platform_source)
+    return asyncio.run(scraper.fetch_board(api, BOARD, known_jobs))
+
+def stored_jobs() -> dict:
+    with db_utils.read_connection() as conn:
+        rows = conn.execute("SELECT platform_job_id, department, full_description_text FROM jobs").fetchall()
+    return {row["platform_job_id"]: dict(row) for row in rows}
+
+def test_content_is_fetched_only_for_new_or_updated_postings(temp_db):
+    api = FakeGreenhouseApi([listed(1), listed(2)])
+    assert scrape(api) == (2, 2)
+    assert sorted(api.detail_requests) == [1, 2]
+    # The content arrives HTML-escaped and is unescaped before cleaning.
+    assert stored_jobs()["1"] == {"platform_job_id": "1", "department": "Data", "full_description_text": "Build models & tools"}
+
+    api = FakeGreenhouseApi([listed(1), listed(2, updated_at="2024-10-05T08:00:00Z"), listed(3)])
+    assert scrape(api) == (3, 1)
+    assert sorted(api.detail_requests) == [2, 3]
+
+def test_failed_content_request_skips_the_posting_and_the_validators(temp_db):
+    api = FakeGreenhouseApi([listed(1), listed(2)], failing_ids=(2,))
+    assert scrape(api) == (1, 1)
+    assert set(stored_jobs()) == {"1"}
+    # Saving the ETag would let a 304 next run hide job 2 for good.
+    assert db_utils.get_http_validators() == {}
+
+    assert scrape(FakeGreenhouseApi([listed(1), listed(2)])) == (2, 1)
+    assert set(stored_jobs()) == {"1", "2"}
+    assert db_utils.get_http_validators() == {LIST_URL: ('"list-v1"', None)}
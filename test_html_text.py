@@ -0,0 +1,62 @@
+# test_html_text.py
+import glob
+import os
+import sys
+
+import pytest
+from bs4 import BeautifulSoup
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import html_text
+from utils.html_text import _streaming_text, html_to_text
+
+POSTINGS = sorted(glob.glob(os.path.join(PROJECT_ROOT, "fixtures", "postings", "*.html")))
+
+EDGE_CASES = [
+    "<p>a<!-- comment --> b</p><script>var x = 1;</script><style>p {}</style>tail",
+    "<template><p>hidden</p></template>after",
+    "plain text &amp; more &lt;tags&gt; &#233;",
+    "<p>a &nbsp; b</p>",
+    "<p>unclosed <b>bold<p>next",
+    "<![CDATA[raw]]><p>after</p>",
+    "<?xml version='1.0' encoding='utf-8'?><p>declared</p>",
+    "<!-- only a comment -->",
+    "<div>x<!--c-->y</div>",
+    "<p>Salary: 50<!-- -->k</p>",
+    "<p>a<?pi data?>b</p>",
+    "<br/>",
+]
+
+def soup_text(html: str, separator: str = " ") -> str:
+    return BeautifulSoup(html, "html.parser").get_text(separator, strip=True)
+
+def read(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+@pytest.mark.parametrize("path", POSTINGS, ids=os.path.basename)
+@pytest.mark.parametrize("separator", [" ", "\n"])
+def test_postings_match_beautifulsoup(path, separator):
+    html = read(path)
+    assert html_to_text(html, separator) == soup_text(html, separator)
+    assert _streaming_text(html, separator) == soup_text(html, separator)
+
+@pytest.mark.parametrize("html", EDGE_CASES)
+def test_edge_cases_match_beautifulsoup(html):
+    assert html_to_text(html) == soup_text(html)
+    assert _streaming_text(html, " ") == soup_text(html)
+
+def test_empty_input():
+    assert html_to_text(None) == ""
+    assert html_to_text("") == ""
+    assert html_to_text("  \n ") == ""
+
+def test_without_lxml_uses_streaming_tokenizer(monkeypatch):
+    monkeypatch.setattr(html_text, "lxml", None)
+    html = read(POSTINGS[0])
+    assert html_to_text(html) == soup_text(html)
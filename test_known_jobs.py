@@ -0,0 +1,69 @@
+# test_known_jobs.py
+import asyncio
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_scraper import AsyncApiScraper, JobRecord
+from agents.scraper.known_jobs import KnownJobs
+
+LONG_AGO = "2000-01-01T00:00:00+00:00"
+
+def job(job_id: int, marker: str, description: str) -> dict:
+    return {"job_url": f"https://jobs.example.com/{job_id}", "platform_job_id": str(job_id), "title": f"Job {job_id}",
+            "platform_source": "Example", "date_posted_on_platform": marker, "full_description_text": description}
+
+def stored(job_id: int) -> dict:
+    with db_utils.read_connection() as conn:
+        row = conn.execute("SELECT date_posted_on_platform, full_description_text, last_seen_on_platform FROM jobs WHERE job_url = ?",
+                           (f"https://jobs.example.com/{job_id}",)).fetchone()
+    return dict(row)
+
+class ExampleScraper(AsyncApiScraper):
+    """Adapts pre-built job dicts; records which postings reach the expensive enrich step."""
+    platform_source = "Example"
+
+    def __init__(self, identifiers, known_jobs=None):
+        super().__init__(identifiers, known_jobs=known_jobs)
+        self.enriched = []
+
+    def adapt(self, offer, board):
+        return JobRecord(**{key: value for key, value in offer.items() if key != "full_description_text"})
+
+    async def enrich(self, client, record, offer, board):
+        self.enriched.append(record.platform_job_id)
+        record.full_description_text = offer["full_description_text"]
+
+def test_unchanged_postings_are_only_touched(temp_db):
+    db_utils.upsert_jobs([job(1, "2024-10-01", "stored"), job(2, "2024-10-01", "stored")])
+    with db_utils.write_connection() as writer:
+        writer.execute("UPDATE jobs SET last_seen_on_platform = ?", (LONG_AGO,))
+
+    known_jobs = KnownJobs.load("Example")
+    assert known_jobs.unchanged_url("1", None, "2024-10-01") == "https://jobs.example.com/1"
+    assert known_jobs.unchanged_url(None, "https://jobs.example.com/1", None) == "https://jobs.example.com/1"
+    assert known_jobs.unchanged_url("1", None, "2024-10-05") is None
+    assert known_jobs.unchanged_url("3", "https://jobs.example.com/3", "2024-10-01") is None
+
+    scraper = ExampleScraper(["board"], known_jobs=known_jobs)
+    offers = [job(1, "2024-10-01", "listed again"), job(2, "2024-10-05", "edited"), job(3, "2024-10-05", "new")]
+    assert asyncio.run(scraper.process_offers(None, offers, "board", known_jobs)) == (3, 1)
+    assert scraper.enriched == ["2", "3"]
+    # The unchanged posting keeps its content and is marked as seen.
+    assert stored(1)["full_description_text"] == "stored" and stored(1)["last_seen_on_platform"] > LONG_AGO
+    assert stored(2)["full_description_text"] == "edited"
+
+def test_upsert_refreshes_content_when_the_marker_changes(temp_db):
+    assert db_utils.upsert_jobs([job(1, "2024-10-01", "first")]) == [("inserted", 1)]
+    # Same marker: only last_seen_on_platform moves.
+    assert db_utils.upsert_jobs([job(1, "2024-10-01", "ignored")]) == [("updated", 1)]
+    assert stored(1)["full_description_text"] == "first"
+    assert db_utils.upsert_jobs([job(1, "2024-10-05", "second")]) == [("updated", 1)]
+    assert stored(1)["date_posted_on_platform"] == "2024-10-05"
+    assert stored(1)["full_description_text"] == "second"
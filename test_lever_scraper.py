@@ -1,11 +1,11 @@
 import os
 from dotenv import load_dotenv
-from utils.db_utils import create_jobs_table_if_not_exist, get_db_connection
+from utils.db_utils import migrate_db, get_db_connection
 from utils.source_config_loader import load_job_sources
 from agents.scraper.sources.lever_scraper import LeverScraper
 
 load_dotenv()
-create_jobs_table_if_not_exist()
+migrate_db()
 
 config = load_job_sources()
 test_companies = config.get("lever_companies", [])
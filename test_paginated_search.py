@@ -0,0 +1,102 @@
+# test_paginated_search.py
+import asyncio
+import os
+import sys
+
+import aiohttp
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.response_archive import ArchiveMiss
+from agents.scraper.sources.adzuna_scraper import AdzunaScraper
+from agents.scraper.sources.join_scraper import JoinScraper
+from agents.scraper.sources.jsearch_scraper import JsearchScraper
+
+CONFIG = {"what": "ai engineer", "where": "ghent", "country_code": "be"}
+
+def offer(job_id: int) -> dict:
+    return {"id": str(job_id), "redirect_url": f"https://www.adzuna.be/details/{job_id}", "title": f"Job {job_id}"}
+
+class FakeSearchApi:
+    """Serves Adzuna result pages (newest first) and records which pages were requested."""
+    def __init__(self, pages: list[list[dict]], errors: dict | None = None):
+        self.pages = pages
+        self.errors = errors or {}
+        self.requested = []
+
+    async def get_json(self, url, params=None, headers=None):
+        page = int(url.rsplit("/", 1)[-1])
+        self.requested.append(page)
+        assert params["sort_by"] == "date"
+        if page in self.errors:
+            raise self.errors[page]
+        return {"results": self.pages[page - 1] if page <= len(self.pages) else []}
+
+def known(*job_ids: int) -> KnownJobs:
+    return KnownJobs("Adzuna", [
+        {"job_url": f"https://www.adzuna.be/details/{job_id}", "platform_job_id": str(job_id), "date_posted_on_platform": None}
+        for job_id in job_ids
+    ])
+
+def walk(pages: list[list[dict]], known_jobs: KnownJobs, page_size: int = 3, errors: dict | None = None,
+         scraper: AdzunaScraper | None = None) -> tuple[list[str], list[int]]:
+    scraper = scraper or AdzunaScraper([CONFIG], known_jobs=known_jobs)
+    scraper.page_size, scraper.max_pages, scraper.page_concurrency = page_size, 10, 2
+    api = FakeSearchApi(pages, errors)
+    offers = asyncio.run(scraper.fetch_pages(api, CONFIG, known_jobs))
+    return [o["id"] for o in offers], sorted(api.requested)
+
+def test_steady_state_costs_one_page():
+    pages = [[offer(9), offer(8), offer(7)], [offer(6), offer(5), offer(4)]]
+    assert walk(pages, known(*range(1, 10))) == (["9", "8", "7"], [1])
+
+def test_walks_until_a_page_of_known_jobs():
+    pages = [[offer(12), offer(11), offer(10)], [offer(9), offer(8), offer(7)], [offer(6), offer(5), offer(4)], [offer(3)]]
+    ids, requested = walk(pages, known(*range(1, 10)))
+    # Page 3 was requested alongside page 2 but is not needed once page 2 is all known.
+    assert ids == ["12", "11", "10", "9", "8", "7"]
+    assert requested == [1, 2, 3]
+
+def test_walks_to_the_last_page_and_skips_shifted_duplicates():
+    # A posting published mid-walk pushes job 7 from page 2 onto page 3 as well.
+    pages = [[offer(9), offer(8), offer(7)], [offer(7), offer(6), offer(5)], [offer(4), offer(3), offer(2)], [offer(1)]]
+    ids, requested = walk(pages, known())
+    assert ids == [str(job_id) for job_id in range(9, 0, -1)]
+    assert requested == [1, 2, 3, 4, 5]
+
+def test_a_failed_page_keeps_the_pages_before_it():
+    pages = [[offer(9), offer(8), offer(7)], [offer(6), offer(5), offer(4)], [offer(3), offer(2), offer(1)]]
+    scraper = AdzunaScraper([CONFIG], known_jobs=known())
+    board_key = scraper.board_key(CONFIG)
+    scraper._pending_validators[board_key] = [("page-1", '"v1"', None)]
+    ids, requested = walk(pages, known(), errors={2: aiohttp.ClientConnectionError("reset")}, scraper=scraper)
+    assert ids == ["9", "8", "7"]
+    assert requested == [1, 2, 3]
+    # The board was read only in part, so its validators must not be saved.
+    assert board_key not in scraper._pending_validators
+
+def test_a_replay_stops_where_the_recorded_run_stopped():
+    pages = [[offer(9), offer(8), offer(7)], [offer(6), offer(5), offer(4)], [offer(3), offer(2), offer(1)]]
+    ids, requested = walk(pages, known(), errors={3: ArchiveMiss("page 3 was not recorded")})
+    assert ids == ["9", "8", "7", "6", "5", "4"]
+    assert requested == [1, 2, 3]
+
+def test_paginated_sources_do_not_send_conditional_requests():
+    # A 304 on a later page would hide its offers without touching them.
+    for scraper_class in (AdzunaScraper, JoinScraper, JsearchScraper):
+        assert scraper_class.max_pages > 1 and not scraper_class.conditional_requests
+
+def test_page_requests_of_each_source():
+    adzuna = AdzunaScraper([CONFIG])
+    url, params, _ = adzuna.build_page_request(CONFIG, 3)
+    assert url.endswith("/be/search/3") and params["results_per_page"] == adzuna.page_size
+    _, params, _ = JoinScraper([{"query": "ai"}]).build_page_request({"query": "ai"}, 2)
+    assert params["page"] == 2
+    jsearch = JsearchScraper(["AI Engineer in Belgium"])
+    assert "page" not in jsearch.build_page_request("AI Engineer in Belgium", 1)[1]
+    assert jsearch.build_page_request("AI Engineer in Belgium", 2)[1]["page"] == "2"
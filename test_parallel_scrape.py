@@ -0,0 +1,74 @@
+# test_parallel_scrape.py
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper import http_client, scraper_agent
+from agents.scraper.http_client import HostLimiter, host_slot
+
+class ConcurrencyTracker:
+    """Counts units and requests in flight, overall and per host, and keeps the peaks."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peaks = {}
+
+    @contextmanager
+    def running(self, key: str):
+        with self.lock:
+            self.active[key] = self.active.get(key, 0) + 1
+            self.peaks[key] = max(self.peaks.get(key, 0), self.active[key])
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active[key] -= 1
+
+def stub_scraper(name: str, host: str, tracker: ConcurrencyTracker, per_board_units: bool = True) -> type:
+    class StubScraper:
+        """Fetches each board with one slow request to `host`; every board has 3 jobs, 1 of them new."""
+        def __init__(self, identifiers, known_jobs=None):
+            self.identifiers = identifiers
+
+        def fetch_jobs(self):
+            with tracker.running("units"):
+                for board in self.identifiers:
+                    with host_slot(f"https://{host}/{board}"), tracker.running(host):
+                        time.sleep(0.05)
+            return 3 * len(self.identifiers), len(self.identifiers)
+
+    StubScraper.__name__ = name
+    StubScraper.per_board_units = per_board_units
+    return StubScraper
+
+def test_units_overlap_within_the_per_host_cap_and_totals_add_up(temp_db, monkeypatch, capsys):
+    tracker = ConcurrencyTracker()
+    scrapers = {
+        "BusyHost": stub_scraper("BusyHost", "busy.example.com", tracker),
+        "QuietHost": stub_scraper("QuietHost", "quiet.example.com", tracker),
+        "WholeSource": stub_scraper("WholeSource", "whole.example.com", tracker, per_board_units=False),
+    }
+    for source_name, scraper_class in scrapers.items():
+        monkeypatch.setitem(scraper_agent.SCRAPER_REGISTRY, source_name, f"unused:{source_name}")
+        monkeypatch.setitem(scraper_agent._scraper_classes, source_name, scraper_class)
+    monkeypatch.setattr(http_client, "_host_limiter", HostLimiter(per_host_limit=2))
+
+    sources = {"BusyHost": [f"busy-{i}" for i in range(6)], "QuietHost": ["quiet-1", "quiet-2"], "WholeSource": ["a", "b", "c"]}
+    scraper_agent.ScraperAgent(max_workers=5)._run_sources(sources)
+
+    # Units of different sources ran side by side, but no host ever saw more than its cap.
+    assert tracker.peaks["units"] > 2
+    assert tracker.peaks["busy.example.com"] == 2
+    assert tracker.peaks["quiet.example.com"] <= 2
+    assert tracker.peaks["whole.example.com"] == 1
+    totals = dict(re.findall(r"^  (\w+): (Seen \d+, Added \d+)$", capsys.readouterr().out, re.MULTILINE))
+    assert totals == {"BusyHost": "Seen 18, Added 6", "QuietHost": "Seen 6, Added 2", "WholeSource": "Seen 9, Added 3"}
@@ -0,0 +1,61 @@
+# test_payload_descriptions.py
+import asyncio
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper import page_text
+from agents.scraper.async_scraper import JobRecord
+from agents.scraper.page_text import PageTextFallback
+from agents.scraper.sources.lever_scraper import LeverScraper, lever_description_text
+from agents.scraper.sources.recruitee_scraper import RecruiteeScraper, recruitee_description_text
+
+def test_lever_description_combines_plain_text_lists_and_additional():
+    offer = {
+        "descriptionPlain": "We build ordering software.",
+        "description": "<div>ignored when the plain text exists</div>",
+        "lists": [
+            {"text": "What you'll do", "content": "<li>Ship models</li><li>Own evaluation</li>"},
+            {"text": "Empty", "content": ""},
+        ],
+        "additional": "<div>Hybrid in <b>Ghent</b></div>",
+    }
+    assert lever_description_text(offer) == (
+        "We build ordering software.\n\nWhat you'll do\nShip models\nOwn evaluation\n\nHybrid in Ghent"
+    )
+
+def test_lever_description_falls_back_to_html_fields():
+    assert lever_description_text({"description": "<p>Hello <b>world</b></p>"}) == "Hello world"
+    assert lever_description_text({}) == ""
+
+def test_recruitee_description_includes_requirements():
+    offer = {"description": "<p>Join our team.</p>", "requirements": "<ul><li>Python</li></ul>"}
+    assert recruitee_description_text(offer) == "Join our team.\n\nPython"
+    assert recruitee_description_text({"description": "", "requirements": None}) == ""
+
+def test_empty_payloads_fall_back_to_the_hosted_page(monkeypatch):
+    downloads = []
+
+    def fake_download(self, url):
+        downloads.append(url)
+        return "Text extracted from the page"
+
+    async def no_wait(url):
+        pass
+
+    monkeypatch.setattr(PageTextFallback, "_fetch_full_text_newspaper3k", fake_download)
+    monkeypatch.setattr(page_text.rate_limiter, "wait_async", no_wait)
+    for scraper in (LeverScraper(["acme"]), RecruiteeScraper(["acme"])):
+        described = JobRecord("https://jobs.example.com/1", "ML Engineer", scraper.platform_source,
+                              api_provided_description="Short", full_description_text="Full text")
+        empty = JobRecord("https://jobs.example.com/2", "ML Engineer", scraper.platform_source, api_provided_description="")
+        asyncio.run(scraper.enrich(None, described, {}, "acme"))
+        asyncio.run(scraper.enrich(None, empty, {}, "acme"))
+        assert described.full_description_text == "Full text"
+        assert empty.full_description_text == "Text extracted from the page"
+    assert downloads == ["https://jobs.example.com/2"] * 2
@@ -0,0 +1,83 @@
+# test_personio_feed.py
+import io
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.sources import personio_scraper
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.sources.personio_scraper import PersonioScraper, iter_feed_positions
+
+FEED_PATH = os.path.join(PROJECT_ROOT, "fixtures", "personio", "feed.xml")
+
+def test_positions_are_yielded_with_their_fields():
+    with open(FEED_PATH, "rb") as feed:
+        positions = list(iter_feed_positions(feed))
+    assert [position["id"] for position in positions] == ["1423", "1587", "1601"]
+    assert positions[0]["name"] == "Machine Learning Engineer (m/w/d)"
+    assert positions[0]["office"] == "Berlin"
+    assert positions[0]["creationDate"] == "2024-09-02T09:15:00+00:00"
+    # Only the first job description is kept, as raw HTML.
+    assert positions[0]["description_html"] == "<p>Train and ship <strong>ranking models</strong>.</p>"
+    assert positions[1]["office"] == "München"
+    assert positions[2]["description_html"] == ""
+
+def test_finished_positions_are_cleared_from_the_tree(monkeypatch):
+    # Record the partial tree's size each time a position is handed out.
+    roots, sizes = [], []
+    real_iterparse = ET.iterparse
+
+    def spying_iterparse(source, events):
+        for event, element in real_iterparse(source, events):
+            if not roots:
+                roots.append(element)
+            if event == "end" and element.tag == "position":
+                sizes.append(len(roots[0]))
+            yield event, element
+
+    monkeypatch.setattr(personio_scraper.ET, "iterparse", spying_iterparse)
+    feed = b"<workzag-jobs>" + b"".join(
+        b"<position><id>%d</id><name>Job %d</name></position>" % (i, i) for i in range(5000)
+    ) + b"</workzag-jobs>"
+    assert sum(1 for _ in iter_feed_positions(io.BytesIO(feed))) == 5000
+    # The parser reads ahead one buffer at a time, so the tree never holds more than that.
+    assert max(sizes) < 500
+    assert len(roots[0]) == 0
+
+class FakeFeedResponse:
+    def __init__(self, body: bytes):
+        self.raw = io.BytesIO(body)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+def test_bookkeeping_errors_are_not_feed_failures(temp_db, monkeypatch):
+    with open(FEED_PATH, "rb") as feed:
+        body = feed.read()
+    monkeypatch.setattr(personio_scraper, "http_get", lambda url, **kwargs: FakeFeedResponse(body))
+    failures = []
+
+    def broken_checkpoint(company_id, seen, added):
+        raise RuntimeError("database is locked")
+
+    scraper = PersonioScraper(["acme"], known_jobs=KnownJobs("Personio", []))
+    scraper.on_board_done = broken_checkpoint
+    scraper.on_board_failed = lambda company_id, error: failures.append(company_id)
+    with pytest.raises(RuntimeError):
+        scraper.fetch_jobs()
+    # The feed itself was stored, so the circuit breaker must not count it as failed.
+    assert failures == []
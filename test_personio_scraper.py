@@ -14,7 +14,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --- End Setup ---
 
-from utils.db_utils import create_jobs_table_if_not_exist, get_db_connection
+from utils.db_utils import migrate_db, get_db_connection
 from agents.scraper.sources.personio_scraper import PersonioScraper
 
 def load_config(config_path="config/job_sources.yml"):
@@ -32,7 +32,7 @@ def load_config(config_path="config/job_sources.yml"):
 
 if __name__ == "__main__":
     # Ensure pyyaml is installed: pip install pyyaml
-    create_jobs_table_if_not_exist()
+    migrate_db()
 
     config = load_config()
     test_companies = config.get("Personio", [])
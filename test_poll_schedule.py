@@ -0,0 +1,110 @@
+# test_poll_schedule.py
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.checkpoints import board_checkpoint_key
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.sources.join_scraper import JoinScraper
+from agents.scraper.poll_schedule import PollSchedule, backoff_interval_hours, level_for_churn, max_backoff_level, next_backoff_level
+
+NOW = datetime.now(timezone.utc)
+
+def insert_job(url: str, board: str, fetched: datetime, last_seen: datetime):
+    with db_utils.write_connection() as writer:
+        writer.execute(
+            """
+            INSERT INTO jobs (job_url, platform_source, source_board, title, date_fetched, last_seen_on_platform)
+            VALUES (?, 'Greenhouse', ?, 'Engineer', ?, ?)
+            """,
+            (url, board, fetched.isoformat(), last_seen.isoformat())
+        )
+
+def test_backoff_doubles_to_the_cap_and_changes_halve_it():
+    assert [backoff_interval_hours(level, 6, 168) for level in range(7)] == [0, 6, 12, 24, 48, 96, 168]
+    top = max_backoff_level(6, 168)
+    assert top == 6
+    assert next_backoff_level(top, changed=False, top_level=top) == top
+    assert next_backoff_level(5, changed=True, top_level=top) == 2
+    assert next_backoff_level(1, changed=True, top_level=top) == 0
+    # A board that changes every day is polled about twice a day; one that never changes backs off fully.
+    assert backoff_interval_hours(level_for_churn(90, 90 * 24, 6, 168), 6, 168) == 12
+    assert level_for_churn(0, 90 * 24, 6, 168) == top
+
+def test_quiet_boards_back_off_and_busy_boards_stay_due(temp_db):
+    schedule = PollSchedule(base_hours=6, max_hours=168)
+    assert schedule.due("Greenhouse", ["quiet", "busy"]) == ["quiet", "busy"]
+    schedule.board_polled("Greenhouse", "quiet", 10, 0)
+    schedule.board_polled("Greenhouse", "busy", 10, 10)
+
+    # Neither board had stored history before its first poll, so both start at every run.
+    rows = db_utils.get_board_schedules("Greenhouse")
+    assert rows[("Greenhouse", "quiet")]["backoff_level"] == 0
+    assert rows[("Greenhouse", "busy")]["changes"] == 1
+
+    second = PollSchedule(base_hours=6, max_hours=168)
+    assert second.due("Greenhouse", ["quiet", "busy"]) == ["quiet", "busy"]
+    second.board_polled("Greenhouse", "quiet", 10, 0)
+    second.board_polled("Greenhouse", "busy", 10, 2)
+
+    third = PollSchedule(base_hours=6, max_hours=168)
+    assert third.due("Greenhouse", ["quiet", "busy"]) == ["busy"]
+    later = PollSchedule(base_hours=6, max_hours=168, now=NOW + timedelta(hours=6))
+    assert later.due("Greenhouse", ["quiet", "busy"]) == ["quiet", "busy"]
+
+def test_first_poll_is_seeded_from_job_history(temp_db):
+    # A board harvested 80 days ago that gained one job and lost one since.
+    first_fetch = NOW - timedelta(days=80)
+    insert_job("https://example.com/1", "slow", first_fetch, NOW)
+    insert_job("https://example.com/2", "slow", first_fetch, NOW - timedelta(days=40))
+    insert_job("https://example.com/3", "slow", NOW - timedelta(days=20), NOW)
+    churn = db_utils.get_board_churn("Greenhouse", "slow", (NOW - timedelta(days=90)).isoformat())
+    assert (churn["total"], churn["inserted"], churn["closed"]) == (3, 1, 1)
+
+    schedule = PollSchedule(base_hours=6, max_hours=168)
+    schedule.due("Greenhouse", ["slow"])
+    schedule.board_polled("Greenhouse", "slow", 2, 0)
+    assert db_utils.get_board_schedules("Greenhouse")[("Greenhouse", "slow")]["backoff_level"] == level_for_churn(2, 90 * 24, 6, 168)
+    assert PollSchedule(base_hours=6, max_hours=168).due("Greenhouse", ["slow"]) == []
+
+def test_dict_configured_boards_are_seeded_from_their_stored_jobs(temp_db):
+    config = {"query": "ai engineer", "country_code": "de"}
+    offers = [{"id": job_id, "title": "AI Engineer", "company": {"slug": "acme", "name": "Acme"}} for job_id in (1, 2)]
+    scraper = JoinScraper([config])
+    asyncio.run(scraper.process_offers(None, offers, config, KnownJobs("JOIN.com", [])))
+    # One of the two postings was harvested long ago, so the board has some history.
+    with db_utils.write_connection() as writer:
+        writer.execute("UPDATE jobs SET date_fetched = ? WHERE platform_job_id = '1'", ((NOW - timedelta(days=80)).isoformat(),))
+
+    board_key = board_checkpoint_key(config)
+    churn = db_utils.get_board_churn("JOIN.com", board_key, (NOW - timedelta(days=90)).isoformat())
+    assert (churn["total"], churn["inserted"]) == (2, 1)
+    schedule = PollSchedule(base_hours=6, max_hours=168)
+    schedule.due("JOIN.com", [config])
+    schedule.board_polled("JOIN.com", config, 2, 0)
+    level = db_utils.get_board_schedules("JOIN.com")[("JOIN.com", board_key)]["backoff_level"]
+    assert level == level_for_churn(1, 90 * 24, 6, 168) > 0
+
+def test_pinned_interval_overrides_the_adaptive_schedule(temp_db):
+    schedule = PollSchedule(base_hours=6, max_hours=168)
+    schedule.due("Lever", ["acme"])
+    schedule.board_polled("Lever", "acme", 5, 0)
+    for _ in range(3):
+        schedule = PollSchedule(base_hours=6, max_hours=168, now=NOW + timedelta(days=30))
+        schedule.due("Lever", ["acme"])
+        schedule.board_polled("Lever", "acme", 5, 0)
+    assert PollSchedule(base_hours=6, max_hours=168).due("Lever", ["acme"]) == []
+
+    db_utils.set_board_poll_override("Lever", "acme", 0)
+    assert PollSchedule(base_hours=6, max_hours=168).due("Lever", ["acme"]) == ["acme"]
+    db_utils.set_board_poll_override("Lever", "acme", None)
+    assert PollSchedule(base_hours=6, max_hours=168).due("Lever", ["acme"]) == []
+    assert PollSchedule(enabled=False).due("Lever", ["acme"]) == ["acme"]
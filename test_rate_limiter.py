@@ -0,0 +1,39 @@
+# test_rate_limiter.py
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.rate_limiter import RateLimiter, TokenBucket, parse_rate_limits, parse_retry_after
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=2.0, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.45 < waits[3] <= 0.5
+    assert 0.95 < waits[4] <= 1.0
+
+def test_unrelated_hosts_do_not_share_a_bucket():
+    limiter = RateLimiter({"lever.co": (1.0, 1)}, default_rate=1.0, default_burst=1)
+    assert limiter.reserve("https://jobs.lever.co/acme/1") == 0.0
+    assert limiter.reserve("https://api.lever.co/v0/postings/acme") > 0.9
+    assert limiter.reserve("https://acme.recruitee.com/o/dev") == 0.0
+
+def test_retry_after_blocks_the_host():
+    limiter = RateLimiter({}, default_rate=100.0, default_burst=10)
+    assert limiter.retry_after("https://boards.greenhouse.io/x", "3") == 3.0
+    assert 2.9 < limiter.reserve("https://api.greenhouse.io/v1/boards/x/jobs") <= 3.0
+    assert limiter.reserve("https://join.com/api") == 0.0
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after(None, default=4) == 4
+    assert parse_retry_after("soon", default=4) == 4
+
+def test_parse_rate_limits_skips_malformed_entries():
+    assert parse_rate_limits("lever.co=0.5:2, Recruitee.com=1, bad") == {"lever.co": (0.5, 2), "recruitee.com": (1.0, 1)}
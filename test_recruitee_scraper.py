@@ -15,13 +15,13 @@ if "utils" not in sys.path:
     sys.path.insert(0, os.path.join(PROJECT_ROOT, "utils"))
 
 # --- Imports ---
-from utils.db_utils import create_jobs_table_if_not_exist, get_db_connection
+from utils.db_utils import migrate_db, get_db_connection
 from agents.scraper.sources.recruitee_scraper import RecruiteeScraper
 from utils.source_config_loader import load_job_sources
 
 # --- Main ---
 if __name__ == "__main__":
-    create_jobs_table_if_not_exist()
+    migrate_db()
 
     config = load_job_sources("config/job_sources.yml")
     test_companies = config.get("recruitee_companies", [])
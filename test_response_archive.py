@@ -0,0 +1,119 @@
+# test_response_archive.py
+import asyncio
+import io
+import os
+import sys
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_http import AsyncHttpClient
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.response_archive import ArchiveMiss, ResponseArchive, archive_key, replayed_requests_response, response_archive
+from agents.scraper.sources.lever_scraper import LeverScraper
+from agents.scraper.sources.personio_scraper import iter_feed_positions
+from agents.scraper.sources.wttj_scraper import WelcomeToTheJungleScraper
+
+FEED_PATH = os.path.join(PROJECT_ROOT, "fixtures", "personio", "feed.xml")
+
+class FakeRaw(io.BytesIO):
+    """Stands in for urllib3's response: read() takes decode_content like HTTPResponse.read."""
+    def read(self, amt=None, decode_content=None):
+        return super().read(amt)
+
+def test_keys_leave_out_credentials():
+    key = archive_key("https://api.adzuna.com/v1/api/jobs/be/search/1", {"app_key": "secret", "what": "ai", "app_id": "x", "where": None})
+    assert key == "https://api.adzuna.com/v1/api/jobs/be/search/1?what=ai"
+
+def test_record_then_replay_through_the_async_client(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+    url = "https://boards-api.greenhouse.io/v1/boards/acme/jobs"
+    body = b'{"jobs": [{"id": 1}]}'
+    with archive.session("record", sources={"Greenhouse": ["acme"]}) as run_id:
+        archive.record(archive_key(url), 200, {"ETag": '"v1"', "Content-Type": "application/json"}, body)
+        # Identical bodies of another request share one blob.
+        archive.record(archive_key(url, {"page": 2}), 200, {}, body)
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+    assert archive.run_sources(run_id) == {"Greenhouse": ["acme"]}
+
+    async def replay():
+        # No session is opened while replaying, so nothing can reach the network.
+        async with AsyncHttpClient(archive=archive) as client:
+            response = await client.get(url)
+            with pytest.raises(ArchiveMiss):
+                await client.get("https://boards-api.greenhouse.io/v1/boards/other/jobs")
+            return response
+
+    with archive.session("replay", run_id):
+        response = asyncio.run(replay())
+    assert (response.status, response.headers["ETag"], response.json()) == (200, '"v1"', {"jobs": [{"id": 1}]})
+    assert not archive.replaying
+
+def test_streamed_feed_is_archived_while_parsed_and_replays_as_a_stream(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+    url = "https://acme.jobs.personio.de/xml"
+    with open(FEED_PATH, "rb") as f:
+        feed = f.read()
+
+    with archive.session("record") as run_id:
+        tee = archive.tee(FakeRaw(feed), archive_key(url), 200, {"Content-Type": "application/xml"})
+        live = list(iter_feed_positions(tee))
+        tee.close()
+
+    with archive.session("replay", run_id):
+        response = replayed_requests_response(url, archive.lookup(archive_key(url)), stream=True)
+        with response:
+            replayed = list(iter_feed_positions(response.raw))
+    assert replayed == live and live
+
+def test_partially_read_streams_are_not_archived(tmp_path):
+    archive = ResponseArchive(str(tmp_path))
+    with archive.session("record") as run_id:
+        tee = archive.tee(FakeRaw(b"<feed>" * 100), "https://acme.jobs.personio.de/xml", 200, {})
+        tee.read(10)
+        tee.close()
+    assert not os.path.exists(os.path.join(archive.run_dir(run_id), "responses.jsonl"))
+    assert not list((tmp_path / "objects").rglob("*.tmp"))
+    with pytest.raises(FileNotFoundError):
+        with archive.session("replay", run_id):
+            pass
+
+def stored_descriptions() -> dict:
+    with db_utils.read_connection() as conn:
+        return {row["job_url"]: row["full_description_text"] for row in conn.execute("SELECT job_url, full_description_text FROM jobs")}
+
+def test_wttj_replay_keeps_descriptions_of_unvisited_detail_pages(temp_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(response_archive, "root", str(tmp_path))
+    urls = ["https://www.welcometothejungle.com/en/companies/acme/jobs/cv-engineer",
+            "https://www.welcometothejungle.com/en/companies/acme/jobs/nlp-engineer"]
+    jobs = [{"job_url": url, "title": "Engineer", "platform_source": "WelcomeToTheJungle", "date_posted_on_platform": "2024-09-30",
+             "api_provided_description": "Short search summary.", "full_description_text": "Short search summary."} for url in urls]
+    db_utils.upsert_jobs([{**job, "full_description_text": "Full description from the detail page."} for job in jobs])
+    # The recorded run only visited the second posting's detail page.
+    with response_archive.session("record") as run_id:
+        response_archive.record(urls[1], 200, {"Content-Type": "text/html"}, b"<div><p>Rewritten</p><p>description</p></div>")
+
+    with response_archive.session("replay", run_id):
+        assert asyncio.run(WelcomeToTheJungleScraper([])._fetch_details_and_save(None, jobs, [])) == (2, 0)
+    assert stored_descriptions() == {urls[0]: "Full description from the detail page.", urls[1]: "Rewritten\ndescription"}
+
+def test_lever_replay_keeps_page_text_of_empty_payloads(temp_db, tmp_path, monkeypatch):
+    monkeypatch.setattr(response_archive, "root", str(tmp_path))
+    offers = [{"id": job_id, "text": "ML Engineer", "hostedUrl": f"https://jobs.lever.co/acme/{job_id}", "createdAt": 1727769600000,
+               "descriptionPlain": description} for job_id, description in (("1", ""), ("2", "Payload description"))]
+    db_utils.upsert_jobs([{"job_url": offer["hostedUrl"], "title": "ML Engineer", "platform_source": "Lever",
+                           "date_posted_on_platform": "2024-10-01T08:00:00+00:00", "full_description_text": "Text of the hosted page"} for offer in offers])
+    with response_archive.session("record") as run_id:
+        response_archive.record("https://api.lever.co/v0/postings/acme?mode=json", 200, {}, b"[]")
+
+    scraper = LeverScraper(["acme"])
+    with response_archive.session("replay", run_id):
+        asyncio.run(scraper.process_offers(None, offers, "acme", KnownJobs("Lever", [])))
+    assert stored_descriptions() == {"https://jobs.lever.co/acme/1": "Text of the hosted page",
+                                     "https://jobs.lever.co/acme/2": "Payload description"}
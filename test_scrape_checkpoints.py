@@ -0,0 +1,65 @@
+# test_scrape_checkpoints.py
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.checkpoints import ScrapeCheckpoints, board_checkpoint_key
+
+WTTJ_CONFIG = {"query": "ai", "country": "FR"}
+
+def run_status(run_id: str) -> str:
+    with db_utils.read_connection() as conn:
+        return conn.execute("SELECT status FROM scrape_runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+
+def test_resumed_run_skips_completed_boards(temp_db):
+    interrupted = ScrapeCheckpoints.start("Greenhouse", freshness_hours=0)
+    interrupted.board_done("Greenhouse", "acme", 12, 3)
+    interrupted.board_done("WTTJ", WTTJ_CONFIG, 5, 5)
+    # The process dies here: finish() is never called.
+
+    resumed = ScrapeCheckpoints.start("Greenhouse", resume=True, freshness_hours=0)
+    assert resumed.run_id == interrupted.run_id and resumed.resumed
+    assert resumed.pending("Greenhouse", ["acme", "globex"]) == ["globex"]
+    assert resumed.pending("WTTJ", [{"country": "FR", "query": "ai"}, {"query": "ml"}]) == [{"query": "ml"}]
+
+    resumed.finish()
+    assert run_status(resumed.run_id) == "finished"
+    # Nothing is left to resume, so the next run starts from scratch.
+    fresh = ScrapeCheckpoints.start("Greenhouse", resume=True, freshness_hours=0)
+    assert fresh.run_id != interrupted.run_id
+    assert fresh.pending("Greenhouse", ["acme", "globex"]) == ["acme", "globex"]
+
+def test_runs_without_resume_supersede_the_interrupted_one(temp_db):
+    interrupted = ScrapeCheckpoints.start(None, freshness_hours=0)
+    other_target = ScrapeCheckpoints.start("Lever", freshness_hours=0)
+    fresh = ScrapeCheckpoints.start(None, freshness_hours=0)
+    assert run_status(interrupted.run_id) == "abandoned"
+    assert run_status(other_target.run_id) == "running"
+    assert fresh.pending("Greenhouse", ["acme"]) == ["acme"]
+
+def test_stale_runs_are_abandoned_instead_of_resumed(temp_db):
+    db_utils.start_scrape_run("20200101T000000Z-dead", "Greenhouse")
+    with db_utils.write_connection() as writer:
+        writer.execute("UPDATE scrape_runs SET started_at = '2020-01-01T00:00:00+00:00'")
+    resumed = ScrapeCheckpoints.start("Greenhouse", resume=True, resume_max_age_hours=24)
+    assert not resumed.resumed
+    assert run_status("20200101T000000Z-dead") == "abandoned"
+
+def test_freshness_window_skips_boards_completed_by_any_run(temp_db):
+    earlier = ScrapeCheckpoints.start(None, freshness_hours=6)
+    earlier.board_done("Lever", "acme", 4, 0)
+    earlier.finish()
+
+    later = ScrapeCheckpoints.start(None, freshness_hours=6)
+    assert later.pending("Lever", ["acme", "globex"]) == ["globex"]
+    assert ScrapeCheckpoints(later.run_id, freshness_hours=0).pending("Lever", ["acme"]) == ["acme"]
+
+def test_checkpoint_keys_are_stable_for_dict_configs():
+    assert board_checkpoint_key("acme") == "acme"
+    assert board_checkpoint_key({"b": 1, "a": 2}) == board_checkpoint_key({"a": 2, "b": 1})
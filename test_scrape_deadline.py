@@ -0,0 +1,136 @@
+# test_scrape_deadline.py
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.deadline import BudgetExceeded, RunDeadline
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.poll_schedule import PollSchedule
+from agents.scraper import scraper_agent
+from agents.scraper.checkpoints import ScrapeCheckpoints
+from agents.scraper.circuit_breaker import CircuitBreaker
+from agents.scraper.sources.greenhouse_scraper import GreenhouseScraper
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_budgets_are_bounded_by_board_source_and_run():
+    clock = FakeClock()
+    deadline = RunDeadline(minutes=10, source_share=0.5, board_budget_seconds=120, clock=clock)
+    budget = deadline.source_budget("Personio")
+    assert budget.board_timeout() == 120
+    clock.now += 250
+    # Five minutes for the source, of which 250 s are gone.
+    assert budget.board_timeout() == 50
+    board_ends_at = budget.board_ends_at()
+    budget.check(board_ends_at)
+    clock.now += 51
+    with pytest.raises(BudgetExceeded):
+        budget.check(board_ends_at)
+    assert budget.expired() and not deadline.expired()
+    assert RunDeadline(minutes=0, board_budget_seconds=0).source_budget("Lever").board_timeout() is None
+
+def test_boards_past_their_budget_are_cancelled_and_deferred():
+    class SlowBoardScraper(GreenhouseScraper):
+        async def fetch_board(self, client, board, known_jobs):
+            await asyncio.sleep(5 if board == "slow" else 0)
+            return 3, 1
+
+    deferred = []
+    deadline = RunDeadline(minutes=10, board_budget_seconds=0.05)
+    scraper = SlowBoardScraper(["slow", "fast"], known_jobs=KnownJobs("Greenhouse", []))
+    scraper.budget = deadline.source_budget("Greenhouse", on_deferred=deferred.append)
+
+    async def run_boards():
+        return await asyncio.gather(*(scraper.fetch_board_within_budget(None, board, scraper.known_jobs) for board in scraper.identifiers))
+
+    results = asyncio.run(run_boards())
+    assert results == [(0, 0), (3, 1)]
+    assert deferred == ["slow"]
+
+    # Once the deadline has passed, boards are deferred without being started.
+    expired = RunDeadline(minutes=1, clock=lambda: 0.0)
+    expired.started = -61
+    scraper.budget = expired.source_budget("Greenhouse", on_deferred=deferred.append)
+    assert asyncio.run(scraper.fetch_board_within_budget(None, "fast", scraper.known_jobs)) == (0, 0)
+    assert deferred == ["slow", "fast"]
+
+def test_board_budgets_start_once_the_board_has_a_slot():
+    class QueuedBoardScraper(GreenhouseScraper):
+        async def fetch_board(self, client, board, known_jobs):
+            # Stands in for a per-host limit every board of the source shares.
+            async with self.host:
+                await asyncio.sleep(0.1)
+            return 1, 0
+
+    deferred = []
+    scraper = QueuedBoardScraper(["a", "b", "c"], known_jobs=KnownJobs("Greenhouse", []))
+    scraper.board_concurrency = 1
+    # Together the boards take twice as long as one board's budget; each alone fits in it.
+    scraper.budget = RunDeadline(minutes=10, board_budget_seconds=0.15).source_budget("Greenhouse", on_deferred=deferred.append)
+
+    async def run():
+        scraper.host = asyncio.Lock()
+        return await scraper.fetch_jobs_async()
+
+    assert asyncio.run(run()) == (3, 0)
+    assert deferred == []
+
+def test_deferred_boards_go_first_and_are_cleared_once_polled(temp_db):
+    schedule = PollSchedule()
+    boards = ["busy", "quiet", "cut-off"]
+    schedule.due("Greenhouse", boards)
+    for board in boards:
+        schedule.board_polled("Greenhouse", board, 1, 0)
+    db_utils.save_board_poll("Greenhouse", "quiet", 4, "2000-01-01T00:00:00+00:00", "2000-01-01T00:00:00+00:00", False)
+    schedule.board_deferred("Greenhouse", "cut-off")
+
+    next_run = PollSchedule(enabled=False)
+    due = next_run.due("Greenhouse", boards)
+    assert next_run.prioritize("Greenhouse", due) == ["cut-off", "busy", "quiet"]
+    next_run.board_polled("Greenhouse", "cut-off", 1, 0)
+    assert db_utils.get_board_schedules("Greenhouse")[("Greenhouse", "cut-off")]["deferred_at"] is None
+
+def test_a_stuck_source_unit_defers_only_its_unfinished_boards(temp_db, monkeypatch):
+    release = threading.Event()
+
+    class StuckAfterOneBoardScraper:
+        per_board_units = False
+
+        def __init__(self, identifiers, known_jobs=None):
+            self.identifiers = identifiers
+
+        def fetch_jobs(self):
+            self.on_board_done("done", 2, 0)
+            release.wait(10)
+            return 2, 0
+
+    monkeypatch.setitem(scraper_agent.SCRAPER_REGISTRY, "Stuck", "unused:StuckAfterOneBoardScraper")
+    monkeypatch.setitem(scraper_agent._scraper_classes, "Stuck", StuckAfterOneBoardScraper)
+    monkeypatch.setattr(scraper_agent, "SCRAPER_DEADLINE_GRACE_SECONDS", 0)
+    tracking = scraper_agent.RunTracking(
+        checkpoints=ScrapeCheckpoints.start(), schedule=PollSchedule(enabled=False),
+        breaker=CircuitBreaker(), deadline=RunDeadline(minutes=0.5 / 60),
+    )
+    try:
+        scraper_agent.ScraperAgent(max_workers=1)._run_sources({"Stuck": ["done", "stuck"]}, tracking=tracking)
+    finally:
+        release.set()
+    assert tracking.deferred == [("Stuck", "stuck")]
+    schedules = db_utils.get_board_schedules("Stuck")
+    assert schedules[("Stuck", "done")]["deferred_at"] is None
+    assert schedules[("Stuck", "stuck")]["deferred_at"] is not None
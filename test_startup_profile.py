@@ -0,0 +1,34 @@
+# test_startup_profile.py
+import os
+import sys
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.scraper_agent import SCRAPER_REGISTRY, get_scraper_class
+from utils.startup_profile import loaded_heavy_modules, parse_importtime, profile_import
+
+def test_parse_importtime_sums_self_time_per_package():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   fastapi.types",
+        "import time:       300 |        420 | fastapi",
+        "import time:        50 |         50 | yaml",
+    ])
+    assert parse_importtime(stderr) == {"fastapi": 420, "yaml": 50}
+
+def test_loaded_heavy_modules_matches_packages():
+    assert loaded_heavy_modules(["bs4.element", "lxml", "agents.filter.filter_agent"], ("bs4", "lxml", "agents.filter", "nltk")) == [
+        "bs4", "lxml", "agents.filter",
+    ]
+
+def test_api_import_stays_clear_of_scrapers_and_agents():
+    report = profile_import("api")
+    assert loaded_heavy_modules(report["modules"]) == []
+
+def test_every_registry_entry_resolves():
+    for source_name in SCRAPER_REGISTRY:
+        assert get_scraper_class(source_name).__name__ == SCRAPER_REGISTRY[source_name].split(":")[1]
@@ -0,0 +1,86 @@
+# test_workable_api.py
+import asyncio
+import json
+import os
+import sys
+
+import aiohttp
+from multidict import CIMultiDict
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from utils import db_utils
+from agents.scraper.async_http import HttpResponse
+from agents.scraper.known_jobs import KnownJobs
+from agents.scraper.response_archive import ResponseArchive, archive_key
+from agents.scraper.sources import workable_scraper
+from agents.scraper.sources.workable_scraper import WorkableScraper
+
+WIDGET_PAYLOAD = {
+    "name": "Acme AI",
+    "jobs": [
+        {"title": "AI Engineer", "shortcode": "A1B2C3", "city": "Ghent", "state": "", "country": "Belgium",
+         "department": "R&D", "published_on": "2024-10-01", "description": "<p>Build <b>agents</b>.</p>",
+         "requirements": "<ul><li>Python</li></ul>", "benefits": ""},
+        {"title": "Office Manager", "shortcode": "D4E5F6", "location": "Remote", "department": "",
+         "created_at": "2024-09-20", "description": "<p>Keep us running.</p>"},
+        {"title": "", "shortcode": "NOTITLE"},
+    ],
+}
+
+CAREERS_PAGE = """
+<ul data-ui="list">
+  <li data-ui="job"><a href="/acme-ai/j/A1B2C3/"><h3>AI Engineer</h3></a><span data-ui="job-location">Ghent, Belgium</span></li>
+  <li data-ui="job"><a href="/acme-ai/j/D4E5F6/"><h3>Office Manager</h3></a></li>
+  <li data-ui="job"><h3>No link</h3></li>
+</ul>
+"""
+
+class FakeWidgetApi:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.requests = []
+
+    async def get(self, url, params=None, headers=None):
+        self.requests.append((url, params))
+        if self.fail:
+            raise aiohttp.ClientConnectionError("connection refused")
+        return HttpResponse(url, 200, CIMultiDict(), json.dumps(WIDGET_PAYLOAD).encode())
+
+def stored_jobs() -> list[dict]:
+    with db_utils.read_connection() as conn:
+        rows = conn.execute("SELECT job_url, platform_job_id, location, department, date_posted_on_platform, "
+                            "full_description_text FROM jobs ORDER BY platform_job_id").fetchall()
+    return [dict(row) for row in rows]
+
+def test_widget_api_offers_are_adapted_with_descriptions(temp_db):
+    api = FakeWidgetApi()
+    scraper = WorkableScraper(["acme-ai"], known_jobs=KnownJobs("Workable", []))
+    assert asyncio.run(scraper.fetch_board(api, "acme-ai", scraper.known_jobs)) == (2, 2)
+    assert api.requests == [("https://apply.workable.com/api/v1/widget/accounts/acme-ai", {"details": "true"})]
+    assert stored_jobs() == [
+        {"job_url": "https://apply.workable.com/acme-ai/j/A1B2C3/", "platform_job_id": "A1B2C3", "location": "Ghent, Belgium",
+         "department": "R&D", "date_posted_on_platform": "2024-10-01", "full_description_text": "Build agents . Python"},
+        {"job_url": "https://apply.workable.com/acme-ai/j/D4E5F6/", "platform_job_id": "D4E5F6", "location": "Remote",
+         "department": None, "date_posted_on_platform": "2024-09-20", "full_description_text": "Keep us running."},
+    ]
+
+def test_api_failure_falls_back_to_the_archived_careers_page(tmp_path, monkeypatch):
+    archive = ResponseArchive(str(tmp_path))
+    monkeypatch.setattr(workable_scraper, "response_archive", archive)
+    scraper = WorkableScraper(["acme-ai"])
+    with archive.session("record") as run_id:
+        archive.record(archive_key(scraper._careers_url("acme-ai")), 200, {"Content-Type": "text/html"}, CAREERS_PAGE.encode())
+
+    with archive.session("replay", run_id):
+        offers = asyncio.run(scraper.fetch_offers(FakeWidgetApi(fail=True), "acme-ai"))
+    assert offers == [
+        {"title": "AI Engineer", "shortcode": "A1B2C3", "location": "Ghent, Belgium"},
+        {"title": "Office Manager", "shortcode": "D4E5F6", "location": None},
+    ]
+    # Careers-page listings map to the same URLs as API ones.
+    assert scraper.adapt(offers[0], "acme-ai").job_url == "https://apply.workable.com/acme-ai/j/A1B2C3/"
@@ -0,0 +1,130 @@
+# test_wttj_scraper.py
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from urllib.parse import parse_qsl
+
+# --- Project Setup ---
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Setup ---
+
+from agents.scraper.sources import wttj_scraper
+from agents.scraper.sources.wttj_scraper import (
+    WelcomeToTheJungleScraper, find_jobs_result, hit_to_job, is_search_backend_url, with_result_page,
+)
+
+FIXTURES = os.path.join(PROJECT_ROOT, "fixtures", "wttj")
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+def test_search_backend_url_is_recognised():
+    assert is_search_backend_url(load_fixture("search_request.json")["url"])
+    assert not is_search_backend_url("https://www.welcometothejungle.com/en/jobs?query=AI")
+
+def test_jobs_result_skips_facet_queries():
+    result = find_jobs_result(load_fixture("search_page_0.json"))
+    assert result["nbPages"] == 3
+    assert len(result["hits"]) == 3
+
+def test_request_body_is_rewritten_for_another_page():
+    post_data = load_fixture("search_request.json")["post_data"]
+    body = json.loads(with_result_page(post_data, 2))
+    params = dict(parse_qsl(body["requests"][0]["params"]))
+    assert params["page"] == "2"
+    assert params["query"] == "AI"
+
+def test_hit_maps_to_job_dict():
+    hit = find_jobs_result(load_fixture("search_page_0.json"))["hits"][0]
+    job = hit_to_job(hit, "WelcomeToTheJungle")
+    assert job["job_url"] == "https://www.welcometothejungle.com/en/companies/robovision/jobs/machine-learning-engineer_ghent"
+    assert job["location"] == "Ghent, Belgium"
+    assert job["date_posted_on_platform"] == "2024-09-30T08:12:44Z"
+
+def test_collect_hits_pages_through_the_full_result_set():
+    scraper = WelcomeToTheJungleScraper([])
+    requested = []
+
+    async def fetch_page(number):
+        requested.append(number)
+        return load_fixture(f"search_page_{number}.json")
+
+    first = find_jobs_result(load_fixture("search_page_0.json"))
+    jobs = asyncio.run(scraper.collect_hits(first, fetch_page))
+    assert requested == [1, 2]
+    # 8 hits: one without a slug is dropped and one repeats across pages.
+    assert len(jobs) == 6
+    assert len({job["job_url"] for job in jobs}) == 6
+
+def test_collect_hits_respects_page_limit():
+    scraper = WelcomeToTheJungleScraper([])
+    scraper.max_result_pages = 2
+
+    async def fetch_page(number):
+        return load_fixture(f"search_page_{number}.json")
+
+    jobs = asyncio.run(scraper.collect_hits(find_jobs_result(load_fixture("search_page_0.json")), fetch_page))
+    assert len(jobs) == 5
+
+class FakePage:
+    def __init__(self, delays):
+        self.delays = delays
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+class FakePool:
+    """Stands in for BrowserPool: hands out fake pages, counting how many are open at once."""
+    def __init__(self, delays):
+        self.delays = delays
+        self.open_pages = 0
+        self.max_open_pages = 0
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        self.open_pages += 1
+        self.max_open_pages = max(self.max_open_pages, self.open_pages)
+        try:
+            yield FakePage(self.delays)
+        finally:
+            self.open_pages -= 1
+
+def test_detail_pages_are_fetched_concurrently_and_saved_in_batches(monkeypatch):
+    delays = {f"https://wttj/{i}": 0.05 for i in range(7)}
+    delays["https://wttj/3"] = 10  # a hung page must not stall the others
+    saved_batches = []
+
+    def fake_save(jobs, unchanged_urls, source_board=None):
+        saved_batches.append((len(jobs), len(unchanged_urls)))
+        return len(jobs) + len(unchanged_urls), len(jobs)
+
+    async def fake_fetch_description(pool, page, job_url):
+        await asyncio.sleep(page.delays[job_url])
+        return f"description of {job_url}"
+
+    monkeypatch.setattr(wttj_scraper, "save_scraped_jobs", fake_save)
+    scraper = WelcomeToTheJungleScraper([])
+    scraper.detail_concurrency, scraper.detail_timeout, scraper.write_batch_size = 3, 0.5, 2
+    monkeypatch.setattr(scraper, "_fetch_description", fake_fetch_description)
+    pool = FakePool(delays)
+    jobs = [{"job_url": url} for url in delays]
+
+    started = time.monotonic()
+    seen, added = asyncio.run(scraper._fetch_details_and_save(pool, jobs, ["https://wttj/known"]))
+    assert time.monotonic() - started < 2
+    assert (seen, added) == (8, 7)
+    assert pool.max_open_pages == 3
+    assert all(size <= 2 for size, _ in saved_batches)
+    assert sum(touched for _, touched in saved_batches) == 1
+    hung = next(job for job in jobs if job["job_url"] == "https://wttj/3")
+    assert "full_description_text" not in hung
@@ -2,26 +2,178 @@
 
 import sqlite3
 import os
-from datetime import datetime, timezone
+import queue
+import threading
+import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 
 # --- Database Setup ---
 DB_NAME = os.getenv("DB_NAME", "bittyscout.db")
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DB_PATH = os.path.join(PROJECT_ROOT, DB_NAME)
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_PATH)
+# --- Connection Tuning ---
+# The API, the Celery worker and CLI runs share one database file, so every connection
+# waits on locks instead of failing immediately with "database is locked".
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 30000))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", 4))
+
+def _configure_connection(conn: sqlite3.Connection, readonly: bool = False) -> sqlite3.Connection:
+    """Applies the row factory and performance pragmas to a new connection."""
     # This row_factory is still useful for accessing columns by name.
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}")
+    if not readonly:
+        # WAL is persistent in the file: readers no longer block the writer and vice versa.
+        conn.execute("PRAGMA journal_mode = WAL")
+    # NORMAL is corruption-safe under WAL and avoids an fsync on every commit.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
     return conn
 
-def create_jobs_table_if_not_exist():
-    """Creates the 'jobs' table with all required columns for all agents."""
+def get_db_connection():
+    """Establishes a standalone, tuned connection to the SQLite database."""
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+    return _configure_connection(conn)
+
+class ConnectionManager:
+    """
+    Owns the connections of one process: a single long-lived writer, serialized by a lock,
+    and a small pool of reusable read-only connections.
+    """
+    def __init__(self, db_path: str, read_pool_size: int = DB_READ_POOL_SIZE):
+        self.db_path = db_path
+        self.pid = os.getpid()
+        self.read_pool_size = max(1, read_pool_size)
+        self._write_lock = threading.RLock()
+        self._write_depth = 0
+        self._writer = None
+        self._readers = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_count_lock = threading.Lock()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            uri = f"file:{urllib.parse.quote(self.db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        return _configure_connection(conn, readonly=readonly)
+
+    @contextmanager
+    def writer(self):
+        """Yields the shared writer; the outermost block commits on success and rolls back on error."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect(readonly=False)
+            self._write_depth += 1
+            try:
+                yield self._writer
+                if self._write_depth == 1:
+                    self._writer.commit()
+            except BaseException:
+                if self._write_depth == 1:
+                    self._writer.rollback()
+                raise
+            finally:
+                self._write_depth -= 1
+
+    @contextmanager
+    def reader(self):
+        """Borrows a read-only connection from the pool, opening one if the pool is not full yet."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_count_lock:
+                can_open = self._reader_count < self.read_pool_size
+                if can_open:
+                    self._reader_count += 1
+            if can_open:
+                try:
+                    conn = self._connect(readonly=True)
+                except sqlite3.Error:
+                    with self._reader_count_lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            # Never hand a connection with an open read transaction back to the pool.
+            conn.rollback()
+            self._readers.put(conn)
+
+    def close(self):
+        """Closes the writer and every pooled reader."""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_count_lock:
+            self._reader_count = 0
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_connection_manager() -> ConnectionManager:
+    """Returns this process's ConnectionManager, recreating it after a fork or a DB_PATH change."""
+    global _manager
+    with _manager_lock:
+        if _manager is None or _manager.pid != os.getpid() or _manager.db_path != DB_PATH:
+            # Connections must never cross a fork (Celery prefork workers), so they are simply dropped.
+            _manager = ConnectionManager(DB_PATH)
+        return _manager
+
+def read_connection():
+    """Context manager borrowing a pooled read-only connection."""
+    return get_connection_manager().reader()
+
+def write_connection():
+    """
+    Context manager holding the serialized writer connection for one transaction.
+    Every write helper below goes through it; called inside a caller's block they join its
+    transaction, and only the outermost block commits.
+    """
+    return get_connection_manager().writer()
+
+@contextmanager
+def _savepoint(writer: sqlite3.Connection, name: str):
+    """Runs a block as a savepoint of the writer's transaction, so an error undoes only that block."""
+    if not writer.in_transaction:
+        writer.execute("BEGIN")
+    writer.execute(f"SAVEPOINT {name}")
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        create_table_sql = """
+        yield writer
+    except BaseException:
+        writer.execute(f"ROLLBACK TO {name}")
+        writer.execute(f"RELEASE {name}")
+        raise
+    writer.execute(f"RELEASE {name}")
+
+def close_db_connections():
+    """Closes every managed connection of this process (e.g. at shutdown or between tests)."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None and _manager.pid == os.getpid():
+            _manager.close()
+        _manager = None
+
+# --- Schema Migrations ---
+# Ordered, append-only list of (version, description, statements). Never edit a shipped
+# migration; add a new one instead. Version 1 uses IF NOT EXISTS so databases created
+# before versioning existed are adopted as-is.
+MIGRATIONS = [
+    (1, "create jobs table", [
+        """
         CREATE TABLE IF NOT EXISTS jobs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             job_url TEXT NOT NULL UNIQUE,
@@ -40,93 +192,541 @@ def create_jobs_table_if_not_exist():
             relevance_score REAL DEFAULT 0.0,
             tags TEXT,
             notified_on TEXT DEFAULT NULL
-        );
+        )
+        """,
+    ]),
+    (2, "partial index on jobs awaiting the Filter Agent", [
+        "CREATE INDEX IF NOT EXISTS idx_jobs_unprocessed ON jobs(id) WHERE is_relevant IS NULL",
+    ]),
+    # SQLite only treats a partial index as covering when its WHERE columns are indexed too.
+    (3, "partial covering index on relevant jobs awaiting notification", [
         """
-        cursor.execute(create_table_sql)
-        conn.commit()
-        conn.close()
+        CREATE INDEX IF NOT EXISTS idx_jobs_pending_notification
+        ON jobs(
+            relevance_score DESC, date_fetched DESC,
+            title, company_name, location, job_url, tags, is_relevant, notified_on
+        )
+        WHERE is_relevant = 1 AND notified_on IS NULL
+        """,
+    ]),
+    (4, "index on platform job ids", [
+        "CREATE INDEX IF NOT EXISTS idx_jobs_platform_job ON jobs(platform_source, platform_job_id)",
+    ]),
+    (5, "board of each job and HTTP validator cache", [
+        "ALTER TABLE jobs ADD COLUMN source_board TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_source_board ON jobs(platform_source, source_board)",
+        """
+        CREATE TABLE IF NOT EXISTS http_validators (
+            cache_key TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            updated_at TEXT NOT NULL
+        )
+        """,
+    ]),
+    (6, "scrape runs and per-board checkpoints", [
+        """
+        CREATE TABLE IF NOT EXISTS scrape_runs (
+            run_id TEXT PRIMARY KEY,
+            target_source TEXT,
+            status TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            finished_at TEXT
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_scrape_runs_status ON scrape_runs(status, started_at)",
+        """
+        CREATE TABLE IF NOT EXISTS scrape_checkpoints (
+            run_id TEXT NOT NULL,
+            source_name TEXT NOT NULL,
+            board_key TEXT NOT NULL,
+            seen INTEGER NOT NULL DEFAULT 0,
+            added INTEGER NOT NULL DEFAULT 0,
+            completed_at TEXT NOT NULL,
+            PRIMARY KEY (run_id, source_name, board_key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_scrape_checkpoints_board ON scrape_checkpoints(source_name, board_key, completed_at)",
+    ]),
+    (7, "adaptive per-board polling schedule", [
+        """
+        CREATE TABLE IF NOT EXISTS board_schedule (
+            source_name TEXT NOT NULL,
+            board_key TEXT NOT NULL,
+            backoff_level INTEGER NOT NULL DEFAULT 0,
+            next_due_at TEXT,
+            last_polled_at TEXT,
+            last_change_at TEXT,
+            polls INTEGER NOT NULL DEFAULT 0,
+            changes INTEGER NOT NULL DEFAULT 0,
+            pinned_interval_hours REAL,
+            PRIMARY KEY (source_name, board_key)
+        )
+        """,
+    ]),
+    (8, "per-board circuit breaker state", [
+        """
+        CREATE TABLE IF NOT EXISTS board_circuits (
+            source_name TEXT NOT NULL,
+            board_key TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'closed',
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            trips INTEGER NOT NULL DEFAULT 0,
+            open_until TEXT,
+            last_error TEXT,
+            last_failure_at TEXT,
+            PRIMARY KEY (source_name, board_key)
+        )
+        """,
+    ]),
+    (9, "boards deferred by the scrape deadline", [
+        "ALTER TABLE board_schedule ADD COLUMN deferred_at TEXT",
+    ]),
+]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Returns the highest applied migration version, or 0 for an unversioned database."""
+    table = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if not table:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate_db():
+    """Brings the database schema up to the latest version by applying pending migrations in order."""
+    try:
+        with write_connection() as conn:
+            # Take the write lock before reading the version so concurrent starters
+            # (API, worker, CLI) cannot apply the same migration twice.
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )
+            """)
+            current_version = get_schema_version(conn)
+            for version, description, statements in MIGRATIONS:
+                if version <= current_version:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (version, description, datetime.now(timezone.utc).isoformat())
+                )
+                print(f"🛠️ Applied migration {version}: {description}")
+                current_version = version
         # Changed from "ensured in '{DB_PATH}'" to be container-friendly
-        print("✅ BittyScout 'jobs' table ensured.")
+        print(f"✅ BittyScout database schema at version {current_version}.")
     except sqlite3.Error as e:
-        print(f"❌ ERROR creating jobs table: {e}")
+        print(f"❌ ERROR migrating database: {e}")
         exit(1)
 
+# Columns written for a freshly inserted job, in the order used by the upsert statement.
+JOB_INSERT_COLUMNS = (
+    "job_url", "platform_job_id", "platform_source", "company_name", "title",
+    "location", "department", "date_posted_on_platform", "date_fetched",
+    "last_seen_on_platform", "api_provided_description", "full_description_text", "source_board",
+)
+# Content columns refreshed when a known posting comes back with a new date_posted_on_platform
+# (the platform's last-modified marker); otherwise a re-seen job only gets last_seen_on_platform.
+# A forced refresh (replaying archived responses through a changed normalizer) always rewrites them.
+JOB_REFRESHED_COLUMNS = (
+    "platform_job_id", "company_name", "title", "location", "department",
+    "date_posted_on_platform", "api_provided_description", "full_description_text",
+)
+UPSERT_CHUNK_SIZE = int(os.getenv("DB_UPSERT_CHUNK_SIZE", 500))
+
+def _build_upsert_sql(refresh_content: bool = False) -> str:
+    changed = "excluded.date_posted_on_platform IS NOT NULL AND excluded.date_posted_on_platform IS NOT jobs.date_posted_on_platform"
+    if refresh_content:
+        changed = "1"
+    refreshed = ",\n        ".join(
+        f"{col} = CASE WHEN {changed} THEN excluded.{col} ELSE jobs.{col} END" for col in JOB_REFRESHED_COLUMNS
+    )
+    return f"""
+    INSERT INTO jobs ({', '.join(JOB_INSERT_COLUMNS)})
+    VALUES ({', '.join('?' for _ in JOB_INSERT_COLUMNS)})
+    ON CONFLICT(job_url) DO UPDATE SET
+        last_seen_on_platform = excluded.last_seen_on_platform,
+        source_board = COALESCE(excluded.source_board, jobs.source_board),
+        {refreshed};
+    """
+
+UPSERT_JOB_SQL = _build_upsert_sql()
+UPSERT_JOB_REFRESH_SQL = _build_upsert_sql(refresh_content=True)
+
+def _upsert_chunk(writer: sqlite3.Connection, chunk: list[dict], refresh_content: bool = False) -> list[tuple[str, int | None]]:
+    """Upserts one chunk of jobs on the writer; a database error undoes the whole chunk."""
+    now_iso = datetime.now(timezone.utc).isoformat()
+    results: list[tuple[str, int | None] | None] = [None] * len(chunk)
+    valid = []
+    for i, job_data in enumerate(chunk):
+        # A single row violating a NOT NULL constraint would abort the whole executemany.
+        if not job_data.get("job_url") or not job_data.get("title") or not job_data.get("platform_source"):
+            print(f"❌ Skipping job with missing url/title/source: '{job_data.get('job_url')}'")
+            results[i] = ("error", None)
+        else:
+            valid.append(i)
+    if not valid:
+        return results
+
+    urls = [chunk[i]["job_url"] for i in valid]
+    placeholders = ','.join('?' for _ in urls)
+    timestamps = {"date_fetched": now_iso, "last_seen_on_platform": now_iso}
+    rows = [
+        tuple(timestamps[col] if col in timestamps else chunk[i].get(col) for col in JOB_INSERT_COLUMNS)
+        for i in valid
+    ]
+    try:
+        with _savepoint(writer, "upsert_chunk"):
+            existing = {row[0] for row in writer.execute(f"SELECT job_url FROM jobs WHERE job_url IN ({placeholders})", urls)}
+            writer.executemany(UPSERT_JOB_REFRESH_SQL if refresh_content else UPSERT_JOB_SQL, rows)
+            ids = {row[1]: row[0] for row in writer.execute(f"SELECT id, job_url FROM jobs WHERE job_url IN ({placeholders})", urls)}
+    except sqlite3.Error as e:
+        print(f"❌ Database error while upserting {len(valid)} jobs: {e}")
+        for i in valid:
+            results[i] = ("error", None)
+        return results
+
+    for i in valid:
+        job_url = chunk[i]["job_url"]
+        # The same URL can appear twice in one batch; only its first occurrence is an insert.
+        results[i] = ("updated" if job_url in existing else "inserted", ids.get(job_url))
+        existing.add(job_url)
+    return results
+
+def upsert_jobs(jobs, chunk_size: int = UPSERT_CHUNK_SIZE, refresh_content: bool = False) -> list[tuple[str, int | None]]:
+    """
+    Inserts new jobs and refreshes last_seen_on_platform for known ones in chunked transactions.
+    Known jobs whose date_posted_on_platform changed (or all, with `refresh_content`) also
+    get their content refreshed.
+
+    Accepts any iterable of job dicts (the format every scraper builds) and returns one
+    (status, job_id) tuple per record, in input order, where status is 'inserted',
+    'updated' or 'error'. Each chunk is written through the shared writer connection, so
+    concurrent scrapers never reconnect or interleave.
+    """
+    results = []
+
+    def flush(chunk):
+        with write_connection() as writer:
+            results.extend(_upsert_chunk(writer, chunk, refresh_content))
+
+    chunk = []
+    for job_data in jobs:
+        chunk.append(job_data)
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+    return results
+
 def add_or_update_job(job_data: dict) -> tuple[str, int | None]:
     """Inserts a new job or updates the last_seen_on_platform timestamp."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return upsert_jobs([job_data])[0]
+
+def get_known_jobs(platform_source: str) -> list[dict]:
+    """Fetches the URL, platform id and last-modified marker of every stored job of one platform."""
+    query = "SELECT job_url, platform_job_id, date_posted_on_platform FROM jobs WHERE platform_source = ?"
+    with read_connection() as conn:
+        return [dict(row) for row in conn.execute(query, (platform_source,))]
+
+def touch_jobs_last_seen(job_urls: list[str], chunk_size: int = UPSERT_CHUNK_SIZE, source_board: str | None = None) -> int:
+    """
+    Bulk-refreshes last_seen_on_platform for already stored jobs. Returns the number of URLs touched.
+    A given `source_board` is also recorded on rows stored before boards were tracked.
+    """
+    if not job_urls: return 0
     now_iso = datetime.now(timezone.utc).isoformat()
-    job_url = job_data.get("job_url")
-    try:
-        cursor.execute("SELECT id FROM jobs WHERE job_url = ?", (job_url,))
-        existing_job = cursor.fetchone()
-        if existing_job:
-            job_id = existing_job['id']
-            cursor.execute("UPDATE jobs SET last_seen_on_platform = ? WHERE id = ?", (now_iso, job_id))
-            conn.commit()
-            return "updated", job_id
-        else:
-            insert_sql = """
-            INSERT INTO jobs (
-                job_url, platform_job_id, platform_source, company_name, title,
-                location, department, date_posted_on_platform, date_fetched,
-                last_seen_on_platform, api_provided_description, full_description_text
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+    update_sql = "UPDATE jobs SET last_seen_on_platform = ?, source_board = COALESCE(?, source_board) WHERE job_url = ?"
+    for start in range(0, len(job_urls), chunk_size):
+        rows = [(now_iso, source_board, url) for url in job_urls[start:start + chunk_size]]
+        with write_connection() as writer:
+            writer.executemany(update_sql, rows)
+    return len(job_urls)
+
+def touch_board_last_seen(platform_source: str, source_board: str) -> int:
+    """Refreshes last_seen_on_platform for every stored job of one board. Returns the number of jobs touched."""
+    now_iso = datetime.now(timezone.utc).isoformat()
+    update_sql = "UPDATE jobs SET last_seen_on_platform = ? WHERE platform_source = ? AND source_board = ?"
+    with write_connection() as writer:
+        return writer.execute(update_sql, (now_iso, platform_source, source_board)).rowcount
+
+def save_scraped_jobs(jobs: list[dict], unchanged_urls: list[str], source_board: str | None = None,
+                      refresh_content: bool = False) -> tuple[int, int]:
+    """
+    Persists one board's scrape: upserts new or changed jobs and touches unchanged ones.
+    Returns (seen, added) in the shape every scraper's fetch_jobs reports.
+    """
+    touched = touch_jobs_last_seen(unchanged_urls, source_board=source_board)
+    results = upsert_jobs(jobs, refresh_content=refresh_content)
+    added = sum(1 for status, _ in results if status == "inserted")
+    return touched + len(results), added
+
+# --- Scrape runs and checkpoints ---
+
+def start_scrape_run(run_id: str, target_source: str | None = None):
+    """Registers a new scrape run as running."""
+    with write_connection() as writer:
+        writer.execute(
+            "INSERT INTO scrape_runs (run_id, target_source, status, started_at) VALUES (?, ?, 'running', ?)",
+            (run_id, target_source, datetime.now(timezone.utc).isoformat())
+        )
+
+def find_resumable_run(target_source: str | None, started_after: str) -> str | None:
+    """Returns the latest run of the same target that never finished and started after `started_after`."""
+    query = """
+    SELECT run_id FROM scrape_runs
+    WHERE status = 'running' AND target_source IS ? AND started_at >= ?
+    ORDER BY started_at DESC LIMIT 1
+    """
+    with read_connection() as conn:
+        row = conn.execute(query, (target_source, started_after)).fetchone()
+    return row["run_id"] if row else None
+
+def finish_scrape_run(run_id: str, status: str = "finished"):
+    """Closes a run ('finished', or 'abandoned' for an interrupted run that will not be resumed)."""
+    with write_connection() as writer:
+        writer.execute(
+            "UPDATE scrape_runs SET status = ?, finished_at = ? WHERE run_id = ?",
+            (status, datetime.now(timezone.utc).isoformat(), run_id)
+        )
+
+def abandon_stale_runs(target_source: str | None, started_before: str) -> int:
+    """Marks unfinished runs of a target that are too old to resume as abandoned."""
+    with write_connection() as writer:
+        return writer.execute(
+            "UPDATE scrape_runs SET status = 'abandoned', finished_at = ? WHERE status = 'running' AND target_source IS ? AND started_at < ?",
+            (datetime.now(timezone.utc).isoformat(), target_source, started_before)
+        ).rowcount
+
+def record_scrape_checkpoint(run_id: str, source_name: str, board_key: str, seen: int, added: int):
+    """Records that one board of a source was scraped and stored completely in a run."""
+    with write_connection() as writer:
+        writer.execute(
             """
-            data_tuple = (
-                job_url, job_data.get("platform_job_id"), job_data.get("platform_source"),
-                job_data.get("company_name"), job_data.get("title"), job_data.get("location"),
-                job_data.get("department"), job_data.get("date_posted_on_platform"),
-                now_iso, now_iso, job_data.get("api_provided_description"),
-                job_data.get("full_description_text")
-            )
-            cursor.execute(insert_sql, data_tuple)
-            new_job_id = cursor.lastrowid
-            conn.commit()
-            return "inserted", new_job_id
-    except sqlite3.Error as e:
-        print(f"❌ Database error for job '{job_url}': {e}")
-        return "error", None
-    finally:
-        conn.close()
-
-def get_unprocessed_jobs() -> list[dict]: # <-- Changed return type annotation
-    """Fetches jobs that have not been processed by the Filter Agent."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    query = "SELECT id, title, api_provided_description, full_description_text FROM jobs WHERE is_relevant IS NULL"
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    conn.close()
-    # --- THIS IS THE FIX ---
-    # Convert sqlite3.Row objects to standard Python dictionaries
-    return [dict(row) for row in rows]
+            INSERT INTO scrape_checkpoints (run_id, source_name, board_key, seen, added, completed_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, source_name, board_key) DO UPDATE SET
+                seen = excluded.seen, added = excluded.added, completed_at = excluded.completed_at
+            """,
+            (run_id, source_name, board_key, seen, added, datetime.now(timezone.utc).isoformat())
+        )
+
+def get_completed_boards(source_name: str, run_id: str | None = None, completed_after: str | None = None) -> set[str]:
+    """Board keys of a source completed in run `run_id` or, in any run, after `completed_after`."""
+    query = """
+    SELECT board_key FROM scrape_checkpoints
+    WHERE source_name = ? AND (run_id = ? OR completed_at >= ?)
+    """
+    # An impossible bound disables the freshness half of the condition.
+    with read_connection() as conn:
+        return {row["board_key"] for row in conn.execute(query, (source_name, run_id, completed_after or "9999"))}
+
+# --- Adaptive polling schedule ---
+
+def get_board_schedules(source_name: str | None = None) -> dict[tuple[str, str], dict]:
+    """Schedule rows keyed by (source_name, board_key), for one source or all of them."""
+    query = "SELECT * FROM board_schedule WHERE ? IS NULL OR source_name = ?"
+    with read_connection() as conn:
+        return {(row["source_name"], row["board_key"]): dict(row) for row in conn.execute(query, (source_name, source_name))}
+
+def save_board_poll(source_name: str, board_key: str, backoff_level: int, next_due_at: str, polled_at: str, changed: bool):
+    """Records one completed poll of a board and when it is due next; a deferred board is caught up."""
+    with write_connection() as writer:
+        writer.execute(
+            """
+            INSERT INTO board_schedule (source_name, board_key, backoff_level, next_due_at, last_polled_at, last_change_at, polls, changes)
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+            ON CONFLICT(source_name, board_key) DO UPDATE SET
+                backoff_level = excluded.backoff_level,
+                next_due_at = excluded.next_due_at,
+                last_polled_at = excluded.last_polled_at,
+                last_change_at = COALESCE(excluded.last_change_at, last_change_at),
+                polls = polls + 1,
+                changes = changes + excluded.changes,
+                deferred_at = NULL
+            """,
+            (source_name, board_key, backoff_level, next_due_at, polled_at, polled_at if changed else None, int(changed))
+        )
+
+def set_board_deferred(source_name: str, board_key: str):
+    """Marks a board the scrape deadline cut off, so the next run scrapes it first. Keeps the earliest deferral."""
+    with write_connection() as writer:
+        writer.execute(
+            """
+            INSERT INTO board_schedule (source_name, board_key, deferred_at) VALUES (?, ?, ?)
+            ON CONFLICT(source_name, board_key) DO UPDATE SET deferred_at = COALESCE(deferred_at, excluded.deferred_at)
+            """,
+            (source_name, board_key, datetime.now(timezone.utc).isoformat())
+        )
+
+def set_board_poll_override(source_name: str, board_key: str, interval_hours: float | None):
+    """Pins a board to a fixed polling interval (0 = every run), or hands it back to the adaptive schedule with None."""
+    with write_connection() as writer:
+        writer.execute(
+            """
+            INSERT INTO board_schedule (source_name, board_key, pinned_interval_hours) VALUES (?, ?, ?)
+            ON CONFLICT(source_name, board_key) DO UPDATE SET pinned_interval_hours = excluded.pinned_interval_hours
+            """,
+            (source_name, board_key, interval_hours)
+        )
+
+def get_board_churn(platform_source: str, source_board: str, since: str) -> dict:
+    """
+    Churn history of one board from its stored jobs: how many it has, how many were inserted
+    after `since`, and how many disappeared after `since`. The first harvest of a board is not
+    churn, so inserts within an hour of its first fetch are left out. A job disappeared when its
+    last_seen_on_platform stopped advancing: it lags the board's latest poll by over an hour.
+    """
+    board = (platform_source, source_board)
+    with read_connection() as conn:
+        row = dict(conn.execute(
+            """
+            SELECT COUNT(*) AS total, MIN(date_fetched) AS first_fetched, MAX(last_seen_on_platform) AS latest_seen
+            FROM jobs WHERE platform_source = ? AND source_board = ?
+            """,
+            board
+        ).fetchone())
+        if not row["total"]:
+            return {**row, "inserted": 0, "closed": 0}
+        hour = timedelta(hours=1)
+        inserted_after = max(since, (datetime.fromisoformat(row["first_fetched"]) + hour).isoformat())
+        closed_before = (datetime.fromisoformat(row["latest_seen"]) - hour).isoformat()
+        row["inserted"] = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE platform_source = ? AND source_board = ? AND date_fetched >= ?",
+            (*board, inserted_after)
+        ).fetchone()[0]
+        row["closed"] = conn.execute(
+            """
+            SELECT COUNT(*) FROM jobs
+            WHERE platform_source = ? AND source_board = ? AND last_seen_on_platform >= ? AND last_seen_on_platform < ?
+            """,
+            (*board, since, closed_before)
+        ).fetchone()[0]
+    return row
+
+# --- Circuit breaker ---
+
+CIRCUIT_FIELDS = ("state", "consecutive_failures", "trips", "open_until", "last_error", "last_failure_at")
+
+def get_board_circuits(source_name: str | None = None) -> dict[tuple[str, str], dict]:
+    """Circuit rows keyed by (source_name, board_key), for one source or all of them."""
+    query = "SELECT * FROM board_circuits WHERE ? IS NULL OR source_name = ?"
+    with read_connection() as conn:
+        return {(row["source_name"], row["board_key"]): dict(row) for row in conn.execute(query, (source_name, source_name))}
+
+def save_board_circuit(source_name: str, board_key: str, circuit: dict):
+    """Stores the circuit state of one board."""
+    columns = ", ".join(CIRCUIT_FIELDS)
+    with write_connection() as writer:
+        writer.execute(
+            f"""
+            INSERT INTO board_circuits (source_name, board_key, {columns}) VALUES (?, ?{", ?" * len(CIRCUIT_FIELDS)})
+            ON CONFLICT(source_name, board_key) DO UPDATE SET
+                {", ".join(f"{field} = excluded.{field}" for field in CIRCUIT_FIELDS)}
+            """,
+            (source_name, board_key, *(circuit.get(field) for field in CIRCUIT_FIELDS))
+        )
+
+def reset_board_circuit(source_name: str, board_key: str) -> bool:
+    """Forgets the failures of a board, closing its circuit. Returns whether it had any."""
+    with write_connection() as writer:
+        return writer.execute(
+            "DELETE FROM board_circuits WHERE source_name = ? AND board_key = ?", (source_name, board_key)
+        ).rowcount > 0
+
+# --- HTTP validator cache (conditional requests) ---
+
+def get_http_validators() -> dict[str, tuple[str | None, str | None]]:
+    """Fetches every stored (ETag, Last-Modified) pair, keyed by request cache key."""
+    with read_connection() as conn:
+        return {
+            row["cache_key"]: (row["etag"], row["last_modified"])
+            for row in conn.execute("SELECT cache_key, etag, last_modified FROM http_validators")
+        }
+
+def save_http_validators(validators: list[tuple[str, str | None, str | None]]):
+    """
+    Stores (cache_key, etag, last_modified) entries. A response without any validator
+    clears its entry, so the next request for it is unconditional.
+    """
+    if not validators: return
+    now_iso = datetime.now(timezone.utc).isoformat()
+    upsert_sql = """
+    INSERT INTO http_validators (cache_key, etag, last_modified, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        etag = excluded.etag, last_modified = excluded.last_modified, updated_at = excluded.updated_at
+    """
+    stored = [(key, etag, last_modified, now_iso) for key, etag, last_modified in validators if etag or last_modified]
+    cleared = [(key,) for key, etag, last_modified in validators if not (etag or last_modified)]
+
+    with write_connection() as writer:
+        writer.executemany(upsert_sql, stored)
+        writer.executemany("DELETE FROM http_validators WHERE cache_key = ?", cleared)
+
+# --- Functions for the Filter Agent ---
+
+FILTER_PAGE_SIZE = int(os.getenv("FILTER_PAGE_SIZE", 200))
+
+def count_unprocessed_jobs() -> int:
+    """Counts jobs that have not been processed by the Filter Agent."""
+    with read_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE is_relevant IS NULL").fetchone()[0]
+
+def iter_unprocessed_jobs(page_size: int = FILTER_PAGE_SIZE, summary_chars: int = 500):
+    """
+    Yields jobs not yet processed by the Filter Agent, one page at a time.
+
+    Pages are read with keyset pagination on `id`, so memory stays constant however large
+    the backlog is, and rows updated by the caller in between pages are never revisited.
+    Only the triage inputs are pulled: `id`, `title` and a `description_summary` holding the
+    first `summary_chars` characters of the API description (or the full text when it is
+    empty). Use `get_job_description` for the full text of jobs that pass triage.
+    """
+    query = """
+    SELECT id, title,
+           substr(COALESCE(NULLIF(api_provided_description, ''), full_description_text, ''), 1, ?) AS description_summary
+    FROM jobs WHERE is_relevant IS NULL AND id > ?
+    ORDER BY id LIMIT ?
+    """
+    last_id = 0
+    while True:
+        # A fresh short read per page: no read transaction is held open while the caller writes.
+        with read_connection() as conn:
+            rows = conn.execute(query, (summary_chars, last_id, page_size)).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(row)
+        last_id = rows[-1]["id"]
+
+def get_job_description(job_id: int) -> str:
+    """Fetches the full description text of a single job ('' when missing)."""
+    with read_connection() as conn:
+        row = conn.execute("SELECT full_description_text FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return (row["full_description_text"] or "") if row else ""
 
 def update_job_analysis(job_id: int, is_relevant: bool, relevance_score: float, tags: str):
     """Updates a job record with the results from the Filter Agent."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
     update_sql = "UPDATE jobs SET is_relevant = ?, relevance_score = ?, tags = ? WHERE id = ?"
-    try:
-        cursor.execute(update_sql, (is_relevant, relevance_score, tags, job_id))
-        conn.commit()
-    finally:
-        conn.close()
+    with write_connection() as conn:
+        conn.execute(update_sql, (is_relevant, relevance_score, tags, job_id))
 
 # --- Functions for the Notifier Agent ---
 
 def get_new_relevant_jobs() -> list[dict]: # <-- Changed return type annotation
     """Fetches relevant jobs that have not been notified about yet."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
     query = """
     SELECT title, company_name, location, job_url, relevance_score, tags
     FROM jobs WHERE is_relevant = 1 AND notified_on IS NULL
     ORDER BY relevance_score DESC, date_fetched DESC
     """
-    cursor.execute(query)
-    rows = cursor.fetchall()
-    conn.close()
+    with read_connection() as conn:
+        rows = conn.execute(query).fetchall()
     # --- THIS IS THE FIX ---
     # Convert sqlite3.Row objects to standard Python dictionaries
     return [dict(row) for row in rows]
@@ -135,12 +735,7 @@ def mark_jobs_as_notified(job_urls: list[str]):
     """Updates the notified_on timestamp for a list of job URLs."""
     if not job_urls: return
     now_iso = datetime.now(timezone.utc).isoformat()
-    conn = get_db_connection()
-    cursor = conn.cursor()
     placeholders = ','.join('?' for _ in job_urls)
     update_sql = f"UPDATE jobs SET notified_on = ? WHERE job_url IN ({placeholders})"
-    try:
-        cursor.execute(update_sql, [now_iso] + job_urls)
-        conn.commit()
-    finally:
-        conn.close()
\ No newline at end of file
+    with write_connection() as conn:
+        conn.execute(update_sql, [now_iso] + job_urls)
@@ -0,0 +1,107 @@
+# utils/html_text.py
+
+import threading
+from html.parser import HTMLParser
+
+try:
+    import lxml
+    from lxml import etree
+except ImportError:  # lxml is optional; the streaming tokenizer below is the fallback.
+    lxml = None
+
+# Elements whose contents BeautifulSoup's get_text leaves out.
+SKIPPED_TAGS = ("script", "style", "template")
+
+def html_to_text(html: str | None, separator: str = " ") -> str:
+    """
+    Returns the text of an HTML fragment: every text node stripped, empty ones dropped,
+    joined with `separator`. Equivalent to
+    `BeautifulSoup(html, "html.parser").get_text(separator, strip=True)` on posting HTML,
+    without building a soup. Uses lxml when installed, else a streaming tokenizer.
+    """
+    if not html or not html.strip():
+        return ""
+    # lxml drops CDATA sections in HTML; the tokenizer keeps them like BeautifulSoup does.
+    if lxml is not None and "<![CDATA[" not in html:
+        try:
+            return _lxml_text(html, separator)
+        except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+            # Empty documents and strings carrying an XML encoding declaration.
+            pass
+    return _streaming_text(html, separator)
+
+_local = threading.local()
+
+def _lxml_parser():
+    # lxml parsers must not be used by two threads at once, so each thread gets its own.
+    # Comments and PIs are kept: removing them would merge the text on either side into one node.
+    if not hasattr(_local, "parser"):
+        _local.parser = etree.HTMLParser()
+    return _local.parser
+
+def _lxml_text(html: str, separator: str) -> str:
+    root = etree.fromstring(html, _lxml_parser())
+    if root is None:
+        return ""
+    etree.strip_elements(root, *SKIPPED_TAGS, with_tail=False)
+    # itertext() leaves out comment and PI contents but still yields their tails as separate nodes.
+    texts = (text.strip() for text in root.itertext())
+    return separator.join(text for text in texts if text)
+
+class _TextCollector(HTMLParser):
+    """Collects stripped text nodes as the stdlib tokenizer streams through the markup."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.texts = []
+        self._pending = []
+        self._skip_depth = 0
+
+    def _flush(self):
+        # Like BeautifulSoup, adjacent data chunks form one text node before stripping.
+        if self._pending:
+            text = "".join(self._pending).strip()
+            self._pending = []
+            if text and not self._skip_depth:
+                self.texts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        # BeautifulSoup keeps CDATA sections as text.
+        if data.startswith("CDATA["):
+            self._pending.append(data[len("CDATA["):])
+            self._flush()
+
+    def close(self):
+        super().close()
+        self._flush()
+
+def _streaming_text(html: str, separator: str) -> str:
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return separator.join(collector.texts)
@@ -0,0 +1,77 @@
+# utils/html_text_benchmark.py
+"""
+Benchmarks utils.html_text against BeautifulSoup on a corpus of posting HTML.
+
+    python -m utils.html_text_benchmark [--corpus DIR] [--repeat N]
+
+The corpus is every *.html file in DIR (default: fixtures/postings). Each document is
+converted with both implementations, checked for identical output, and timed.
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from bs4 import BeautifulSoup
+
+from utils.html_text import _streaming_text, html_to_text, lxml
+
+DEFAULT_CORPUS = os.path.join(PROJECT_ROOT, "fixtures", "postings")
+
+def load_corpus(corpus_dir: str) -> list[str]:
+    documents = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            documents.append(f.read())
+    return documents
+
+def soup_text(html: str) -> str:
+    return BeautifulSoup(html, "html.parser").get_text(" ", strip=True)
+
+def run_benchmark(documents: list[str], repeat: int) -> dict[str, float]:
+    """Returns the best-of-3 seconds each implementation needs to convert the corpus `repeat` times."""
+    implementations = {
+        "BeautifulSoup(html.parser)": soup_text,
+        "html_to_text (streaming)": lambda html: _streaming_text(html, " "),
+    }
+    if lxml is not None:
+        implementations["html_to_text (lxml)"] = html_to_text
+
+    def convert_all(convert):
+        for html in documents:
+            convert(html)
+
+    return {
+        name: min(timeit.repeat(lambda: convert_all(convert), number=repeat, repeat=3))
+        for name, convert in implementations.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML-to-text extraction against BeautifulSoup.")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of *.html posting bodies.")
+    parser.add_argument("--repeat", type=int, default=200, help="Conversions of the whole corpus per timing run.")
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    if not documents:
+        print(f"❌ No *.html files found in {args.corpus}")
+        sys.exit(1)
+
+    mismatches = sum(1 for html in documents if html_to_text(html) != soup_text(html))
+    total_kb = sum(len(html.encode("utf-8")) for html in documents) / 1024
+    print(f"📚 Corpus: {len(documents)} postings, {total_kb:.1f} KB, converted {args.repeat}x per run.")
+    print(f"{'✅' if not mismatches else '⚠️'} Output differs from BeautifulSoup on {mismatches} postings.")
+
+    timings = run_benchmark(documents, args.repeat)
+    baseline = timings["BeautifulSoup(html.parser)"]
+    per_doc_divisor = len(documents) * args.repeat
+    for name, seconds in timings.items():
+        print(f"  {name:<28} {seconds * 1e6 / per_doc_divisor:8.1f} µs/posting   {baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    main()
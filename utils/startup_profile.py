@@ -0,0 +1,91 @@
+# utils/startup_profile.py
+"""
+Import-time report for a process entrypoint, run in a fresh interpreter:
+
+    python logic.py startup-profile [--module api] [--top 15]
+
+Prints wall time, peak memory and the slowest packages (by their own import time) of
+`import <module>`, and flags heavy modules that lean entrypoints must not load.
+"""
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules only a scrape, filter or notify run needs.
+HEAVY_MODULES = (
+    "playwright", "newspaper", "nltk", "bs4", "lxml",
+    "agents.scraper.sources", "agents.filter", "agents.notifier", "logic", "tasks",
+)
+# Entrypoints that must stay clear of the heavy modules they list.
+LEAN_ENTRYPOINTS = {
+    "api": HEAVY_MODULES,
+    "celery_app": HEAVY_MODULES,
+    "logic": HEAVY_MODULES[:-2],
+    "agents.scraper.scraper_agent": HEAVY_MODULES[:5],
+}
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "modules": sorted(sys.modules)}}))
+"""
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Sums the self time (µs) of every `-X importtime` line by top-level package."""
+    self_us = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        own, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if own.isdigit():
+            self_us[name.split(".")[0]] += int(own)
+    return dict(self_us)
+
+def loaded_heavy_modules(modules: list[str], heavy: tuple[str, ...] = HEAVY_MODULES) -> list[str]:
+    """Which of `heavy` (packages included) appear among the loaded module names."""
+    return [name for name in heavy if any(m == name or m.startswith(name + ".") for m in modules)]
+
+def profile_import(module: str) -> dict:
+    """Imports `module` in a fresh interpreter and returns its timings, peak RSS and loaded modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit code {result.returncode}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["packages_us"] = parse_importtime(result.stderr)
+    return report
+
+def print_startup_profile(module: str = "api", top: int = 15) -> bool:
+    """Prints the report; returns False when a lean entrypoint loaded a module it must not."""
+    try:
+        report = profile_import(module)
+    except RuntimeError as e:
+        print(f"❌ import {module} failed: {e}")
+        return False
+
+    print(f"⏱️ import {module}: {report['seconds']:.2f}s, {report['max_rss_kb'] / 1024:.0f} MB peak RSS, {len(report['modules'])} modules")
+    print("  Slowest packages (own import time):")
+    slowest = sorted(report["packages_us"].items(), key=lambda item: item[1], reverse=True)[:top]
+    for name, micros in slowest:
+        print(f"    {name:<28} {micros / 1000:8.1f} ms")
+
+    forbidden = LEAN_ENTRYPOINTS.get(module, ())
+    # A heavy module profiled on purpose is not reported as its own regression.
+    heavy = forbidden or tuple(name for name in HEAVY_MODULES if name != module and not module.startswith(name + "."))
+    loaded = loaded_heavy_modules(report["modules"], heavy)
+    if not loaded:
+        print("✅ No scraping or agent modules loaded.")
+        return True
+    if forbidden:
+        print(f"❌ {module} must stay lean but loaded: {', '.join(loaded)}")
+        return False
+    print(f"ℹ️ Heavy modules loaded: {', '.join(loaded)}")
+    return True